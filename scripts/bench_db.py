@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from energy_app.storage.db import Database
+from energy_app.storage.profile_repo import Profile, ProfileRepository
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Compare per-call sqlite connections with the pooled WAL database")
+    ap.add_argument("--writers", type=int, default=4)
+    ap.add_argument("--readers", type=int, default=8)
+    ap.add_argument("--ops", type=int, default=500, help="Operations per thread")
+    return ap.parse_args()
+
+
+class _PerCallRepo:
+    """The previous access pattern: a fresh rollback-journal connection per call."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        ProfileRepository(Database(str(path)))  # create the schema
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+
+    def save(self, profile: Profile) -> None:
+        for sql, params in (
+            ("INSERT OR IGNORE INTO users (id) VALUES (?)", (profile.user_id,)),
+            (
+                "INSERT OR REPLACE INTO profiles (user_id, location_text, lat, lon, area_m2, occupants, heating_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (profile.user_id, profile.location_text, profile.lat, profile.lon, profile.area_m2, profile.occupants, None),
+            ),
+        ):
+            conn = sqlite3.connect(self.path)
+            with conn:
+                conn.execute(sql, params)
+            conn.close()
+
+    def get(self, user_id: str):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT * FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+        finally:
+            conn.close()
+
+
+class _PooledRepo:
+    def __init__(self, path: Path):
+        self.db = Database(str(path))
+        self.repo = ProfileRepository(self.db)
+
+    def save(self, profile: Profile) -> None:
+        with self.db.transaction():
+            self.repo.upsert_user(profile.user_id)
+            self.repo.upsert_profile(profile)
+
+    def get(self, user_id: str):
+        return self.repo.get_profile(user_id)
+
+
+def run(repo, writers: int, readers: int, ops: int) -> tuple[float, int]:
+    errors = []
+
+    def write(w: int) -> None:
+        for i in range(ops):
+            try:
+                repo.save(Profile(f"u{w}-{i % 50}", "Budapest", 47.5, 19.1, 70 + i, 2))
+            except sqlite3.OperationalError as exc:
+                errors.append(exc)
+
+    def read(r: int) -> None:
+        for i in range(ops):
+            try:
+                repo.get(f"u{i % writers}-{i % 50}")
+            except sqlite3.OperationalError as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(writers)]
+    threads += [threading.Thread(target=read, args=(r,)) for r in range(readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, len(errors)
+
+
+def main() -> None:
+    args = parse_args()
+    total = (args.writers + args.readers) * args.ops
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in (("per-call", _PerCallRepo), ("pooled", _PooledRepo)):
+            repo = factory(Path(tmp) / f"{name}.db")
+            elapsed, errors = run(repo, args.writers, args.readers, args.ops)
+            print(f"{name:9s} {elapsed:7.2f}s  {total / elapsed:9.0f} ops/sec  locked errors: {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from energy_app.data.features import (
+    add_lag_features,
+    add_rolling_features,
+    add_time_features,
+    build_baseline_matrix,
+)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Benchmark the fused feature builder against the pandas pipeline")
+    ap.add_argument("--rows", type=int, default=2_000_000, help="Length of the synthetic hourly series")
+    return ap.parse_args()
+
+
+def pandas_pipeline(df: pd.DataFrame) -> pd.DataFrame:
+    return add_rolling_features(add_lag_features(add_time_features(df))).dropna().reset_index(drop=True)
+
+
+def measure(name: str, func, df: pd.DataFrame) -> pd.DataFrame:
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = func(df)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} {elapsed:8.2f}s  peak {peak / 1e6:9.1f} MB  shape={out.shape}")
+    return out
+
+
+def main() -> None:
+    args = parse_args()
+    timestamps = pd.date_range("2000-01-01", periods=args.rows, freq="1h", tz="UTC")
+    values = np.random.default_rng(0).gamma(2.0, 0.5, size=args.rows)
+    df = pd.DataFrame({"timestamp": timestamps, "consumption": values})
+    legacy = measure("pandas", pandas_pipeline, df)
+    fused = measure("fused", build_baseline_matrix, df)
+    cols = [c for c in legacy.columns if c != "timestamp"]
+    max_err = np.max(np.abs(legacy[cols].to_numpy(dtype=np.float64) - fused[cols].to_numpy(dtype=np.float64)))
+    print(f"max abs difference: {max_err:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "energy_app.webapp.app",
+    "energy_app.models.registry",
+    "energy_app.models.baseline",
+    "energy_app.models.granite_ttm",
+    "energy_app.data.features",
+    "energy_app.data.window_store",
+    "energy_app.eval.reporting",
+]
+HEAVY = ["torch", "transformers", "gradio", "matplotlib", "lightgbm", "sklearn"]
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Measure import time of energy_app modules with python -X importtime")
+    ap.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    ap.add_argument("--top", type=int, default=10, help="Show the slowest N imports (cumulative) per module")
+    return ap.parse_args()
+
+
+def import_times(module: str) -> list[tuple[str, int, int]]:
+    """(name, self_us, cumulative_us) for every import triggered by ``import module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> None:
+    args = parse_args()
+    for module in args.modules:
+        rows = import_times(module)
+        total = next(cum for name, _, cum in rows if name == module)
+        heavy = sorted({name.split(".")[0] for name, _, _ in rows} & set(HEAVY))
+        print(f"{module:36s} {total / 1e6:7.3f}s  heavy: {', '.join(heavy) or '-'}")
+        for name, _, cum in sorted(rows, key=lambda r: r[2], reverse=True)[1 : args.top + 1]:
+            print(f"    {cum / 1e6:7.3f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
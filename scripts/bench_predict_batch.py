@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from energy_app.logging_utils import configure_logging
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Compare predict_batch throughput with looped single-series predict")
+    ap.add_argument("--model", choices=["patchtst", "baseline"], default="patchtst")
+    ap.add_argument("--series", type=int, default=1000, help="Number of households to forecast")
+    ap.add_argument("--context", type=int, default=168, help="Maximum history length")
+    ap.add_argument("--horizon", type=int, default=24)
+    ap.add_argument("--max-batch-size", type=int, default=256)
+    return ap.parse_args()
+
+
+def build_model(name: str, context: int, horizon: int, rng: np.random.Generator):
+    if name == "patchtst":
+        from energy_app.models.patchtst import PatchTSTForecaster
+
+        model = PatchTSTForecaster.from_data(np.zeros((1, context)), horizon)
+        return model, lambda ctx: ctx
+
+    import pandas as pd
+
+    from energy_app.data.features import build_baseline_matrix
+    from energy_app.models.baseline import BaselineForecaster
+
+    periods = 24 * 90
+    timestamps = pd.date_range("2024-01-01", periods=periods, freq="1h", tz="UTC")
+    values = 1.0 + 0.5 * np.sin(2 * np.pi * np.arange(periods) / 24) + rng.normal(0, 0.05, periods)
+    model = BaselineForecaster()
+    model.fit(*model.build_training_matrix(build_baseline_matrix(pd.DataFrame({"timestamp": timestamps, "consumption": values}))))
+    return model, lambda ctx: pd.DataFrame({"timestamp": timestamps[-len(ctx) :], "consumption": ctx})
+
+
+def main() -> None:
+    configure_logging("WARNING")
+    args = parse_args()
+    rng = np.random.default_rng(0)
+    model, to_input = build_model(args.model, args.context, args.horizon, rng)
+    lengths = rng.integers(args.context // 2, args.context + 1, size=args.series)
+    contexts = [to_input(rng.random(n).astype(np.float32)) for n in lengths]
+
+    start = time.perf_counter()
+    for ctx in contexts:
+        model.predict_batch([ctx], args.horizon)
+    looped = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict_batch(contexts, args.horizon, max_batch_size=args.max_batch_size)
+    batched = time.perf_counter() - start
+
+    print(f"looped  {looped:8.3f}s  {args.series / looped:10.1f} series/sec")
+    print(f"batched {batched:8.3f}s  {args.series / batched:10.1f} series/sec  ({looped / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
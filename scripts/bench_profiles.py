@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from energy_app.storage.db import Database
+from energy_app.storage.profile_repo import Profile, ProfileRepository
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Compare per-row profile upserts/lookups with the bulk APIs")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--sample", type=int, default=5_000, help="Rows used for the slow per-row baseline")
+    return ap.parse_args()
+
+
+def _profiles(n: int, offset: int = 0):
+    return [Profile(f"hh-{offset + i:07d}", "Budapest", 47.5, 19.1, 50 + i % 100, 1 + i % 5, "gas") for i in range(n)]
+
+
+def _rate(label: str, rows: int, seconds: float) -> None:
+    print(f"{label:28s} {rows:8d} rows  {seconds:7.2f}s  {rows / seconds:10.0f} rows/sec")
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ProfileRepository(Database(str(Path(tmp) / "bench.db")))
+
+        sample = _profiles(args.sample, offset=args.rows)
+        start = time.perf_counter()
+        for profile in sample:
+            repo.upsert_user(profile.user_id)
+            repo.upsert_profile(profile)
+        _rate("upsert per row", len(sample), time.perf_counter() - start)
+
+        profiles = _profiles(args.rows)
+        start = time.perf_counter()
+        repo.upsert_profiles_many(profiles)
+        _rate("upsert_profiles_many", len(profiles), time.perf_counter() - start)
+
+        ids = [p.user_id for p in sample]
+        start = time.perf_counter()
+        for user_id in ids:
+            repo.get_profile(user_id)
+        _rate("get_profile per id", len(ids), time.perf_counter() - start)
+
+        ids = [p.user_id for p in profiles]
+        start = time.perf_counter()
+        repo.get_profiles(ids)
+        _rate("get_profiles", len(ids), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        exported = sum(len(batch) for batch in repo.iter_profiles())
+        _rate("iter_profiles", exported, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
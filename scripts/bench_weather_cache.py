@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from energy_app.weather.cache import WeatherCache, WeatherCacheConfig
+from energy_app.weather.client import WEATHER_VARS
+from energy_app.weather.columnar import WeatherFrame
+from energy_app.weather.fake_server import hourly_payload
+from energy_app.weather.features import weather_to_frame
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Cached weather -> DataFrame: JSON payloads vs columnar frames")
+    ap.add_argument("--entries", type=int, default=200)
+    ap.add_argument("--days", type=int, default=16, help="Forecast days per entry")
+    ap.add_argument("--rounds", type=int, default=5)
+    return ap.parse_args()
+
+
+def _bench(cache: WeatherCache, keys, to_frame, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key in keys:
+            to_frame(cache.get(key))
+    return (time.perf_counter() - start) / (rounds * len(keys))
+
+
+def main() -> None:
+    args = parse_args()
+    payloads = [
+        hourly_payload(40.0 + i * 0.1, 19.0, date(2024, 1, 1), 24 * args.days, WEATHER_VARS) for i in range(args.entries)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        # No memory tier: measure the SQLite read + decode every consumer pays on a cold process.
+        cache = WeatherCache(Path(tmp) / "cache.sqlite", WeatherCacheConfig(memory_entries=0))
+        for i, payload in enumerate(payloads):
+            cache.set(f"json:{i}", payload, granularity="forecast")
+        sizes = {"json": cache.stats()["bytes"]}
+        for i, payload in enumerate(payloads):
+            cache.set(f"col:{i}", WeatherFrame.from_payload(payload), granularity="forecast")
+        sizes["columnar"] = cache.stats()["bytes"] - sizes["json"]
+        json_s = _bench(cache, [f"json:{i}" for i in range(args.entries)], weather_to_frame, args.rounds)
+        col_s = _bench(cache, [f"col:{i}" for i in range(args.entries)], weather_to_frame, args.rounds)
+        cache.close()
+
+    print(f"json payload     {json_s * 1e3:7.3f} ms/get+frame  {sizes['json'] / args.entries / 1024:7.1f} KiB/entry")
+    print(
+        f"columnar frame   {col_s * 1e3:7.3f} ms/get+frame  {sizes['columnar'] / args.entries / 1024:7.1f} KiB/entry"
+        f"  ({json_s / col_s:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
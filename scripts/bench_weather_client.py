@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from energy_app.weather.client import OpenMeteoClient, OpenMeteoConfig
+from energy_app.weather.fake_server import FakeOpenMeteo
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Sequential per-call requests vs pooled and batched forecast_many against a local fake Open-Meteo")
+    ap.add_argument("--locations", type=int, default=500)
+    ap.add_argument("--latency-ms", type=float, default=20.0, help="Simulated upstream latency per request")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--rate", type=float, default=1000.0, help="Token bucket rate (requests/sec)")
+    ap.add_argument("--batch-size", type=int, default=10, help="Locations per multi-location request")
+    return ap.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    # Spread over distinct grid cells so every location needs its own fetch.
+    locations = [(35.0 + (i // 100) * 0.5, 5.0 + (i % 100) * 0.5) for i in range(args.locations)]
+    with FakeOpenMeteo(delay_s=args.latency_ms / 1000) as server, tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for lat, lon in locations:
+            resp = requests.get(f"{server.base_url}/forecast", params={"latitude": lat, "longitude": lon, "forecast_days": 3}, timeout=15)
+            resp.raise_for_status()
+            resp.json()
+        sequential = time.perf_counter() - start
+
+        timings = {}
+        for label, batch_size in (("forecast_many batch=1", 1), (f"forecast_many batch={args.batch_size}", args.batch_size)):
+            client = OpenMeteoClient(
+                OpenMeteoConfig(
+                    base_url=server.base_url,
+                    geocoding_url=server.geocoding_url,
+                    cache_path=str(Path(tmp) / f"cache-{batch_size}.sqlite"),
+                    max_concurrency=args.concurrency,
+                    rate_per_s=args.rate,
+                    burst=max(args.concurrency, batch_size),
+                    batch_size=batch_size,
+                )
+            )
+            before = server.requests["/v1/forecast"]
+            start = time.perf_counter()
+            results = client.forecast_many(locations, days=3)
+            timings[label] = (time.perf_counter() - start, server.requests["/v1/forecast"] - before, sum(r is None for r in results))
+            client.close()
+
+    n = len(locations)
+    print(f"{'sequential requests.get':26s} {sequential:7.2f}s  {n / sequential:8.1f} locations/sec  {n} requests")
+    for label, (elapsed, calls, failed) in timings.items():
+        print(
+            f"{label:26s} {elapsed:7.2f}s  {n / elapsed:8.1f} locations/sec  {calls} requests"
+            f"  ({sequential / elapsed:.1f}x, {failed} failed)"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from energy_app.data.windows import strided_windows
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Benchmark strided window views against the Python slicing loop")
+    ap.add_argument("--rows", type=int, default=200_000, help="Length of the synthetic series")
+    ap.add_argument("--window", type=int, default=168)
+    ap.add_argument("--horizon", type=int, default=24)
+    ap.add_argument("--step", type=int, default=1)
+    return ap.parse_args()
+
+
+def loop_windows(values: np.ndarray, window: int, horizon: int, step: int):
+    X, y = [], []
+    for i in range(0, len(values) - window - horizon + 1, step):
+        X.append(values[i : i + window])
+        y.append(values[i + window : i + window + horizon])
+    return np.array(X), np.array(y)
+
+
+def measure(name: str, func, *args) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {elapsed * 1000:10.1f} ms  peak {peak / 1e6:10.1f} MB  X={X.shape} {X.dtype}")
+    return X, y
+
+
+def main() -> None:
+    args = parse_args()
+    values = np.random.default_rng(0).random(args.rows).astype(np.float32)
+    X_loop, y_loop = measure("loop", loop_windows, values, args.window, args.horizon, args.step)
+    X_view, y_view = measure("strided", strided_windows, values, args.window, args.horizon, args.step)
+    assert np.array_equal(X_loop, X_view) and np.array_equal(y_loop, y_view)
+
+
+if __name__ == "__main__":
+    main()
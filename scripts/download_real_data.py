@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import shutil
+import tempfile
+import urllib.request
 from pathlib import Path
-import io
-import zipfile
 
-import pandas as pd
+from energy_app.data.ingest import CsvSink, ingest_chunks, iter_uci_chunks
+from energy_app.logging_utils import configure_logging
+from energy_app.storage.series_store import DEFAULT_METER, ConsumptionStore
 
 # UCI household power consumption dataset (minute-level) via ZIP.
 DEFAULT_URL = "https://archive.ics.uci.edu/ml/machine-learning-databases/00235/household_power_consumption.zip"
@@ -15,39 +18,47 @@ DEFAULT_URL = "https://archive.ics.uci.edu/ml/machine-learning-databases/00235/h
 def parse_args():
     ap = argparse.ArgumentParser(description="Download real household power consumption dataset sample (UCI).")
     ap.add_argument("--url", default=DEFAULT_URL, help="ZIP URL containing household_power_consumption.txt")
-    ap.add_argument("--days", type=int, default=14, help="Number of days to read from the start (minutes = days*24*60)")
+    ap.add_argument("--zip", default=None, help="Use an already downloaded ZIP instead of --url")
+    ap.add_argument("--days", type=int, default=14, help="Number of days to read from the start (0 = all)")
     ap.add_argument("--output", default="data/household_power_sample.csv", help="Output CSV path")
+    ap.add_argument("--store", default=None, help="Write to a consumption store directory instead of --output")
+    ap.add_argument("--meter", default=DEFAULT_METER, help="Meter id when writing to --store")
+    ap.add_argument("--freq", default="1h", help="Aggregation period (e.g. 1h, 15min); 'none' keeps minute rows")
+    ap.add_argument("--chunksize", type=int, default=200_000, help="Rows parsed per chunk")
     return ap.parse_args()
 
 
+def download(url: str, dest: Path) -> None:
+    # Stream to disk in fixed-size blocks; ZIP members need a seekable file.
+    with urllib.request.urlopen(url) as resp, open(dest, "wb") as out:
+        shutil.copyfileobj(resp, out, length=1 << 20)
+
+
 def main() -> None:
+    configure_logging()
     args = parse_args()
     nrows = args.days * 24 * 60 if args.days > 0 else None
-    # Download zip into memory to avoid persisting raw.
-    import urllib.request
-
-    with urllib.request.urlopen(args.url) as resp:
-        zip_bytes = resp.read()
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
-        with zf.open("household_power_consumption.txt") as f:
-            df_raw = pd.read_csv(
-                f,
-                sep=";",
-                na_values=["?"],
-                nrows=nrows,
-                usecols=["Date", "Time", "Global_active_power"],
-            )
-    ts = pd.to_datetime(df_raw["Date"] + " " + df_raw["Time"], format="%d/%m/%Y %H:%M:%S", utc=True)
-    df = pd.DataFrame(
-        {
-            "timestamp": ts,
-            "consumption": pd.to_numeric(df_raw["Global_active_power"], errors="coerce"),
-        }
-    ).dropna()
-    out_path = Path(args.output)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False)
-    print(f"Saved real dataset sample to {out_path} with {len(df)} rows")
+    freq = None if args.freq.lower() == "none" else args.freq
+
+    if args.store:
+        store = ConsumptionStore(args.store)
+        store.delete_meter(args.meter)
+        sink = lambda df: store.write(df, meter_id=args.meter)  # noqa: E731
+        target = f"{args.store} (meter={args.meter})"
+    else:
+        sink = CsvSink(args.output)
+        target = args.output
+
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = Path(args.zip) if args.zip else Path(tmp) / "household_power_consumption.zip"
+        if not args.zip:
+            download(args.url, zip_path)
+        stats = ingest_chunks(iter_uci_chunks(zip_path, chunksize=args.chunksize, max_rows=nrows), sink, freq=freq)
+
+    print(
+        f"Saved real dataset to {target}: {stats.rows_in} rows read, {stats.rows_out} rows written "
+        f"in {stats.seconds:.1f}s ({stats.rows_per_sec:,.0f} rows/sec)"
+    )
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ from pathlib import Path
 
 import pandas as pd
 
+from energy_app.data.loader import load_consumption
 from energy_app.logging_utils import configure_logging
 from energy_app.models.baseline import BaselineForecaster
 from energy_app.eval.evaluator import evaluate_models
@@ -14,7 +15,7 @@ from energy_app.eval.reporting import save_markdown_report, plot_predictions, pl
 
 def parse_args():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--data", required=True, help="CSV test split")
+    ap.add_argument("--data", required=True, help="Test split (Parquet or CSV)")
     ap.add_argument("--baseline-model", default="artifacts/baseline_model.pkl")
     ap.add_argument("--output", default="artifacts/reports")
     ap.add_argument("--horizon", type=int, default=24)
@@ -24,7 +25,7 @@ def parse_args():
 def main() -> None:
     configure_logging()
     args = parse_args()
-    df = pd.read_csv(args.data)
+    df = load_consumption(args.data)
     baseline = BaselineForecaster.load(args.baseline_model)
 
     metrics_df = evaluate_models([
@@ -36,7 +37,7 @@ def main() -> None:
 
     y_true = df["consumption"].tail(args.horizon).reset_index(drop=True)
     preds = {
-        "baseline": pd.Series(baseline.predict(df, args.horizon)),
+        "baseline": pd.Series(baseline.predict(df.iloc[: -args.horizon], args.horizon)),
     }
     plot_predictions(y_true, preds, args.output)
     plot_residuals(y_true, preds, args.output)
@@ -29,6 +29,8 @@ def main() -> None:
             base_url=cfg["open_meteo"]["base_url"],
             geocoding_url=cfg["open_meteo"]["geocoding_url"],
             cache_path=cfg["weather_cache"],
+            gazetteer_path=cfg["open_meteo"].get("gazetteer_path"),
+            gazetteer_min_population=int(cfg["open_meteo"].get("gazetteer_min_population", 0)),
         )
     )
 
@@ -37,8 +39,8 @@ def main() -> None:
         raise SystemExit("Location not found")
 
     lat, lon = geo["latitude"], geo["longitude"]
-    hist = client.historical(lat, lon, args.start, args.end)
-    forecast = client.forecast(lat, lon, args.days)
+    hist = client.historical_frame(lat, lon, args.start, args.end)
+    forecast = client.forecast_frame(lat, lon, args.days)
 
     df_hist = weather_to_frame(hist)
     out_path = Path(args.output)
@@ -46,7 +48,7 @@ def main() -> None:
     df_hist.to_csv(out_path, index=False)
 
     print(f"Historical saved to {out_path}")
-    print(f"Forecast sample keys: {list(forecast.keys())}")
+    print(f"Forecast: {len(forecast)} hours of {', '.join(forecast.columns)}")
 
 
 if __name__ == "__main__":
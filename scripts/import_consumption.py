@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+
+from energy_app.logging_utils import configure_logging
+from energy_app.storage.series_store import DEFAULT_METER, ConsumptionStore
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Import a timestamp,consumption CSV into the partitioned Parquet store")
+    ap.add_argument("--input", required=True, help="CSV with timestamp, consumption")
+    ap.add_argument("--store", default="data/consumption", help="Consumption store directory")
+    ap.add_argument("--meter", default=DEFAULT_METER, help="Meter id to import the series under")
+    ap.add_argument("--chunksize", type=int, default=500_000, help="CSV rows parsed per chunk")
+    ap.add_argument("--append", action="store_true", help="Append instead of replacing the meter's data")
+    return ap.parse_args()
+
+
+def main() -> None:
+    configure_logging()
+    args = parse_args()
+    store = ConsumptionStore(args.store)
+    rows = store.import_csv(args.input, meter_id=args.meter, chunksize=args.chunksize, overwrite=not args.append)
+    print(f"Imported {rows} rows into {args.store} (meter={args.meter})")
+
+
+if __name__ == "__main__":
+    main()
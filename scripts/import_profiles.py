@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import time
+
+from energy_app.config import load_config
+from energy_app.logging_utils import configure_logging
+from energy_app.storage.db import Database
+from energy_app.storage.profile_repo import ProfileRepository, export_profiles, import_profiles
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Bulk import (or export) household profiles as CSV/Parquet")
+    ap.add_argument("--input", help="CSV/Parquet with user_id, location_text, lat, lon, area_m2, occupants[, heating_type]")
+    ap.add_argument("--export", help="Write all profiles to this CSV/Parquet file instead of importing")
+    ap.add_argument("--db-url", default=None, help="Database URL (default: config db_url)")
+    ap.add_argument("--batch-size", type=int, default=10_000, help="Rows per executemany batch/transaction")
+    args = ap.parse_args()
+    if bool(args.input) == bool(args.export):
+        ap.error("pass exactly one of --input or --export")
+    return args
+
+
+def main() -> None:
+    configure_logging()
+    args = parse_args()
+    db_url = args.db_url or load_config().get("db_url", "sqlite:///data/app.db")
+    repo = ProfileRepository(Database(db_url))
+    start = time.perf_counter()
+    if args.input:
+        rows = import_profiles(repo, args.input, batch_size=args.batch_size)
+        action = f"Imported {rows} profiles from {args.input}"
+    else:
+        rows = export_profiles(repo, args.export, batch_size=args.batch_size)
+        action = f"Exported {rows} profiles to {args.export}"
+    elapsed = time.perf_counter() - start
+    print(f"{action} in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import asdict
+
+from energy_app.config import load_config
+from energy_app.logging_utils import configure_logging
+from energy_app.storage.db import Database
+from energy_app.storage.profile_repo import ProfileRepository
+from energy_app.weather.client import OpenMeteoClient, OpenMeteoConfig
+from energy_app.weather.prefetch import PrefetchConfig, WeatherPrefetcher
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh cached forecasts for every profile location")
+    parser.add_argument("--days", type=int, nargs="+", help="Forecast lengths to refresh (default: config)")
+    parser.add_argument("--loop", action="store_true", help="Keep running every interval_s instead of once")
+    return parser.parse_args()
+
+
+def main() -> None:
+    configure_logging()
+    args = parse_args()
+    cfg = load_config()
+    client = OpenMeteoClient(
+        OpenMeteoConfig(
+            base_url=cfg["open_meteo"]["base_url"],
+            geocoding_url=cfg["open_meteo"]["geocoding_url"],
+            cache_path=cfg["weather_cache"],
+        )
+    )
+    repo = ProfileRepository(Database(cfg.get("db_url", "sqlite:///data/app.db")))
+    prefetch_cfg = {k: v for k, v in cfg.get("weather_prefetch", {}).items() if k != "enabled"}
+    if args.days:
+        prefetch_cfg["forecast_days"] = args.days
+    prefetcher = WeatherPrefetcher(client, repo, PrefetchConfig(**prefetch_cfg))
+    if args.loop:
+        prefetcher.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            prefetcher.close()
+    else:
+        print(json.dumps(asdict(prefetcher.run_once()), indent=2))
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,24 @@ from pathlib import Path
 
 import pandas as pd
 
-from energy_app.data.loader import load_consumption_csv
+from energy_app.data.loader import load_consumption, save_dataframe
 from energy_app.data.preprocess import fill_and_resample, time_based_split, SplitConfig
 from energy_app.data.features import build_baseline_matrix
-from energy_app.data.windows import build_transformer_windows, WindowConfig
+from energy_app.data.windows import WindowConfig
+from energy_app.data.window_store import write_window_dataset
 from energy_app.logging_utils import configure_logging
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Prepare consumption dataset")
-    parser.add_argument("--input", required=True, help="Input CSV with timestamp, consumption")
+    parser.add_argument("--input", required=True, help="Input CSV/Parquet with timestamp, consumption, or a consumption store directory")
+    parser.add_argument("--meter", default=None, help="Meter id when reading from a consumption store")
     parser.add_argument("--output-dir", required=True, help="Output directory for processed data")
     parser.add_argument("--tz", default=None, help="Timezone (e.g., Europe/Budapest)")
     parser.add_argument("--window", type=int, default=168, help="Context window size")
     parser.add_argument("--horizon", type=int, default=24, help="Forecast horizon hours")
+    parser.add_argument("--step", type=int, default=1, help="Offset between consecutive windows")
+    parser.add_argument("--dtype", default="float32", help="Window dtype (e.g., float32, float64)")
     return parser.parse_args()
 
 
@@ -29,7 +33,7 @@ def main() -> None:
     out_dir = Path(args.output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    df = load_consumption_csv(args.input, tz=args.tz)
+    df = load_consumption(args.input, tz=args.tz, meter_id=args.meter)
     df = fill_and_resample(df, tz=args.tz)
     train, val, test = time_based_split(df, SplitConfig())
 
@@ -37,20 +41,16 @@ def main() -> None:
     baseline_path = out_dir / "baseline.parquet"
     baseline.to_parquet(baseline_path, index=False)
 
-    window_cfg = WindowConfig(window=args.window, horizon=args.horizon)
-    X, y = build_transformer_windows(df, window_cfg)
-    npz_path = out_dir / "windows.npz"
-    import numpy as np
-
-    np.savez_compressed(npz_path, X=X, y=y)
+    window_cfg = WindowConfig(window=args.window, horizon=args.horizon, step=args.step, dtype=args.dtype)
+    windows_path = write_window_dataset(df, out_dir / "windows", window_cfg)
 
     # Save splits for later evaluation
-    train.to_csv(out_dir / "train.csv", index=False)
-    val.to_csv(out_dir / "val.csv", index=False)
-    test.to_csv(out_dir / "test.csv", index=False)
+    save_dataframe(train, out_dir / "train.parquet")
+    save_dataframe(val, out_dir / "val.parquet")
+    save_dataframe(test, out_dir / "test.parquet")
 
     print(f"Baseline features -> {baseline_path}")
-    print(f"Transformer windows -> {npz_path}")
+    print(f"Transformer windows -> {windows_path}")
     print(f"Splits saved to {out_dir}")
 
 
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+
+from energy_app.logging_utils import configure_logging
+from energy_app.models.training import train_all
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Train one baseline model per household/cluster in parallel")
+    ap.add_argument("--input", required=True, help="Consumption store directory, or a directory of per-series CSV/Parquet files")
+    ap.add_argument("--output-dir", default="artifacts/households")
+    ap.add_argument("--series", nargs="*", default=None, help="Only train these series ids")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    ap.add_argument("--memory-limit-mb", type=int, default=None, help="Address-space cap per worker")
+    ap.add_argument("--max-tasks-per-child", type=int, default=20, help="Recycle workers after this many series")
+    ap.add_argument("--tz", default=None)
+    ap.add_argument("--force", action="store_true", help="Retrain series whose inputs did not change")
+    return ap.parse_args()
+
+
+def main() -> None:
+    configure_logging()
+    args = parse_args()
+    summary = train_all(
+        args.input,
+        args.output_dir,
+        series=args.series,
+        workers=args.workers,
+        memory_limit_mb=args.memory_limit_mb,
+        max_tasks_per_child=args.max_tasks_per_child,
+        force=args.force,
+        tz=args.tz,
+    )
+    print(summary.format())
+    if summary.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,47 @@
 from __future__ import annotations
 
 import argparse
-import numpy as np
 
+from energy_app.data.preprocess import SplitConfig
+from energy_app.data.window_store import WindowDataset, split_window_dataset
 from energy_app.logging_utils import configure_logging
-from energy_app.models.patchtst import PatchTSTForecaster
+from energy_app.models.patchtst import PatchTSTForecaster, TrainConfig
 
 
 def parse_args():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--windows", required=True, help="NPZ file with X, y")
+    ap.add_argument("--windows", required=True, help="Window dataset directory written by prepare_data.py")
     ap.add_argument("--output", default="artifacts/patchtst")
     ap.add_argument("--horizon", type=int, default=24)
+    ap.add_argument("--epochs", type=int, default=20)
+    ap.add_argument("--batch-size", type=int, default=256)
+    ap.add_argument("--lr", type=float, default=1e-3)
+    ap.add_argument("--workers", type=int, default=0, help="DataLoader worker processes")
+    ap.add_argument("--grad-accum", type=int, default=1, help="Batches per optimizer step")
+    ap.add_argument("--patience", type=int, default=3, help="Epochs without val improvement before stopping")
+    ap.add_argument("--checkpoint-dir", default=None, help="Directory for last/best checkpoints")
+    ap.add_argument("--resume", action="store_true", help="Resume from --checkpoint-dir")
     return ap.parse_args()
 
 
 def main() -> None:
     configure_logging()
     args = parse_args()
-    data = np.load(args.windows)
-    X, y = data["X"], data["y"]
+    dataset = WindowDataset.open(args.windows)
+    train, val, _ = split_window_dataset(dataset, SplitConfig())
+    X, _ = train.arrays()
     model = PatchTSTForecaster.from_data(X, args.horizon)
-    model.fit(X, y)
+    train_cfg = TrainConfig(
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        lr=args.lr,
+        num_workers=args.workers,
+        grad_accum_steps=args.grad_accum,
+        patience=args.patience,
+        checkpoint_dir=args.checkpoint_dir,
+        resume=args.resume,
+    )
+    model.fit(train, val=val, train_config=train_cfg)
     model.save(args.output)
     print(f"Saved PatchTST model to {args.output}")
 
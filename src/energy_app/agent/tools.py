@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any, Dict, List
 
 import pandas as pd
 
 from energy_app.storage.profile_repo import ProfileRepository
 from energy_app.weather.client import OpenMeteoClient
-from energy_app.weather.features import weather_to_frame
 
 
 @dataclass
@@ -18,7 +17,7 @@ class ToolContext:
 
 def tool_get_user_profile(ctx: ToolContext, user_id: str) -> Dict[str, Any] | None:
     profile = ctx.profile_repo.get_profile(user_id)
-    return profile.__dict__ if profile else None
+    return asdict(profile) if profile else None
 
 
 def tool_get_forecast(ctx: ToolContext, user_id: str, horizon: int) -> Dict[str, Any]:
@@ -30,9 +29,8 @@ def tool_get_forecast(ctx: ToolContext, user_id: str, horizon: int) -> Dict[str,
 
 
 def tool_get_weather_summary(ctx: ToolContext, lat: float, lon: float, horizon: int) -> pd.DataFrame:
-    payload = ctx.weather_client.forecast(lat, lon, days=max(1, horizon // 24))
-    df = weather_to_frame(payload)
-    return df.head(horizon)
+    frame = ctx.weather_client.forecast_frame(lat, lon, days=max(1, horizon // 24))
+    return frame.to_frame().head(horizon)
 
 
 def tool_compute_consumption_insights(timeseries: pd.Series) -> Dict[str, Any]:
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List
+import math
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -28,21 +31,215 @@ def add_lag_features(df: pd.DataFrame, lags: Iterable[int] = DEFAULT_LAGS) -> pd
 
 
 def add_rolling_features(df: pd.DataFrame, windows: Iterable[int] = ROLLING_WINDOWS) -> pd.DataFrame:
+    # Windows end at the previous hour so a row's features never include its own target.
     df = df.copy()
+    past = df["consumption"].shift(1)
     for window in windows:
-        df[f"roll_mean_{window}"] = df["consumption"].rolling(window=window, min_periods=1).mean()
-        df[f"roll_std_{window}"] = df["consumption"].rolling(window=window, min_periods=1).std().fillna(0)
+        df[f"roll_mean_{window}"] = past.rolling(window=window, min_periods=1).mean()
+        df[f"roll_std_{window}"] = past.rolling(window=window, min_periods=1).std().fillna(0)
     return df
 
 
-def build_baseline_matrix(df: pd.DataFrame) -> pd.DataFrame:
-    df_feat = add_time_features(df)
-    df_feat = add_lag_features(df_feat)
-    df_feat = add_rolling_features(df_feat)
-    df_feat = df_feat.dropna().reset_index(drop=True)
+@dataclass(frozen=True)
+class FeatureSpec:
+    lags: Tuple[int, ...] = tuple(DEFAULT_LAGS)
+    windows: Tuple[int, ...] = tuple(ROLLING_WINDOWS)
+    time_features: bool = True
+    dtype: str = "float32"
+
+    @property
+    def max_lag(self) -> int:
+        return max(self.lags, default=0)
+
+    @property
+    def first_row(self) -> int:
+        """Number of past values needed before a row has every feature."""
+        return max(self.max_lag, 1 if self.windows else 0)
+
+    @property
+    def history_length(self) -> int:
+        """Past values that fully determine the next row's features."""
+        return max(self.first_row, *self.windows, 0)
+
+    @property
+    def feature_names(self) -> List[str]:
+        names = ["hour", "dayofweek", "is_weekend"] if self.time_features else []
+        names += [f"lag_{lag}" for lag in self.lags]
+        names += [name for w in self.windows for name in (f"roll_mean_{w}", f"roll_std_{w}")]
+        return names
+
+
+DEFAULT_FEATURE_SPEC = FeatureSpec()
+
+
+def _rolling_moments(values: np.ndarray, window: int, start: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and sample std of the ``window`` values before each row (std of one value = 0)."""
+    n = len(values)
+    shift = values.mean() if n else 0.0  # centering keeps the sum-of-squares difference well conditioned
+    centered = values - shift
+    cs = np.concatenate(([0.0], np.cumsum(centered)))
+    cs2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    end = np.arange(start, n)
+    begin = np.maximum(end - window, 0)
+    count = end - begin
+    s1 = cs[end] - cs[begin]
+    s2 = cs2[end] - cs2[begin]
+    mean = s1 / count + shift
+    var = np.maximum(s2 - s1 * s1 / count, 0.0) / np.maximum(count - 1, 1)
+    std = np.where(count > 1, np.sqrt(var), 0.0)
+    return mean, std
+
+
+def build_feature_matrix(
+    timestamps: pd.Series | pd.DatetimeIndex,
+    values: np.ndarray,
+    spec: FeatureSpec = DEFAULT_FEATURE_SPEC,
+) -> np.ndarray:
+    """Time, lag and rolling features for rows ``spec.first_row:`` in one preallocated matrix.
+
+    Expects a gap-free series (see ``fill_and_resample``); columns follow
+    ``spec.feature_names``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if np.isnan(values).any():
+        raise ValueError("Consumption contains NaN; resample/interpolate before building features.")
+    start = spec.first_row
+    n_rows = max(len(values) - start, 0)
+    out = np.empty((n_rows, len(spec.feature_names)), dtype=spec.dtype)
+    if not n_rows:
+        return out
+    col = 0
+    if spec.time_features:
+        index = pd.DatetimeIndex(timestamps)[start:]
+        dayofweek = index.dayofweek.to_numpy()
+        out[:, 0] = index.hour.to_numpy()
+        out[:, 1] = dayofweek
+        out[:, 2] = dayofweek >= 5
+        col = 3
+    for lag in spec.lags:
+        out[:, col] = values[start - lag : len(values) - lag]
+        col += 1
+    for window in spec.windows:
+        out[:, col], out[:, col + 1] = _rolling_moments(values, window, start)
+        col += 2
+    return out
+
+
+def build_baseline_matrix(df: pd.DataFrame, spec: FeatureSpec = DEFAULT_FEATURE_SPEC) -> pd.DataFrame:
+    matrix = build_feature_matrix(df["timestamp"], df["consumption"].to_numpy(), spec)
+    start = spec.first_row
+    df_feat = pd.DataFrame(matrix, columns=spec.feature_names, copy=False)
+    df_feat.insert(0, "consumption", df["consumption"].to_numpy()[start:])
+    df_feat.insert(0, "timestamp", df["timestamp"].iloc[start:].reset_index(drop=True))
     logger.info("Built baseline feature matrix with shape %s", df_feat.shape)
     return df_feat
 
 
 def feature_columns(df: pd.DataFrame) -> List[str]:
     return [c for c in df.columns if c not in {"timestamp", "consumption"}]
+
+
+class _RollingMoments:
+    """Welford mean/variance over the last ``window`` values, updated in O(1)."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value: float, evicted: float | None) -> None:
+        if evicted is None:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+        else:
+            old_mean = self.mean
+            self.mean += (value - evicted) / self.count
+            self.m2 += (value - evicted) * (value - self.mean + evicted - old_mean)
+            self.m2 = max(self.m2, 0.0)
+
+    @property
+    def std(self) -> float:
+        # sample std like pandas; a single value has no spread (batch path fills NaN with 0)
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class IncrementalFeatureBuilder:
+    """Streaming equivalent of ``build_baseline_matrix`` for newly appended hours.
+
+    Keeps a ring buffer of recent consumption for the lag features and one Welford
+    accumulator per rolling window, so each appended row costs O(lags + windows).
+    Rows are emitted once every lag is available, matching the batch path.
+    Inputs must be consecutive rows of the same series as the batch path.
+
+    ``next_features`` only looks at past values, so the builder also drives recursive
+    forecasting: predict the next value from it, then ``append`` the prediction.
+    """
+
+    def __init__(self, spec: FeatureSpec = DEFAULT_FEATURE_SPEC):
+        self.spec = spec
+        self._capacity = max((*spec.lags, *spec.windows), default=0) + 1
+        self._buffer = np.zeros(self._capacity)
+        self._seen = 0
+        self._moments = [_RollingMoments(w) for w in spec.windows]
+        self.columns = ["timestamp", "consumption", *spec.feature_names]
+
+    def _back(self, steps: int) -> float:
+        return float(self._buffer[(self._seen - 1 - steps) % self._capacity])
+
+    def _push(self, value: float) -> None:
+        for moments in self._moments:
+            evicted = self._back(moments.window - 1) if self._seen >= moments.window else None
+            moments.push(value, evicted)
+        self._buffer[self._seen % self._capacity] = value
+        self._seen += 1
+
+    def next_features(self, timestamp: pd.Timestamp) -> np.ndarray | None:
+        """Feature vector (``spec.feature_names`` order) for the row after the last value."""
+        if self._seen < self.spec.first_row:
+            return None
+        out = np.empty(len(self.columns) - 2)
+        col = 0
+        if self.spec.time_features:
+            dayofweek = timestamp.dayofweek
+            out[:3] = (timestamp.hour, dayofweek, dayofweek >= 5)
+            col = 3
+        for lag in self.spec.lags:
+            out[col] = self._back(lag - 1)
+            col += 1
+        for moments in self._moments:
+            out[col : col + 2] = (moments.mean, moments.std)
+            col += 2
+        return out
+
+    def append(self, value: float) -> None:
+        self._push(float(value))
+
+    def update(self, timestamp: pd.Timestamp, value: float) -> dict | None:
+        features = self.next_features(timestamp)
+        self.append(value)
+        if features is None:
+            return None
+        row = {"timestamp": timestamp, "consumption": float(value)}
+        row.update(zip(self.spec.feature_names, features))
+        return row
+
+    def extend(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feed appended rows and return the feature rows they produce."""
+        rows = []
+        for ts, value in zip(df["timestamp"], df["consumption"].to_numpy()):
+            row = self.update(ts, value)
+            if row is not None:
+                rows.append(row)
+        out = pd.DataFrame(rows, columns=self.columns)
+        return out.astype({name: self.spec.dtype for name in self.spec.feature_names})
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, spec: FeatureSpec = DEFAULT_FEATURE_SPEC) -> "IncrementalFeatureBuilder":
+        """Warm up the running state from existing history without building its rows."""
+        builder = cls(spec)
+        for value in df["consumption"].to_numpy(dtype=float):
+            builder.append(value)
+        return builder
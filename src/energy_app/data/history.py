@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import io
+import logging
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from energy_app.data.loader import to_utc
+
+logger = logging.getLogger(__name__)
+
+# Bytes at the start of a CSV fingerprinted to tell appends from rewrites.
+HEAD_CHECK_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class _FileState:
+    mtime_ns: int
+    size: int
+    token: str = ""
+
+
+class HistoryStore:
+    """In-process consumption history loaded once and refreshed when the source changes.
+
+    The source is a CSV file or a ``ConsumptionStore`` directory. Timestamps (UTC,
+    int64 ns) and consumption values are kept in growable column buffers.
+    ``tail``/``range`` return frames backed by views of those buffers, so a request
+    never re-parses the source. Rows appended to a CSV are parsed incrementally; any
+    other change (including any write to a store) triggers a full reload.
+    """
+
+    def __init__(self, path: str | Path, initial_capacity: int = 1024, meter_id: str | None = None):
+        self.path = Path(path)
+        self.meter_id = meter_id
+        self._lock = threading.Lock()
+        self._ts = np.empty(initial_capacity, dtype="int64")
+        self._values = np.empty(initial_capacity, dtype="float64")
+        self._size = 0
+        self._state: _FileState | None = None
+        self._offset = 0
+        self._header: list[str] = []
+        self._head_crc = 0
+        self._last_line = b""
+        self.refresh()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def refresh(self) -> bool:
+        """Reload or append if the file changed since the last check; returns True on change."""
+        source = self._store().version_path if self.path.is_dir() else self.path
+        if not source.exists():
+            return False
+        stat = source.stat()
+        # stores rewrite a small version token on every write; mtime alone can be too coarse
+        token = source.read_text(encoding="utf-8") if self.path.is_dir() else ""
+        state = _FileState(stat.st_mtime_ns, stat.st_size, token)
+        with self._lock:
+            if state == self._state:
+                return False
+            if self.path.is_dir():
+                self._reload_store()
+            elif self._state is not None and state.size > self._offset and self._tail_is_append():
+                self._append_from(self._offset)
+            else:
+                self._reload()
+            self._remember_prefix()
+            self._state = state
+        return True
+
+    def tail(self, n: int) -> pd.DataFrame:
+        self.refresh()
+        ts, values = self._snapshot()
+        return self._frame(ts[-n:] if n else ts[:0], values[-n:] if n else values[:0])
+
+    def range(self, start: pd.Timestamp | str | None = None, end: pd.Timestamp | str | None = None) -> pd.DataFrame:
+        """Rows with ``start <= timestamp < end`` (either bound optional)."""
+        self.refresh()
+        ts, values = self._snapshot()
+        lo = np.searchsorted(ts, to_utc(start).value, side="left") if start is not None else 0
+        hi = np.searchsorted(ts, to_utc(end).value, side="left") if end is not None else len(ts)
+        return self._frame(ts[lo:hi], values[lo:hi])
+
+    def _snapshot(self) -> tuple[np.ndarray, np.ndarray]:
+        # Views stay valid after later appends: growth allocates new buffers.
+        with self._lock:
+            return self._ts[: self._size], self._values[: self._size]
+
+    @staticmethod
+    def _frame(ts: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "timestamp": pd.DatetimeIndex(ts.view("datetime64[ns]"), tz="UTC", copy=False),
+                "consumption": values,
+            },
+            copy=False,
+        )
+
+    def _reload(self) -> None:
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        header_end = raw.find(b"\n") + 1
+        self._header = raw[:header_end].decode("utf-8").strip().split(",")
+        # Fresh buffers so frames handed out before the reload keep their data.
+        self._ts = np.empty(len(self._ts), dtype="int64")
+        self._values = np.empty(len(self._values), dtype="float64")
+        self._size = 0
+        self._offset = header_end
+        self._parse_and_append(raw[header_end:], final=True)
+        logger.info("Loaded %d history rows from %s", self._size, self.path)
+
+    def _store(self):
+        from energy_app.storage.series_store import ConsumptionStore
+
+        return ConsumptionStore(self.path)
+
+    def _reload_store(self) -> None:
+        from energy_app.storage.series_store import DEFAULT_METER
+
+        df = self._store().read(self.meter_id or DEFAULT_METER, columns=["timestamp", "consumption"])
+        self._ts = np.empty(len(self._ts), dtype="int64")
+        self._values = np.empty(len(self._values), dtype="float64")
+        self._size = 0
+        self._extend(
+            df["timestamp"].to_numpy(dtype="datetime64[ns]").view("int64"),
+            df["consumption"].to_numpy(dtype="float64"),
+        )
+        logger.info("Loaded %d history rows from store %s", self._size, self.path)
+
+    def _append_from(self, offset: int) -> None:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            raw = f.read()
+        before = self._size
+        self._parse_and_append(raw)
+        logger.info("Appended %d history rows from %s", self._size - before, self.path)
+
+    def _remember_prefix(self) -> None:
+        # Fingerprint what has been consumed: a checksum of its head and its last line.
+        if self.path.is_dir() or self._offset == 0:
+            return
+        with open(self.path, "rb") as f:
+            self._head_crc = zlib.crc32(f.read(min(self._offset, HEAD_CHECK_BYTES)))
+            start = max(0, self._offset - HEAD_CHECK_BYTES)
+            f.seek(start)
+            consumed = f.read(self._offset - start)
+        self._last_line = consumed[consumed.rstrip(b"\n").rfind(b"\n") + 1 :]
+
+    def _tail_is_append(self) -> bool:
+        # The file is treated as appended-to only if the consumed prefix still looks the
+        # same: its head checksum and the last line we parsed, which must still end right
+        # at our offset. A rewritten (even longer) file fails one of these and is reloaded.
+        if self._offset == 0 or not self._last_line.endswith(b"\n"):
+            return False
+        with open(self.path, "rb") as f:
+            if zlib.crc32(f.read(min(self._offset, HEAD_CHECK_BYTES))) != self._head_crc:
+                return False
+            f.seek(self._offset - len(self._last_line))
+            return f.read(len(self._last_line)) == self._last_line
+
+    def _parse_and_append(self, raw: bytes, final: bool = False) -> None:
+        # When appending, only consume complete lines; a partially written last row is
+        # picked up by the next refresh.
+        chunk = raw if final else raw[: raw.rfind(b"\n") + 1]
+        self._offset += len(chunk)
+        if not chunk.strip():
+            return
+        df = pd.read_csv(io.BytesIO(chunk), header=None, names=self._header, usecols=["timestamp", "consumption"])
+        ts = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
+        if ts.isna().any():
+            raise ValueError("Invalid timestamps encountered during parsing.")
+        self._extend(ts.to_numpy(dtype="datetime64[ns]").view("int64"), df["consumption"].to_numpy(dtype="float64"))
+
+    def _extend(self, ts: np.ndarray, values: np.ndarray) -> None:
+        needed = self._size + len(ts)
+        unsorted = np.any(np.diff(ts) < 0) or (self._size and len(ts) and ts[0] < self._ts[self._size - 1])
+        if unsorted:
+            # Keep the index sorted so range() can binary-search; rebuild into new buffers
+            # so frames handed out earlier are left untouched.
+            merged_ts = np.concatenate([self._ts[: self._size], ts])
+            order = np.argsort(merged_ts, kind="stable")
+            self._ts = merged_ts[order]
+            self._values = np.concatenate([self._values[: self._size], values])[order]
+        else:
+            if needed > len(self._ts):
+                capacity = max(needed, 2 * len(self._ts))
+                new_ts = np.empty(capacity, dtype="int64")
+                new_values = np.empty(capacity, dtype="float64")
+                new_ts[: self._size] = self._ts[: self._size]
+                new_values[: self._size] = self._values[: self._size]
+                self._ts, self._values = new_ts, new_values
+            self._ts[self._size : needed] = ts
+            self._values[self._size : needed] = values
+        self._size = needed
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+UCI_MEMBER = "household_power_consumption.txt"
+UCI_COLUMNS = ["Date", "Time", "Global_active_power"]
+
+Sink = Callable[[pd.DataFrame], None]
+
+
+@dataclass
+class IngestStats:
+    rows_in: int = 0
+    rows_out: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_in / self.seconds if self.seconds else 0.0
+
+
+class HourlyAggregator:
+    """Aggregate time-ordered readings into per-period means across chunk boundaries.
+
+    Each ``push`` returns the periods that are complete; the last (possibly partial)
+    period is carried over as a running sum/count until a later chunk or ``flush``.
+    """
+
+    def __init__(self, freq: str = "1h"):
+        self.freq = freq
+        self._carry: pd.DataFrame | None = None
+
+    def push(self, df: pd.DataFrame) -> pd.DataFrame:
+        grouped = self._group(df)
+        if self._carry is not None:
+            grouped = grouped.add(self._carry, fill_value=0).sort_index()
+        if grouped.empty:
+            return self._finish(grouped)
+        self._carry = grouped.iloc[-1:]
+        return self._finish(grouped.iloc[:-1])
+
+    def flush(self) -> pd.DataFrame:
+        carry, self._carry = self._carry, None
+        if carry is None:
+            return pd.DataFrame(columns=["timestamp", "consumption"])
+        return self._finish(carry)
+
+    def _group(self, df: pd.DataFrame) -> pd.DataFrame:
+        period = pd.to_datetime(df["timestamp"], utc=True).dt.floor(self.freq)
+        values = pd.to_numeric(df["consumption"], errors="coerce")
+        return values.groupby(period).agg(["sum", "count"])
+
+    @staticmethod
+    def _finish(grouped: pd.DataFrame) -> pd.DataFrame:
+        grouped = grouped[grouped["count"] > 0]
+        out = pd.DataFrame({"timestamp": grouped.index, "consumption": (grouped["sum"] / grouped["count"]).to_numpy()})
+        return out.reset_index(drop=True)
+
+
+def iter_uci_chunks(zip_path: str | Path, chunksize: int = 200_000, max_rows: int | None = None) -> Iterator[pd.DataFrame]:
+    """Stream minute readings from the UCI ZIP as ``timestamp, consumption`` frames.
+
+    The archive member is decompressed and parsed incrementally, so memory is bounded
+    by ``chunksize`` rather than the file size.
+    """
+    with zipfile.ZipFile(zip_path) as zf, zf.open(UCI_MEMBER) as f:
+        reader = pd.read_csv(
+            f,
+            sep=";",
+            na_values=["?"],
+            usecols=UCI_COLUMNS,
+            dtype={"Date": str, "Time": str, "Global_active_power": "float64"},
+            chunksize=chunksize,
+            nrows=max_rows,
+        )
+        for raw in reader:
+            ts = pd.to_datetime(raw["Date"] + " " + raw["Time"], format="%d/%m/%Y %H:%M:%S", utc=True)
+            yield pd.DataFrame({"timestamp": ts, "consumption": raw["Global_active_power"]}).dropna()
+
+
+def ingest_chunks(chunks: Iterator[pd.DataFrame], sink: Sink, freq: str | None = "1h") -> IngestStats:
+    """Aggregate streamed chunks (when ``freq`` is set) and hand each result to ``sink``."""
+    stats = IngestStats()
+    aggregator = HourlyAggregator(freq) if freq else None
+    start = time.perf_counter()
+    for chunk in chunks:
+        stats.rows_in += len(chunk)
+        out = aggregator.push(chunk) if aggregator else chunk
+        if len(out):
+            sink(out)
+            stats.rows_out += len(out)
+        stats.seconds = time.perf_counter() - start
+        logger.info("Ingested %d rows (%.0f rows/sec)", stats.rows_in, stats.rows_per_sec)
+    if aggregator:
+        out = aggregator.flush()
+        if len(out):
+            sink(out)
+            stats.rows_out += len(out)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+class CsvSink:
+    """Append frames to a CSV, writing the header with the first chunk."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._started = False
+
+    def __call__(self, df: pd.DataFrame) -> None:
+        df.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
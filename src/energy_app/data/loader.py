@@ -37,10 +37,55 @@ def load_consumption_csv(path: str | Path, tz: str | None = None) -> pd.DataFram
     return df
 
 
+def to_utc(value: pd.Timestamp | str) -> pd.Timestamp:
+    """Timestamp in UTC; naive values are assumed to already be UTC."""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def load_consumption(
+    path: str | Path,
+    tz: str | None = None,
+    meter_id: str | None = None,
+    start: pd.Timestamp | str | None = None,
+    end: pd.Timestamp | str | None = None,
+) -> pd.DataFrame:
+    """Load consumption from a partitioned store directory, a Parquet file or a CSV.
+
+    ``meter_id``/``start``/``end`` are pushed down when reading from a store; for
+    single files the time range is applied after loading.
+    """
+    path = Path(path)
+    if path.is_dir():
+        from energy_app.storage.series_store import DEFAULT_METER, ConsumptionStore
+
+        logger.info("Loading consumption data from store %s", path)
+        df = ConsumptionStore(path).read(meter_id or DEFAULT_METER, start=start, end=end, columns=["timestamp", "consumption"])
+    else:
+        if path.suffix == ".parquet":
+            logger.info("Loading consumption data from %s", path)
+            df = pd.read_parquet(path)
+            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+            df = df.sort_values("timestamp").reset_index(drop=True)
+        else:
+            df = load_consumption_csv(path)
+        if start is not None:
+            df = df[df["timestamp"] >= to_utc(start)]
+        if end is not None:
+            df = df[df["timestamp"] < to_utc(end)]
+        df = df.reset_index(drop=True)
+    if tz:
+        df["timestamp"] = df["timestamp"].dt.tz_convert(tz)
+    return df
+
+
 def save_dataframe(df: pd.DataFrame, path: str | Path) -> None:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+    if path.suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
     logger.info("Saved dataframe to %s", path)
 
 
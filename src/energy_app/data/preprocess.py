@@ -30,13 +30,18 @@ def fill_and_resample(df: pd.DataFrame, tz: str | None = None, freq: str = "1H")
     return df
 
 
-def time_based_split(df: pd.DataFrame, config: SplitConfig | None = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+def split_bounds(n: int, config: SplitConfig | None = None) -> Tuple[int, int]:
+    """Row offsets where the validation and test segments start."""
     cfg = config or SplitConfig()
     if cfg.train_frac + cfg.val_frac >= 1:
         raise ValueError("train_frac + val_frac must be < 1")
-    n = len(df)
     train_end = int(n * cfg.train_frac)
     val_end = train_end + int(n * cfg.val_frac)
+    return train_end, val_end
+
+
+def time_based_split(df: pd.DataFrame, config: SplitConfig | None = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    train_end, val_end = split_bounds(len(df), config)
     train = df.iloc[:train_end]
     val = df.iloc[train_end:val_end]
     test = df.iloc[val_end:]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from pathlib import Path
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from energy_app.data.preprocess import SplitConfig, split_bounds
+from energy_app.data.windows import WindowConfig, strided_windows
+
+logger = logging.getLogger(__name__)
+
+
+SERIES_FILE = "series.npy"
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+
+def write_window_dataset(
+    df: pd.DataFrame,
+    path: str | Path,
+    cfg: WindowConfig,
+    columns: Sequence[str] = ("consumption",),
+) -> Path:
+    """Persist the raw series plus window metadata instead of materialized windows."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    columns = list(columns)
+    values = df[columns[0]].to_numpy() if len(columns) == 1 else df[columns].to_numpy()
+    values = np.ascontiguousarray(values, dtype=cfg.dtype)
+    np.save(path / SERIES_FILE, values)
+    n_windows = max(0, (len(values) - cfg.window - cfg.horizon) // cfg.step + 1)
+    meta = {
+        "version": FORMAT_VERSION,
+        "window": cfg.window,
+        "horizon": cfg.horizon,
+        "step": cfg.step,
+        "dtype": cfg.dtype,
+        "columns": columns,
+        "n_rows": int(len(values)),
+        "n_windows": int(n_windows),
+    }
+    if "timestamp" in df.columns and len(df):
+        meta["start"] = str(df["timestamp"].iloc[0])
+        meta["end"] = str(df["timestamp"].iloc[-1])
+    (path / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    logger.info("Saved window dataset to %s (%d rows, %d windows)", path, len(values), n_windows)
+    return path
+
+
+class WindowDataset:
+    """Random-access windows over a memory-mapped series written by ``write_window_dataset``.
+
+    Compatible with ``torch.utils.data.DataLoader`` (map-style); the memory map is
+    reopened lazily in each process instead of being pickled.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        meta = json.loads((self.path / META_FILE).read_text(encoding="utf-8"))
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported window dataset version: {meta.get('version')}")
+        self.meta = meta
+        self.config = WindowConfig(
+            window=meta["window"], horizon=meta["horizon"], step=meta["step"], dtype=meta["dtype"]
+        )
+        self.columns: list[str] = meta["columns"]
+        self.indices = range(meta["n_windows"])
+        self._series: np.ndarray | None = None
+
+    @classmethod
+    def open(cls, path: str | Path) -> "WindowDataset":
+        return cls(path)
+
+    @property
+    def series(self) -> np.ndarray:
+        if self._series is None:
+            self._series = np.load(self.path / SERIES_FILE, mmap_mode="r")
+        return self._series
+
+    @property
+    def num_channels(self) -> int:
+        return len(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        cfg = self.config
+        start = self.indices[idx] * cfg.step
+        x = np.array(self.series[start : start + cfg.window])
+        y = np.array(self.series[start + cfg.window : start + cfg.window + cfg.horizon])
+        return x, y
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only strided X/y views over the memory map (no materialization)."""
+        cfg = self.config
+        X, y = strided_windows(self.series, cfg.window, cfg.horizon, step=cfg.step, dtype=None)
+        window_slice = slice(self.indices.start, self.indices.stop)
+        return X[window_slice], y[window_slice]
+
+    def subset(self, indices: range) -> "WindowDataset":
+        """Shallow copy restricted to a contiguous range of window indices."""
+        sub = copy.copy(self)
+        sub.indices = self.indices[indices.start : indices.stop]
+        return sub
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_series"] = None
+        return state
+
+
+def split_window_dataset(
+    dataset: WindowDataset, config: SplitConfig | None = None
+) -> Tuple[WindowDataset, WindowDataset, WindowDataset]:
+    """Time-ordered train/val/test windows using the same row bounds as ``time_based_split``.
+
+    A window belongs to a segment when its targets fall entirely inside that segment;
+    its context may reach back into the previous one.
+    """
+    cfg = dataset.config
+    train_end, val_end = split_bounds(dataset.meta["n_rows"], config)
+
+    def _windows_ending_by(row: int) -> int:
+        # number of windows whose last target row is < row
+        return max(0, (row - cfg.window - cfg.horizon) // cfg.step + 1)
+
+    def _windows_starting_targets_at(row: int) -> int:
+        # first window whose targets start at or after row
+        return max(0, -(-(row - cfg.window) // cfg.step))
+
+    n = len(dataset.indices)
+    train_stop = min(n, _windows_ending_by(train_end))
+    val_start = min(n, max(train_stop, _windows_starting_targets_at(train_end)))
+    val_stop = min(n, max(val_start, _windows_ending_by(val_end)))
+    test_start = min(n, max(val_stop, _windows_starting_targets_at(val_end)))
+    return (
+        dataset.subset(range(0, train_stop)),
+        dataset.subset(range(val_start, val_stop)),
+        dataset.subset(range(test_start, n)),
+    )
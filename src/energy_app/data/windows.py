@@ -2,22 +2,65 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Sequence, Tuple
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
 
-def sliding_window(series: pd.Series, window: int, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
-    values = series.values
-    X, y = [], []
-    for i in range(len(values) - window - horizon + 1):
-        X.append(values[i : i + window])
-        y.append(values[i + window : i + window + horizon])
-    X_arr = np.array(X)
-    y_arr = np.array(y)
+def strided_windows(
+    values: np.ndarray,
+    window: int,
+    horizon: int,
+    step: int = 1,
+    dtype: np.dtype | str | None = np.float32,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Build read-only X/y window views over ``values`` without copying.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        Series of shape ``(n,)`` or multi-channel array of shape ``(n, channels)``.
+    window: int
+        Context length of each input window.
+    horizon: int
+        Number of future steps in each target window.
+    step: int
+        Offset between consecutive window starts.
+    dtype: Optional[dtype]
+        Cast the buffer once before windowing (``None`` keeps the input dtype).
+
+    Returns views of shape ``(n_windows, window[, channels])`` and
+    ``(n_windows, horizon[, channels])`` that share memory with the (cast) buffer.
+    """
+    if window < 1 or horizon < 1 or step < 1:
+        raise ValueError("window, horizon and step must be positive")
+    values = np.asarray(values)
+    if values.ndim not in (1, 2):
+        raise ValueError(f"Expected 1D or 2D values, got shape {values.shape}")
+    if dtype is not None:
+        values = values.astype(dtype, copy=False)
+    span = window + horizon
+    if len(values) < span:
+        shape_tail = values.shape[1:]
+        empty = np.empty((0, window, *shape_tail), dtype=values.dtype)
+        return empty, np.empty((0, horizon, *shape_tail), dtype=values.dtype)
+    # (n_windows, [channels,] span) -> move the time axis next to the window axis.
+    spans = sliding_window_view(values, span, axis=0)[::step]
+    if values.ndim == 2:
+        spans = np.moveaxis(spans, -1, 1)
+    X = spans[:, :window]
+    y = spans[:, window:]
+    X.flags.writeable = False
+    y.flags.writeable = False
+    return X, y
+
+
+def sliding_window(series: pd.Series, window: int, horizon: int, step: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    X_arr, y_arr = strided_windows(series.to_numpy(), window, horizon, step=step, dtype=None)
     logger.info("Built sliding windows: X=%s, y=%s", X_arr.shape, y_arr.shape)
     return X_arr, y_arr
 
@@ -26,8 +69,17 @@ def sliding_window(series: pd.Series, window: int, horizon: int) -> Tuple[np.nda
 class WindowConfig:
     window: int = 168
     horizon: int = 24
+    step: int = 1
+    dtype: str = "float32"
 
 
-def build_transformer_windows(df: pd.DataFrame, cfg: WindowConfig) -> Tuple[np.ndarray, np.ndarray]:
-    series = df["consumption"]
-    return sliding_window(series, cfg.window, cfg.horizon)
+def build_transformer_windows(
+    df: pd.DataFrame,
+    cfg: WindowConfig,
+    columns: Sequence[str] = ("consumption",),
+) -> Tuple[np.ndarray, np.ndarray]:
+    columns = list(columns)
+    values = df[columns[0]].to_numpy() if len(columns) == 1 else df[columns].to_numpy()
+    X, y = strided_windows(values, cfg.window, cfg.horizon, step=cfg.step, dtype=cfg.dtype)
+    logger.info("Built transformer windows: X=%s, y=%s (%s)", X.shape, y.shape, X.dtype)
+    return X, y
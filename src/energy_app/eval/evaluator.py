@@ -16,9 +16,10 @@ def evaluate_models(models: List[Tuple[str, object]], df: pd.DataFrame, horizon:
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     results = []
     y_true = df["consumption"].tail(horizon).reset_index(drop=True)
+    history = df.iloc[:-horizon]
     for name, model in models:
         try:
-            preds = model.predict(df, horizon) if hasattr(model, "predict") else np.zeros_like(y_true)
+            preds = model.predict(history, horizon) if hasattr(model, "predict") else np.zeros_like(y_true)
             preds_series = pd.Series(preds).reset_index(drop=True)
             metrics = evaluate_series(y_true, preds_series)
             metrics["model"] = name
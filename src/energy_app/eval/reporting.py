@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from pathlib import Path
-import matplotlib.pyplot as plt
 import pandas as pd
 
 
@@ -13,6 +12,8 @@ def save_markdown_report(metrics: pd.DataFrame, path: str) -> None:
 
 
 def plot_predictions(y_true: pd.Series, predictions: dict[str, pd.Series], output_dir: str) -> None:
+    import matplotlib.pyplot as plt
+
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     plt.figure(figsize=(10, 4))
     plt.plot(y_true.reset_index(drop=True), label="Actual")
@@ -25,6 +26,8 @@ def plot_predictions(y_true: pd.Series, predictions: dict[str, pd.Series], outpu
 
 
 def plot_residuals(y_true: pd.Series, predictions: dict[str, pd.Series], output_dir: str) -> None:
+    import matplotlib.pyplot as plt
+
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     plt.figure(figsize=(10, 4))
     for name, series in predictions.items():
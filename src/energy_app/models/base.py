@@ -1,11 +1,48 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Sequence
+import numpy as np
 import pandas as pd
 
 
+DEFAULT_MAX_BATCH_SIZE = 256
+
+
+def pad_contexts(
+    contexts: Sequence[np.ndarray],
+    length: int | None = None,
+    fill: str = "zero",
+    dtype: np.dtype | str = np.float32,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Left-pad ragged histories into one array aligned on the most recent step.
+
+    Contexts longer than ``length`` keep their last ``length`` values. ``fill`` is
+    ``"zero"`` or ``"edge"`` (repeat the oldest observed value). Returns the padded
+    values of shape ``(batch, length[, channels])`` and a boolean observed mask of the
+    same shape.
+    """
+    arrays = [np.asarray(c, dtype=dtype) for c in contexts]
+    if not arrays:
+        raise ValueError("No contexts to pad")
+    length = length or max(len(a) for a in arrays)
+    tail_shape = arrays[0].shape[1:]
+    values = np.zeros((len(arrays), length, *tail_shape), dtype=dtype)
+    mask = np.zeros(values.shape, dtype=bool)
+    for i, arr in enumerate(arrays):
+        arr = arr[-length:]
+        if not len(arr):
+            continue
+        values[i, length - len(arr) :] = arr
+        mask[i, length - len(arr) :] = True
+        if fill == "edge":
+            values[i, : length - len(arr)] = arr[0]
+    return values, mask
+
+
 class BaseForecaster(ABC):
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+
     @abstractmethod
     def fit(self, X: Any, y: Any) -> None:
         ...
@@ -14,6 +51,23 @@ class BaseForecaster(ABC):
     def predict(self, X: Any, horizon: int, exog: Any | None = None) -> Any:
         ...
 
+    def predict_batch(self, contexts: Sequence[Any], horizon: int, max_batch_size: int | None = None) -> np.ndarray:
+        """Forecast many series at once; returns an array of shape ``(len(contexts), horizon)``.
+
+        Contexts are processed in chunks of at most ``max_batch_size`` (defaults to the
+        instance's ``max_batch_size``), each handled by one vectorized model call.
+        """
+        size = max_batch_size or self.max_batch_size
+        contexts = list(contexts)
+        if not contexts:
+            return np.empty((0, horizon))
+        chunks = [self._predict_batch(contexts[i : i + size], horizon) for i in range(0, len(contexts), size)]
+        return np.concatenate(chunks, axis=0)
+
+    def _predict_batch(self, contexts: Sequence[Any], horizon: int) -> np.ndarray:
+        # Fallback for models without a vectorized path.
+        return np.stack([np.asarray(self.predict(c, horizon)) for c in contexts])
+
     @abstractmethod
     def save(self, path: str) -> None:
         ...
@@ -2,52 +2,129 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
+from typing import Sequence
 
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import HistGradientBoostingRegressor
 
-from energy_app.models.base import BaseForecaster
-from energy_app.data.features import feature_columns
+from energy_app.models.base import BaseForecaster, pad_contexts
+from energy_app.data.features import DEFAULT_FEATURE_SPEC, FeatureSpec, IncrementalFeatureBuilder, feature_columns
 
 logger = logging.getLogger(__name__)
 
-try:
-    import lightgbm as lgb
-except ImportError:  # pragma: no cover - fallback path
-    lgb = None
+# Bump when the feature definitions change so older artifacts are rejected, not misfed.
+# 2: rolling windows exclude the current value (shift(1)); artifacts store their FeatureSpec.
+ARTIFACT_FORMAT = 2
+
+
+def _make_regressor():
+    # Imported here rather than at module level: lightgbm/sklearn take seconds to import
+    # and most importers of this module (feature scripts, the web app) never fit a model.
+    try:
+        import lightgbm as lgb
+    except ImportError:  # pragma: no cover - fallback path
+        from sklearn.ensemble import HistGradientBoostingRegressor
+
+        logger.info("Using sklearn HistGradientBoostingRegressor")
+        return HistGradientBoostingRegressor(max_depth=6)
+    logger.info("Using LightGBM regressor")
+    return lgb.LGBMRegressor(n_estimators=300, learning_rate=0.05, verbose=-1)
 
 
 class BaselineForecaster(BaseForecaster):
-    def __init__(self):
-        if lgb:
-            self.model = lgb.LGBMRegressor(n_estimators=300, learning_rate=0.05)
-            logger.info("Using LightGBM regressor")
-        else:
-            self.model = HistGradientBoostingRegressor(max_depth=6)
-            logger.info("Using sklearn HistGradientBoostingRegressor")
+    """Gradient-boosted one-step model rolled forward recursively over the horizon.
+
+    ``predict`` takes raw history (``timestamp``, ``consumption``); each step's lag and
+    rolling features are updated incrementally from the previous prediction.
+    """
+
+    def __init__(self, spec: FeatureSpec = DEFAULT_FEATURE_SPEC):
+        self.spec = spec
+        self.model = _make_regressor()
+
+    @property
+    def is_fitted(self) -> bool:
+        return hasattr(self.model, "n_features_in_")
 
     def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
+        if list(X.columns) != self.spec.feature_names:
+            raise ValueError(f"Expected feature columns {self.spec.feature_names}, got {list(X.columns)}")
         self.model.fit(X, y)
 
     def predict(self, X: pd.DataFrame, horizon: int, exog=None) -> np.ndarray:
-        try:
-            preds = self.model.predict(X.tail(horizon))
-            return preds
-        except Exception:  # pragma: no cover - fallback for demo before training
-            last = X[\"consumption\"].iloc[-1] if \"consumption\" in X.columns else 0.0
-            return np.full(horizon, last)
+        return self.predict_batch([X], horizon)[0]
+
+    def _predict_batch(self, contexts: Sequence[pd.DataFrame], horizon: int) -> np.ndarray:
+        if not self.is_fitted:
+            logger.warning("Baseline model is not trained; using a seasonal naive forecast.")
+            return np.stack([self._naive_forecast(ctx, horizon) for ctx in contexts])
+        # All series advance in lockstep so every step is a single model call.
+        needed = self.spec.history_length
+        builders, next_ts, steps = [], [], []
+        for ctx in contexts:
+            if not len(ctx):
+                raise ValueError("Cannot forecast from an empty history")
+            if len(ctx) < needed:
+                ctx = self._pad_history(ctx, needed)
+            builders.append(IncrementalFeatureBuilder.from_history(ctx.tail(self.spec.history_length), self.spec))
+            timestamps = ctx["timestamp"]
+            step = timestamps.iloc[-1] - timestamps.iloc[-2] if len(ctx) > 1 else pd.Timedelta(hours=1)
+            steps.append(step)
+            next_ts.append(timestamps.iloc[-1] + step)
+        preds = np.empty((len(contexts), horizon))
+        features = np.empty((len(contexts), len(self.spec.feature_names)))
+        for h in range(horizon):
+            for i, builder in enumerate(builders):
+                features[i] = builder.next_features(next_ts[i])
+            step_preds = self.model.predict(pd.DataFrame(features, columns=self.spec.feature_names))
+            preds[:, h] = step_preds
+            for i, builder in enumerate(builders):
+                builder.append(step_preds[i])
+                next_ts[i] += steps[i]
+        return preds
+
+    @staticmethod
+    def _pad_history(history: pd.DataFrame, length: int) -> pd.DataFrame:
+        """Left-pad a short history to ``length`` rows, like ``pad_contexts(fill="edge")``.
+
+        Missing lags and rolling windows see the oldest observed value repeated, at
+        timestamps extended backwards by the history's step.
+        """
+        values, _ = pad_contexts([history["consumption"].to_numpy(dtype=float)], length=length, fill="edge", dtype=float)
+        timestamps = history["timestamp"]
+        step = timestamps.iloc[-1] - timestamps.iloc[-2] if len(history) > 1 else pd.Timedelta(hours=1)
+        index = pd.date_range(end=timestamps.iloc[-1], periods=length, freq=step)
+        return pd.DataFrame({"timestamp": index, "consumption": values[0]})
+
+    @staticmethod
+    def _naive_forecast(history: pd.DataFrame, horizon: int) -> np.ndarray:
+        values = history["consumption"].to_numpy(dtype=float)
+        if not len(values):
+            return np.zeros(horizon)
+        season = values[-24:]
+        return np.resize(season, horizon)
 
     def save(self, path: str) -> None:
         Path(path).parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump(self.model, path)
+        joblib.dump({"model": self.model, "spec": self.spec, "format": ARTIFACT_FORMAT}, path)
         logger.info("Saved baseline model to %s", path)
 
     @classmethod
     def load(cls, path: str) -> "BaselineForecaster":
-        obj = cls()
-        obj.model = joblib.load(path)
+        payload = joblib.load(path)
+        if not isinstance(payload, dict) or "spec" not in payload:
+            raise ValueError(
+                f"{path} is a legacy baseline artifact trained on older feature definitions; "
+                "retrain it (scripts/train_baseline.py or scripts/train_households.py)."
+            )
+        # Dicts without a format were written by the first spec-storing release (format 2).
+        if payload.get("format", 2) != ARTIFACT_FORMAT:
+            raise ValueError(
+                f"{path} uses baseline artifact format {payload.get('format')}, expected {ARTIFACT_FORMAT}; retrain it."
+            )
+        obj = cls(payload["spec"])
+        obj.model = payload["model"]
         return obj
 
     @staticmethod
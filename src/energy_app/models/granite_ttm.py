@@ -2,23 +2,28 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import numpy as np
-from transformers import pipeline
 
-from energy_app.models.base import BaseForecaster
+from energy_app.models.base import BaseForecaster, pad_contexts
 
 logger = logging.getLogger(__name__)
 
 
+def _first(result: Any) -> dict:
+    # Batched pipeline calls may wrap each item's output in a list.
+    return result[0] if isinstance(result, list) else result
+
+
 class GraniteTTMForecaster(BaseForecaster):
     def __init__(self, model_id: str = "ibm-granite/granite-timeseries-ttm-r1"):
+        from transformers import pipeline  # heavy; only needed once the model is used
+
         self.model_id = model_id
-        self._pipeline = pipeline(
-            task="time-series-forecasting",
-            model=self.model_id,
-        )
+        # Owned by this instance, so the model registry accounts for (and frees) it;
+        # the registry keeps loaded instances warm, so this is built once per version.
+        self._pipeline = pipeline(task="time-series-forecasting", model=model_id)
 
     def fit(self, X: Any, y: Any) -> None:  # pragma: no cover - zero-shot
         logger.info("Granite TTM operates zero-shot; fit is a no-op.")
@@ -33,6 +38,16 @@ class GraniteTTMForecaster(BaseForecaster):
         preds = np.array(result[0]["prediction"])
         return preds
 
+    def _predict_batch(self, contexts: Sequence[np.ndarray], horizon: int) -> np.ndarray:
+        # The pipeline has no observed mask, so ragged histories are edge-padded.
+        values, _ = pad_contexts(contexts, fill="edge")
+        results = self._pipeline(
+            inputs=values.tolist(),
+            prediction_length=horizon,
+            batch_size=len(values),
+        )
+        return np.stack([np.asarray(_first(r)["prediction"])[:horizon] for r in results])
+
     def save(self, path: str) -> None:
         Path(path).mkdir(parents=True, exist_ok=True)
         logger.info("Granite TTM uses hosted weights; nothing to persist locally beyond config.")
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import logging
+import os
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import numpy as np
 import torch
+from torch.utils.data import DataLoader, Dataset
 from transformers import PatchTSTForPrediction, PatchTSTConfig
 
-from energy_app.models.base import BaseForecaster
+from energy_app.models.base import BaseForecaster, pad_contexts
 
 logger = logging.getLogger(__name__)
 
@@ -23,36 +27,196 @@ def _default_config(input_length: int, prediction_length: int, num_features: int
     )
 
 
+def _with_channels(arr: np.ndarray) -> np.ndarray:
+    """PatchTST expects (batch, time, channels); add the channel axis for univariate windows."""
+    return arr[..., None] if arr.ndim == 2 else arr
+
+
+@dataclass
+class TrainConfig:
+    epochs: int = 20
+    batch_size: int = 256
+    lr: float = 1e-3
+    num_workers: int = 0
+    grad_accum_steps: int = 1
+    patience: int = 3
+    min_delta: float = 0.0
+    checkpoint_dir: str | None = None
+    resume: bool = False
+    seed: int = 42
+
+
+class _ArrayWindows(Dataset):
+    """Map-style dataset over (possibly strided or memory-mapped) X/y arrays."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray):
+        if len(X) != len(y):
+            raise ValueError("X and y must have the same number of windows")
+        self.X = X
+        self.y = y
+
+    def __len__(self) -> int:
+        return len(self.X)
+
+    def __getitem__(self, idx: int):
+        return np.array(self.X[idx]), np.array(self.y[idx])
+
+
+def _as_dataset(X: Any, y: Any | None) -> Dataset:
+    if y is None:
+        return X  # already yields (x, y) pairs, e.g. WindowDataset
+    return _ArrayWindows(X, y)
+
+
+def _to_device(batch: torch.Tensor, device: torch.device) -> torch.Tensor:
+    batch = batch.to(device=device, dtype=torch.float32)
+    return batch.unsqueeze(-1) if batch.ndim == 2 else batch
+
+
 class PatchTSTForecaster(BaseForecaster):
     def __init__(self, config: PatchTSTConfig):
         self.model = PatchTSTForPrediction(config)
         self.config = config
 
-    def fit(self, X: np.ndarray, y: np.ndarray) -> None:
-        # Minimal manual training loop for demo (not optimized)
-        self.model.train()
-        optimizer = torch.optim.Adam(self.model.parameters(), lr=1e-3)
+    def fit(
+        self,
+        X: Any,
+        y: Any | None = None,
+        val: Any | None = None,
+        train_config: TrainConfig | None = None,
+    ) -> None:
+        """Mini-batch training with early stopping and checkpoint/resume.
+
+        ``X``/``y`` are window arrays (views are fine), or ``X`` is a map-style dataset
+        yielding ``(x, y)`` pairs with ``y=None``. ``val`` is a dataset or an ``(X, y)``
+        tuple used for early stopping.
+        """
+        cfg = train_config or TrainConfig()
+        torch.manual_seed(cfg.seed)
         device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model.to(device)
-        X_tensor = torch.tensor(X, dtype=torch.float32, device=device)
-        y_tensor = torch.tensor(y, dtype=torch.float32, device=device)
-        for epoch in range(3):
-            optimizer.zero_grad()
+        optimizer = torch.optim.Adam(self.model.parameters(), lr=cfg.lr)
+
+        train_ds = _as_dataset(X, y)
+        val_ds = _as_dataset(*val) if isinstance(val, tuple) else val
+        loader_kwargs = {
+            "batch_size": cfg.batch_size,
+            "num_workers": cfg.num_workers,
+            "persistent_workers": cfg.num_workers > 0,
+            "pin_memory": device.type == "cuda",
+        }
+        train_loader = DataLoader(train_ds, shuffle=True, drop_last=False, **loader_kwargs)
+        val_loader = DataLoader(val_ds, shuffle=False, **loader_kwargs) if val_ds is not None and len(val_ds) else None
+
+        ckpt_dir = Path(cfg.checkpoint_dir) if cfg.checkpoint_dir else None
+        state = {"epoch": 0, "best_loss": float("inf"), "bad_epochs": 0}
+        if ckpt_dir and cfg.resume and (ckpt_dir / "last.pt").exists():
+            state = self._load_checkpoint(ckpt_dir / "last.pt", optimizer)
+            logger.info("Resumed PatchTST training from epoch %d", state["epoch"])
+        best_state = {k: v.detach().clone() for k, v in self.model.state_dict().items()}
+        if ckpt_dir and (ckpt_dir / "best.pt").exists() and cfg.resume:
+            best_state = torch.load(ckpt_dir / "best.pt", map_location=device)["model"]
+
+        for epoch in range(state["epoch"], cfg.epochs):
+            start = time.perf_counter()
+            train_loss, seen = self._train_epoch(train_loader, optimizer, device, cfg.grad_accum_steps)
+            elapsed = time.perf_counter() - start
+            val_loss = self._evaluate(val_loader, device) if val_loader is not None else train_loss
+            logger.info(
+                "Epoch %d/%d train_loss %.4f val_loss %.4f | %d windows in %.1fs (%.0f windows/sec)",
+                epoch + 1,
+                cfg.epochs,
+                train_loss,
+                val_loss,
+                seen,
+                elapsed,
+                seen / max(elapsed, 1e-9),
+            )
+            state["epoch"] = epoch + 1
+            if val_loss < state["best_loss"] - cfg.min_delta:
+                state["best_loss"] = val_loss
+                state["bad_epochs"] = 0
+                best_state = {k: v.detach().clone() for k, v in self.model.state_dict().items()}
+                if ckpt_dir:
+                    self._save_checkpoint(ckpt_dir / "best.pt", {"model": best_state})
+            else:
+                state["bad_epochs"] += 1
+            if ckpt_dir:
+                self._save_checkpoint(
+                    ckpt_dir / "last.pt",
+                    {
+                        "model": self.model.state_dict(),
+                        "optimizer": optimizer.state_dict(),
+                        "state": state,
+                        "train_config": asdict(cfg),
+                    },
+                )
+            if val_loader is not None and state["bad_epochs"] >= cfg.patience:
+                logger.info("Early stopping after epoch %d (best val_loss %.4f)", epoch + 1, state["best_loss"])
+                break
+        self.model.load_state_dict(best_state)
+
+    def _train_epoch(self, loader: DataLoader, optimizer, device: torch.device, accum_steps: int) -> tuple[float, int]:
+        self.model.train()
+        total, seen = 0.0, 0
+        optimizer.zero_grad()
+        for step, (X_batch, y_batch) in enumerate(loader, start=1):
+            X_tensor = _to_device(X_batch, device)
+            y_tensor = _to_device(y_batch, device)
             outputs = self.model(X_tensor)
-            loss = torch.nn.functional.mse_loss(outputs.predictions, y_tensor)
-            loss.backward()
-            optimizer.step()
-            logger.info("Epoch %d loss %.4f", epoch + 1, loss.item())
+            loss = torch.nn.functional.mse_loss(outputs.prediction_outputs, y_tensor)
+            (loss / accum_steps).backward()
+            if step % accum_steps == 0 or step == len(loader):
+                optimizer.step()
+                optimizer.zero_grad()
+            total += loss.item() * len(X_batch)
+            seen += len(X_batch)
+        return total / max(seen, 1), seen
+
+    def _evaluate(self, loader: DataLoader, device: torch.device) -> float:
+        self.model.eval()
+        total, seen = 0.0, 0
+        with torch.no_grad():
+            for X_batch, y_batch in loader:
+                outputs = self.model(_to_device(X_batch, device))
+                loss = torch.nn.functional.mse_loss(outputs.prediction_outputs, _to_device(y_batch, device))
+                total += loss.item() * len(X_batch)
+                seen += len(X_batch)
+        return total / max(seen, 1)
+
+    @staticmethod
+    def _save_checkpoint(path: Path, payload: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        torch.save(payload, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _load_checkpoint(self, path: Path, optimizer) -> dict:
+        payload = torch.load(path, map_location=next(self.model.parameters()).device)
+        self.model.load_state_dict(payload["model"])
+        optimizer.load_state_dict(payload["optimizer"])
+        return payload["state"]
 
     def predict(self, X: np.ndarray, horizon: int, exog: Any | None = None) -> np.ndarray:
         self.model.eval()
         device = next(self.model.parameters()).device
-        X_tensor = torch.tensor(X[-1:], dtype=torch.float32, device=device)
+        X_tensor = torch.tensor(_with_channels(X[-1:]), dtype=torch.float32, device=device)
         with torch.no_grad():
             outputs = self.model(X_tensor)
-        preds = outputs.predictions.cpu().numpy()[0, :horizon]
+        preds = outputs.prediction_outputs.cpu().numpy()[0, :horizon, 0]
         return preds
 
+    def _predict_batch(self, contexts: Sequence[np.ndarray], horizon: int) -> np.ndarray:
+        # Ragged histories are left-padded to context_length and masked out as unobserved.
+        values, mask = pad_contexts(contexts, length=self.config.context_length)
+        self.model.eval()
+        device = next(self.model.parameters()).device
+        past_values = torch.from_numpy(_with_channels(values)).to(device)
+        past_mask = torch.from_numpy(_with_channels(mask)).to(device=device, dtype=torch.float32)
+        with torch.no_grad():
+            outputs = self.model(past_values, past_observed_mask=past_mask)
+        return outputs.prediction_outputs.cpu().numpy()[:, :horizon, 0]
+
     def save(self, path: str) -> None:
         Path(path).mkdir(parents=True, exist_ok=True)
         self.model.save_pretrained(path)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Tuple
+
+from energy_app.models.base import BaseForecaster
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+Loader = Callable[[str | None], BaseForecaster]
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    name: str
+    load: Loader
+    path: str | None = None
+
+
+@dataclass
+class LoadedModel:
+    name: str
+    version: str
+    model: BaseForecaster
+    nbytes: int
+    load_seconds: float
+    loaded_at: float = field(default_factory=time.time)
+
+
+def artifact_version(path: str | Path | None) -> str:
+    """Cheap version token for an artifact file or directory (``"missing"`` if absent)."""
+    if path is None:
+        return "static"
+    path = Path(path)
+    if not path.exists():
+        return "missing"
+    files = [p for p in path.rglob("*") if p.is_file()] if path.is_dir() else [path]
+    if not files:
+        return "missing"
+    stats = [p.stat() for p in files]
+    return f"{max(s.st_mtime_ns for s in stats)}-{sum(s.st_size for s in stats)}"
+
+
+def estimate_nbytes(model: BaseForecaster, path: str | None = None) -> int:
+    """Approximate in-memory footprint: tensor parameters if any, else the artifact size.
+
+    Parameters are looked up on ``model.model`` and, for pipeline-backed forecasters
+    such as Granite TTM, on ``model._pipeline.model``; directory artifacts count the
+    size of all their files.
+    """
+    for inner in (getattr(model, "model", None), getattr(getattr(model, "_pipeline", None), "model", None)):
+        if hasattr(inner, "parameters"):
+            return sum(p.numel() * p.element_size() for p in inner.parameters())
+    if path and Path(path).is_file():
+        return Path(path).stat().st_size
+    if path and Path(path).is_dir():
+        return max(1, sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file()))
+    return 1
+
+
+class ModelRegistry:
+    """Forecasters keyed by name and artifact version, loaded lazily and kept warm.
+
+    ``get`` returns the current version of a model, loading it on first use. Loaded
+    models live in an LRU cache bounded by ``max_bytes`` of estimated footprint.
+    ``preload`` and ``refresh`` load in background threads; when ``refresh`` finds a
+    new artifact version it loads it off the request path and then swaps it in
+    atomically, so callers keep getting the previous model until the new one is ready.
+    """
+
+    def __init__(self, specs: Iterable[ModelSpec] = (), max_bytes: int = DEFAULT_MAX_BYTES, load_workers: int = 2):
+        self.max_bytes = max_bytes
+        self._specs: Dict[str, ModelSpec] = {spec.name: spec for spec in specs}
+        self._cache: "OrderedDict[Tuple[str, str], LoadedModel]" = OrderedDict()
+        self._current: Dict[str, Tuple[str, str]] = {}
+        self._loading: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=load_workers, thread_name_prefix="model-loader")
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def register(self, spec: ModelSpec) -> None:
+        with self._lock:
+            self._specs[spec.name] = spec
+
+    def names(self) -> list[str]:
+        return list(self._specs)
+
+    def get(self, name: str) -> LoadedModel:
+        """Current version of ``name``; blocks only if it has never been loaded."""
+        with self._lock:
+            key = self._current.get(name)
+            entry = self._cache.get(key) if key else None
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+        spec = self._spec(name)
+        return self._load(spec, artifact_version(spec.path)).result()
+
+    def preload(self, names: Iterable[str] | None = None) -> list[Future]:
+        """Start loading ``names`` (default: all registered) in the background."""
+        futures = []
+        for name in names or self.names():
+            spec = self._spec(name)
+            futures.append(self._load(spec, artifact_version(spec.path)))
+        return futures
+
+    def refresh(self) -> list[Future]:
+        """Load new artifact versions of already-loaded models and swap them in when ready."""
+        futures = []
+        with self._lock:
+            loaded = dict(self._current)
+        for name, (_, version) in loaded.items():
+            spec = self._spec(name)
+            latest = artifact_version(spec.path)
+            if latest != version and latest != "missing":
+                logger.info("New artifact for %s (%s -> %s); reloading in background", name, version, latest)
+                futures.append(self._load(spec, latest))
+        return futures
+
+    def start_watcher(self, interval_s: float = 30.0) -> None:
+        """Poll artifacts every ``interval_s`` seconds and hot-swap new versions."""
+        if self._watcher is not None:
+            return
+
+        def _watch() -> None:
+            while not self._stop.wait(interval_s):
+                try:
+                    self.refresh()
+                except Exception:  # keep watching; a broken artifact must not stop refreshes
+                    logger.exception("Model refresh failed")
+
+        self._watcher = threading.Thread(target=_watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": [
+                    {"name": e.name, "version": e.version, "nbytes": e.nbytes, "load_seconds": round(e.load_seconds, 3)}
+                    for e in self._cache.values()
+                ],
+                "current": {name: version for name, (_, version) in self._current.items()},
+                "nbytes": sum(e.nbytes for e in self._cache.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _spec(self, name: str) -> ModelSpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise KeyError(f"Unknown model {name!r}; registered: {self.names()}") from None
+
+    def _load(self, spec: ModelSpec, version: str) -> Future:
+        # Single flight: concurrent callers for the same version share one load.
+        key = (spec.name, version)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._current[spec.name] = key
+                done: Future = Future()
+                done.set_result(entry)
+                return done
+            pending = self._loading.get(key)
+            if pending is not None:
+                return pending
+            future = self._executor.submit(self._load_now, spec, version)
+            self._loading[key] = future
+        return future
+
+    def _load_now(self, spec: ModelSpec, version: str) -> LoadedModel:
+        key = (spec.name, version)
+        try:
+            start = time.perf_counter()
+            model = spec.load(spec.path)
+            entry = LoadedModel(spec.name, version, model, estimate_nbytes(model, spec.path), time.perf_counter() - start)
+            logger.info("Loaded model %s (%s) in %.2fs", spec.name, version, entry.load_seconds)
+            with self._lock:
+                previous = self._current.get(spec.name)
+                self._cache[key] = entry
+                # A slower load of an older artifact must not replace a newer one.
+                if previous is None or artifact_version(spec.path) == version:
+                    self._current[spec.name] = key
+                    if previous is not None and previous != key:
+                        self._cache.pop(previous, None)
+                self._evict(keep=key)
+            return entry
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _evict(self, keep: Tuple[str, str]) -> None:
+        total = sum(e.nbytes for e in self._cache.values())
+        for key in list(self._cache):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._cache.pop(key)
+            total -= entry.nbytes
+            self._evictions += 1
+            if self._current.get(entry.name) == key:
+                del self._current[entry.name]
+            logger.info("Evicted model %s (%s) from the registry cache", entry.name, entry.version)
+
+
+def _load_baseline(path: str | None) -> BaseForecaster:
+    from energy_app.models.baseline import BaselineForecaster
+
+    if path and Path(path).exists():
+        return BaselineForecaster.load(path)
+    logger.warning("Baseline artifact %s not found; serving an untrained baseline.", path)
+    return BaselineForecaster()
+
+
+def _load_patchtst(path: str | None) -> BaseForecaster:
+    from energy_app.models.patchtst import PatchTSTForecaster
+
+    if not path or not Path(path).exists():
+        raise FileNotFoundError(f"PatchTST artifact not found at {path}; train it with scripts/train_patchtst.py")
+    return PatchTSTForecaster.load(path)
+
+
+def _load_granite(path: str | None) -> BaseForecaster:
+    from energy_app.models.granite_ttm import GraniteTTMForecaster
+
+    return GraniteTTMForecaster.load(path or "")
+
+
+def registry_from_config(models_cfg: Mapping[str, Any], max_bytes: int = DEFAULT_MAX_BYTES) -> ModelRegistry:
+    """Registry with the baseline, PatchTST and Granite TTM models from ``cfg["models"]``."""
+    return ModelRegistry(
+        [
+            ModelSpec("baseline", _load_baseline, models_cfg.get("baseline_path")),
+            ModelSpec("patchtst", _load_patchtst, models_cfg.get("patchtst_path")),
+            ModelSpec("granite", _load_granite, models_cfg.get("granite_path")),
+        ],
+        max_bytes=int(models_cfg.get("cache_max_bytes", max_bytes)),
+    )
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from energy_app.data.features import DEFAULT_FEATURE_SPEC, FeatureSpec
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass(frozen=True)
+class TrainJob:
+    series_id: str
+    source: str
+    meter_id: str | None
+    fingerprint: str
+    artifact: str
+
+
+@dataclass
+class JobResult:
+    series_id: str
+    fingerprint: str
+    artifact: str
+    rows: int = 0
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class TrainingSummary:
+    trained: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def cpu_utilization(self) -> float:
+        """Worker CPU time over the CPU time available to the pool during the run."""
+        available = self.wall_seconds * self.workers
+        return self.cpu_seconds / available if available else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"trained {len(self.trained)}, skipped {len(self.skipped)} unchanged, failed {len(self.failed)}",
+            f"wall {self.wall_seconds:.1f}s, worker cpu {self.cpu_seconds:.1f}s, "
+            f"utilization {self.cpu_utilization:.0%} of {self.workers} workers",
+        ]
+        lines += [f"  FAILED {series_id}: {error}" for series_id, error in sorted(self.failed.items())]
+        return "\n".join(lines)
+
+
+def discover_series(source: str | Path) -> Dict[str, List[Path]]:
+    """Series ids and their data files: meters of a store, or files of a directory.
+
+    A ``ConsumptionStore`` root yields one series per ``meter=<id>`` partition; any
+    other directory yields one series per ``*.parquet``/``*.csv`` file (named by stem).
+    """
+    source = Path(source)
+    if any(source.glob("meter=*")):
+        return {p.name.split("=", 1)[1]: sorted(p.rglob("*.parquet")) for p in sorted(source.glob("meter=*")) if p.is_dir()}
+    files = sorted([*source.glob("*.parquet"), *source.glob("*.csv")])
+    return {p.stem: [p] for p in files}
+
+
+def fingerprint(files: Sequence[Path], spec: FeatureSpec, params: dict) -> str:
+    """Hash of the input files' names/sizes/mtimes plus the feature spec and model params."""
+    digest = hashlib.sha256()
+    for path in files:
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    digest.update(json.dumps({"spec": asdict(spec), "params": params}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: str | Path) -> Dict[str, dict]:
+    path = Path(output_dir) / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _init_worker(memory_limit_mb: int | None) -> None:
+    # One thread per worker: the pool provides the parallelism, nested OpenMP pools
+    # would only oversubscribe the cores.
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(1)
+    if memory_limit_mb:
+        try:
+            import resource
+        except ImportError:  # pragma: no cover - non-POSIX platforms
+            logger.warning("Per-worker memory limits are not supported on this platform")
+            return
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def train_series(job: TrainJob, spec: FeatureSpec = DEFAULT_FEATURE_SPEC, tz: str | None = None) -> JobResult:
+    """Load one series, build its features and fit/save a baseline model (runs in a worker)."""
+    from energy_app.data.features import build_baseline_matrix
+    from energy_app.data.loader import load_consumption
+    from energy_app.data.preprocess import fill_and_resample
+    from energy_app.models.baseline import BaselineForecaster
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    result = JobResult(job.series_id, job.fingerprint, job.artifact)
+    try:
+        # Each worker reads only its own series straight from the shared store/files;
+        # nothing large is pickled across the process boundary.
+        df = load_consumption(job.source, tz=tz, meter_id=job.meter_id)
+        df = fill_and_resample(df, tz=tz)
+        matrix = build_baseline_matrix(df, spec)
+        if matrix.empty:
+            raise ValueError(f"Not enough history to build features ({len(df)} rows)")
+        model = BaselineForecaster(spec)
+        if hasattr(model.model, "n_jobs"):
+            model.model.set_params(n_jobs=1)
+        model.fit(*model.build_training_matrix(matrix))
+        artifact = Path(job.artifact)
+        tmp = artifact.with_name(f".{artifact.name}.{os.getpid()}.tmp")
+        model.save(str(tmp))
+        os.replace(tmp, artifact)
+        result.rows = len(matrix)
+    except Exception as exc:  # reported in the summary, never kills the pool
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = time.perf_counter() - start
+    result.cpu_seconds = time.process_time() - cpu_start
+    return result
+
+
+def train_all(
+    source: str | Path,
+    output_dir: str | Path,
+    spec: FeatureSpec = DEFAULT_FEATURE_SPEC,
+    series: Sequence[str] | None = None,
+    workers: int | None = None,
+    memory_limit_mb: int | None = None,
+    max_tasks_per_child: int | None = 20,
+    force: bool = False,
+    tz: str | None = None,
+) -> TrainingSummary:
+    """Train one baseline model per series in ``source`` over a process pool.
+
+    Artifacts go to ``<output_dir>/<series_id>.pkl`` and are replaced atomically. A
+    manifest records each series' input fingerprint so unchanged series are skipped
+    on the next run (``force`` retrains everything). Workers are recycled after
+    ``max_tasks_per_child`` jobs and optionally capped at ``memory_limit_mb`` of
+    address space, which keeps long runs from accumulating memory (recycling uses
+    the ``spawn`` start method; pass ``None`` to keep forked, never-recycled workers).
+    """
+    from energy_app.models.baseline import BaselineForecaster
+
+    source, output_dir = Path(source), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    is_store = any(source.glob("meter=*"))
+    params = BaselineForecaster(spec).model.get_params()
+    manifest = load_manifest(output_dir)
+    available = discover_series(source)
+    wanted = list(series) if series else list(available)
+
+    summary = TrainingSummary(workers=workers or os.cpu_count() or 1)
+    jobs: List[TrainJob] = []
+    for series_id in wanted:
+        if series_id not in available:
+            summary.failed[series_id] = "no data found"
+            continue
+        files = available[series_id]
+        digest = fingerprint(files, spec, params)
+        artifact = output_dir / f"{series_id}.pkl"
+        entry = manifest.get(series_id, {})
+        if not force and entry.get("fingerprint") == digest and artifact.exists():
+            summary.skipped.append(series_id)
+            continue
+        jobs.append(
+            TrainJob(
+                series_id=series_id,
+                source=str(source if is_store else files[0]),
+                meter_id=series_id if is_store else None,
+                fingerprint=digest,
+                artifact=str(artifact),
+            )
+        )
+    logger.info("Training %d series (%d unchanged) with %d workers", len(jobs), len(summary.skipped), summary.workers)
+
+    start = time.perf_counter()
+    if jobs:
+        with ProcessPoolExecutor(
+            max_workers=min(summary.workers, len(jobs)),
+            initializer=_init_worker,
+            initargs=(memory_limit_mb,),
+            max_tasks_per_child=max_tasks_per_child,
+        ) as pool:
+            futures = {pool.submit(train_series, job, spec, tz): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:  # worker crashed (e.g. killed by the memory limit)
+                    result = JobResult(job.series_id, job.fingerprint, job.artifact, error=f"{type(exc).__name__}: {exc}")
+                summary.cpu_seconds += result.cpu_seconds
+                if result.error:
+                    summary.failed[result.series_id] = result.error
+                    logger.warning("Training %s failed: %s", result.series_id, result.error)
+                    continue
+                summary.trained.append(result.series_id)
+                manifest[result.series_id] = {
+                    "fingerprint": result.fingerprint,
+                    "artifact": Path(result.artifact).name,
+                    "rows": result.rows,
+                    "seconds": round(result.seconds, 3),
+                    "trained_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                }
+                # Persist progress as we go so an interrupted run keeps what finished.
+                _atomic_write_text(output_dir / MANIFEST_FILE, json.dumps(manifest, indent=2, sort_keys=True))
+    summary.wall_seconds = time.perf_counter() - start
+    return summary
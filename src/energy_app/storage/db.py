@@ -1,30 +1,139 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class DatabaseConfig:
+    pool_size: int = 8
+    acquire_timeout_s: float = 30.0
+    busy_timeout_ms: int = 5000
+    synchronous: str = "NORMAL"  # safe with WAL; FULL only adds durability against power loss
+    cache_size_kib: int = 20_000
+    mmap_size: int = 256 * 1024 * 1024
 
 
 class Database:
-    def __init__(self, url: str):
+    """SQLite database with a bounded pool of WAL-mode connections.
+
+    ``connection()`` lends a pooled connection; ``transaction()`` additionally wraps
+    the block in ``BEGIN IMMEDIATE``/``COMMIT``. Transactions nest per thread, so
+    several repository calls inside one ``transaction()`` share a single commit.
+    """
+
+    def __init__(self, url: str, config: DatabaseConfig | None = None):
         if url.startswith("sqlite:///"):
             path = url.replace("sqlite:///", "")
         else:
             path = url
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.cfg = config or DatabaseConfig()
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
         schema_path = Path(__file__).parent / "schema.sql"
-        with sqlite3.connect(self.path) as conn, open(schema_path, "r", encoding="utf-8") as f:
-            conn.executescript(f.read())
-            conn.commit()
+        conn = self.connect()
+        try:
+            # WAL is persistent in the file: readers no longer block writers (and vice versa).
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(schema_path.read_text(encoding="utf-8"))
+        finally:
+            conn.close()
 
     def connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.path)
+        """A new, unpooled connection with the configured pragmas; the caller closes it."""
+        conn = sqlite3.connect(self.path, timeout=self.cfg.busy_timeout_ms / 1000, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={int(self.cfg.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA synchronous={self.cfg.synchronous}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cfg.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.cfg.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection (the thread's open transaction, if any)."""
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            yield active
+            return
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:  # never hand a half-finished transaction to the next user
+                conn.rollback()
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in one write transaction; nested calls join the outer one."""
+        if getattr(self._local, "conn", None) is not None:
+            yield self._local.conn
+            return
+        with self.connection() as conn:
+            # IMMEDIATE takes the write lock up front, so a reader never has to upgrade
+            # mid-transaction (the classic source of "database is locked" errors).
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn, self._local.after_commit = conn, []
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+                callbacks = self._local.after_commit
+            finally:
+                self._local.conn = None
+                self._local.after_commit = []
+        for callback in callbacks:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once the thread's open transaction commits (now if none is open)."""
+        if getattr(self._local, "conn", None) is None:
+            callback()
+        else:
+            self._local.after_commit.append(callback)
+
+    def execute(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        with self.transaction() as conn:
+            return func(conn)
+
+    def close(self) -> None:
+        """Close the pooled connections; call once no connection is borrowed."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._pool_lock:
+            self._created = 0
 
-    def execute(self, func: Callable[[sqlite3.Connection], None]) -> None:
-        with self.connect() as conn:
-            func(conn)
-            conn.commit()
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._created < self.cfg.pool_size:
+                self._created += 1
+                return self.connect()
+        try:
+            return self._pool.get(timeout=self.cfg.acquire_timeout_s)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available after {self.cfg.acquire_timeout_s}s") from None
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from energy_app.storage.db import Database
+from energy_app.storage.profile_repo import Profile, ProfileRepository
+
+
+class CachedProfileRepository(ProfileRepository):
+    """``ProfileRepository`` with a read-through LRU + TTL cache of profiles.
+
+    Lookups (including misses, so unknown users are not re-queried) are cached for
+    ``ttl_s`` seconds, at most ``max_entries`` of them. Upserts through this object
+    invalidate the affected users once their transaction commits; writes that bypass
+    it are picked up once the TTL expires. Callers get their own copies of the cached
+    ``Profile`` objects, so mutating a result never leaks into the cache.
+    """
+
+    def __init__(self, db: Database, max_entries: int = 10_000, ttl_s: float = 300.0):
+        super().__init__(db)
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Profile]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; a lookup that raced with one does not store its result.
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_profile(self, user_id: str) -> Optional[Profile]:
+        found, profile = self._lookup(user_id)
+        if found:
+            return _copy(profile)
+        generation = self._generation
+        profile = super().get_profile(user_id)
+        self._store({user_id: profile}, generation)
+        return _copy(profile)
+
+    def get_profiles(self, user_ids: Sequence[str]) -> Dict[str, Profile]:
+        result: Dict[str, Profile] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            found, profile = self._lookup(user_id)
+            if not found:
+                missing.append(user_id)
+            elif profile is not None:
+                result[user_id] = replace(profile)
+        if missing:
+            generation = self._generation
+            loaded = super().get_profiles(missing)
+            self._store({user_id: loaded.get(user_id) for user_id in missing}, generation)
+            result.update({user_id: replace(profile) for user_id, profile in loaded.items()})
+        return result
+
+    def upsert_profile(self, profile: Profile) -> None:
+        super().upsert_profile(profile)
+        # Inside a caller's transaction, invalidating before the commit would let another
+        # thread re-cache the old row; defer until the write is visible.
+        self.db.after_commit(lambda: self.invalidate([profile.user_id]))
+
+    def upsert_profiles_many(self, profiles: Iterable[Profile], batch_size: int = 10_000) -> int:
+        written = []
+
+        def _tap() -> Iterator[Profile]:
+            for profile in profiles:
+                written.append(profile.user_id)
+                yield profile
+
+        try:
+            return super().upsert_profiles_many(_tap(), batch_size)
+        finally:
+            self.db.after_commit(lambda: self.invalidate(written if len(written) <= self.max_entries else None))
+
+    def invalidate(self, user_ids: Iterable[str] | None = None) -> None:
+        """Drop cached entries for ``user_ids`` (all entries if ``None``)."""
+        with self._lock:
+            self._generation += 1
+            if user_ids is None:
+                self._entries.clear()
+                return
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def _lookup(self, user_id: str) -> Tuple[bool, Optional[Profile]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self._hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self._misses += 1
+            return False, None
+
+    def _store(self, profiles: Dict[str, Optional[Profile]], generation: int) -> None:
+        expires = time.monotonic() + self.ttl_s
+        with self._lock:
+            if generation != self._generation:
+                return
+            for user_id, profile in profiles.items():
+                self._entries[user_id] = (expires, profile)
+                self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+
+def _copy(profile: Optional[Profile]) -> Optional[Profile]:
+    return replace(profile) if profile is not None else None
@@ -1,12 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import logging
+import math
+import time
+from dataclasses import astuple, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
 import sqlite3
 
 from energy_app.storage.db import Database
 
+logger = logging.getLogger(__name__)
+
+
+PROFILE_COLUMNS = ["user_id", "location_text", "lat", "lon", "area_m2", "occupants", "heating_type"]
+UPSERT_PROFILE_SQL = """
+INSERT INTO profiles (user_id, location_text, lat, lon, area_m2, occupants, heating_type)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    location_text=excluded.location_text,
+    lat=excluded.lat,
+    lon=excluded.lon,
+    area_m2=excluded.area_m2,
+    occupants=excluded.occupants,
+    heating_type=excluded.heating_type,
+    updated_at=CURRENT_TIMESTAMP
+"""
+SELECT_PROFILES_SQL = f"SELECT {', '.join(PROFILE_COLUMNS)} FROM profiles"
+# Stay below SQLITE_MAX_VARIABLE_NUMBER on older builds (999).
+MAX_QUERY_PARAMS = 900
+
 
 @dataclass
 class Profile:
@@ -34,39 +59,127 @@ class ProfileRepository:
 
     def upsert_profile(self, profile: Profile) -> None:
         def _op(conn: sqlite3.Connection) -> None:
-            conn.execute(
-                """
-                INSERT INTO profiles (user_id, location_text, lat, lon, area_m2, occupants, heating_type)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    location_text=excluded.location_text,
-                    lat=excluded.lat,
-                    lon=excluded.lon,
-                    area_m2=excluded.area_m2,
-                    occupants=excluded.occupants,
-                    heating_type=excluded.heating_type,
-                    updated_at=CURRENT_TIMESTAMP
-                """,
-                (
-                    profile.user_id,
-                    profile.location_text,
-                    profile.lat,
-                    profile.lon,
-                    profile.area_m2,
-                    profile.occupants,
-                    profile.heating_type,
-                ),
-            )
+            conn.execute(UPSERT_PROFILE_SQL, astuple(profile))
 
         self.db.execute(_op)
 
+    def upsert_profiles_many(self, profiles: Iterable[Profile], batch_size: int = 10_000) -> int:
+        """Upsert profiles (and their users) with ``executemany`` in a single transaction.
+
+        ``profiles`` is consumed ``batch_size`` rows at a time, so generators of any
+        length are fine. Returns the number of rows written.
+        """
+        total = 0
+        iterator = iter(profiles)
+        with self.db.transaction() as conn:
+            while batch := list(islice(iterator, batch_size)):
+                conn.executemany("INSERT OR IGNORE INTO users (id) VALUES (?)", ((p.user_id,) for p in batch))
+                conn.executemany(UPSERT_PROFILE_SQL, (astuple(p) for p in batch))
+                total += len(batch)
+        return total
+
     def get_profile(self, user_id: str) -> Optional[Profile]:
-        with self.db.connect() as conn:
-            cur = conn.execute(
-                "SELECT user_id, location_text, lat, lon, area_m2, occupants, heating_type FROM profiles WHERE user_id = ?",
-                (user_id,),
-            )
+        with self.db.connection() as conn:
+            cur = conn.execute(f"{SELECT_PROFILES_SQL} WHERE user_id = ?", (user_id,))
             row = cur.fetchone()
             if not row:
                 return None
             return Profile(*row)
+
+    def get_profiles(self, user_ids: Sequence[str]) -> Dict[str, Profile]:
+        """Profiles for ``user_ids`` keyed by user id; unknown ids are left out."""
+        ids = list(dict.fromkeys(user_ids))
+        found: Dict[str, Profile] = {}
+        with self.db.connection() as conn:
+            for start in range(0, len(ids), MAX_QUERY_PARAMS):
+                chunk = ids[start : start + MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(f"{SELECT_PROFILES_SQL} WHERE user_id IN ({placeholders})", chunk):
+                    found[row[0]] = Profile(*row)
+        return found
+
+    def iter_profiles(self, batch_size: int = 10_000) -> Iterator[List[Profile]]:
+        """Stream every profile in ``batch_size`` lists, ordered by user id."""
+        with self.db.connection() as conn:
+            cur = conn.execute(f"{SELECT_PROFILES_SQL} ORDER BY user_id")
+            while rows := cur.fetchmany(batch_size):
+                yield [Profile(*row) for row in rows]
+
+
+def _clean(value):
+    # pandas hands missing cells over as NaN; store them as NULL
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def read_profile_file(path: str | Path, batch_size: int = 10_000) -> Iterator[List[Profile]]:
+    """Stream ``Profile`` batches from a CSV or Parquet file with ``PROFILE_COLUMNS``."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        frames = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size))
+    else:
+        frames = pd.read_csv(path, chunksize=batch_size, dtype={"user_id": str, "heating_type": str})
+    for frame in frames:
+        missing = set(PROFILE_COLUMNS) - set(frame.columns) - {"heating_type"}
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        if "heating_type" not in frame.columns:
+            frame["heating_type"] = None
+        frame = frame[PROFILE_COLUMNS].astype(object)
+        yield [
+            Profile(str(uid), *(_clean(v) for v in rest))
+            for uid, *rest in frame.itertuples(index=False, name=None)
+        ]
+
+
+def import_profiles(repo: ProfileRepository, path: str | Path, batch_size: int = 10_000) -> int:
+    """Import a profile file chunk by chunk (one transaction per chunk), logging rows/sec."""
+    total = 0
+    start = time.perf_counter()
+    for batch in read_profile_file(path, batch_size):
+        total += repo.upsert_profiles_many(batch, batch_size)
+        elapsed = time.perf_counter() - start
+        logger.info("Imported %d profiles (%.0f rows/sec)", total, total / max(elapsed, 1e-9))
+    return total
+
+
+def export_profiles(repo: ProfileRepository, path: str | Path, batch_size: int = 10_000) -> int:
+    """Stream all profiles to a CSV or Parquet file without materializing the table."""
+    import pandas as pd
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    total = 0
+    writer = None
+    try:
+        for batch in repo.iter_profiles(batch_size):
+            frame = pd.DataFrame([astuple(p) for p in batch], columns=PROFILE_COLUMNS)
+            if path.suffix == ".parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                # Explicit schema: a batch of all-NULL heating types must not change the column type.
+                schema = pa.schema(
+                    [
+                        ("user_id", pa.string()),
+                        ("location_text", pa.string()),
+                        ("lat", pa.float64()),
+                        ("lon", pa.float64()),
+                        ("area_m2", pa.float64()),
+                        ("occupants", pa.int64()),
+                        ("heating_type", pa.string()),
+                    ]
+                )
+                writer = writer or pq.ParquetWriter(path, schema)
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+            else:
+                frame.to_csv(path, mode="a" if total else "w", header=not total, index=False)
+            total += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    logger.info("Exported %d profiles to %s", total, path)
+    return total
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from energy_app.data.loader import REQUIRED_COLUMNS, to_utc
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_METER = "default"
+VERSION_FILE = "_version"
+PARTITIONING = ds.partitioning(pa.schema([("meter", pa.string()), ("month", pa.string())]), flavor="hive")
+
+
+class ConsumptionStore:
+    """Consumption series stored as Parquet, hive-partitioned by meter and month.
+
+    Layout: ``<root>/meter=<id>/month=YYYY-MM/part-*.parquet`` with UTC timestamps.
+    Reads push time-range filters down to the month partitions and row groups, and
+    only the requested columns are decoded.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def version_path(self) -> Path:
+        """File touched after every write; cheap to ``stat`` for change detection."""
+        return self.root / VERSION_FILE
+
+    def write(self, df: pd.DataFrame, meter_id: str = DEFAULT_METER, overwrite: bool = False) -> int:
+        """Write rows for one meter. ``overwrite`` replaces the touched month partitions."""
+        missing = REQUIRED_COLUMNS - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        if df.empty:
+            return 0
+        frame = df.copy()
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True)
+        frame["meter"] = str(meter_id)
+        frame["month"] = frame["timestamp"].dt.strftime("%Y-%m")
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        ds.write_dataset(
+            table,
+            self.root,
+            format="parquet",
+            partitioning=PARTITIONING,
+            basename_template=f"part-{time.time_ns()}-{{i}}.parquet",
+            existing_data_behavior="delete_matching" if overwrite else "overwrite_or_ignore",
+        )
+        self.version_path.write_text(str(time.time_ns()), encoding="utf-8")
+        logger.info("Wrote %d rows for meter %s to %s", len(frame), meter_id, self.root)
+        return len(frame)
+
+    def read(
+        self,
+        meter_id: str | Sequence[str] | None = None,
+        start: pd.Timestamp | str | None = None,
+        end: pd.Timestamp | str | None = None,
+        columns: Iterable[str] | None = None,
+    ) -> pd.DataFrame:
+        """Rows with ``start <= timestamp < end`` for the given meter(s), sorted by time."""
+        dataset = self._dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=list(columns or ["timestamp", "consumption"]))
+        expr = None
+        if meter_id is not None:
+            meters = [meter_id] if isinstance(meter_id, str) else list(meter_id)
+            expr = _and(expr, ds.field("meter").isin(meters))
+        if start is not None:
+            start_ts = to_utc(start)
+            expr = _and(expr, ds.field("month") >= start_ts.strftime("%Y-%m"))
+            expr = _and(expr, ds.field("timestamp") >= pa.scalar(start_ts, type=pa.timestamp("ns", "UTC")))
+        if end is not None:
+            end_ts = to_utc(end)
+            expr = _and(expr, ds.field("month") <= end_ts.strftime("%Y-%m"))
+            expr = _and(expr, ds.field("timestamp") < pa.scalar(end_ts, type=pa.timestamp("ns", "UTC")))
+        wanted: List[str] = list(columns) if columns else [c for c in dataset.schema.names if c != "month"]
+        read_cols = list(dict.fromkeys(["timestamp", *wanted]))
+        if meter_id is None or not isinstance(meter_id, str):
+            read_cols = list(dict.fromkeys([*read_cols, "meter"]))
+        table = dataset.to_table(columns=read_cols, filter=expr)
+        df = table.to_pandas()
+        sort_cols = ["meter", "timestamp"] if "meter" in df.columns else ["timestamp"]
+        df = df.drop_duplicates(subset=sort_cols, keep="last").sort_values(sort_cols).reset_index(drop=True)
+        return df[wanted] if columns else df
+
+    def delete_meter(self, meter_id: str) -> None:
+        shutil.rmtree(self.root / f"meter={meter_id}", ignore_errors=True)
+        self.version_path.write_text(str(time.time_ns()), encoding="utf-8")
+
+    def meters(self) -> List[str]:
+        return sorted(p.name.split("=", 1)[1] for p in self.root.glob("meter=*") if p.is_dir())
+
+    def import_csv(
+        self,
+        path: str | Path,
+        meter_id: str = DEFAULT_METER,
+        chunksize: int = 500_000,
+        overwrite: bool = True,
+    ) -> int:
+        """Convert a ``timestamp,consumption`` CSV into the store, one chunk at a time."""
+        if overwrite:
+            self.delete_meter(meter_id)
+        total = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            total += self.write(chunk, meter_id=meter_id)
+        logger.info("Imported %d rows from %s into meter %s", total, path, meter_id)
+        return total
+
+    def _dataset(self) -> ds.Dataset | None:
+        if not any(self.root.glob("meter=*")):
+            return None
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING)
+
+
+def _and(left, right):
+    return right if left is None else left & right
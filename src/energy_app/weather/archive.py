@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from energy_app.weather.columnar import WeatherFrame
+
+logger = logging.getLogger(__name__)
+
+
+DateRange = Tuple[date, date]  # inclusive on both ends, like Open-Meteo start_date/end_date
+HOUR_S = 3600
+
+
+def _epoch(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+def _days(start: date, end: date) -> Iterable[date]:
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def contiguous_ranges(days: Sequence[date], max_days: int | None = None) -> List[DateRange]:
+    """Group sorted days into inclusive ranges of consecutive days, at most ``max_days`` long."""
+    ranges: List[DateRange] = []
+    for day in days:
+        if ranges:
+            first, last = ranges[-1]
+            if day == last + timedelta(days=1) and (max_days is None or (day - first).days < max_days):
+                ranges[-1] = (first, day)
+                continue
+        ranges.append((day, day))
+    return ranges
+
+
+class WeatherArchive:
+    """Historical hourly weather stored per location as rows indexed by timestamp.
+
+    Rows live in ``weather_hourly`` (one per location, variable and UTC hour) and the
+    days already fetched are tracked per variable in ``weather_coverage``, so a request
+    only has to fetch the days it is missing and any overlapping or shifted range is
+    assembled from what is already stored.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS weather_hourly (
+                lat REAL NOT NULL,
+                lon REAL NOT NULL,
+                variable TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                value REAL,
+                PRIMARY KEY (lat, lon, variable, ts)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS weather_coverage (
+                lat REAL NOT NULL,
+                lon REAL NOT NULL,
+                variable TEXT NOT NULL,
+                day TEXT NOT NULL,
+                PRIMARY KEY (lat, lon, variable, day)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def missing(self, lat: float, lon: float, start: date, end: date, variables: Sequence[str]) -> List[date]:
+        """Days in ``[start, end]`` not yet stored for every one of ``variables``."""
+        placeholders = ",".join("?" * len(variables))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT day FROM weather_coverage
+                WHERE lat = ? AND lon = ? AND day BETWEEN ? AND ? AND variable IN ({placeholders})
+                GROUP BY day HAVING COUNT(*) = ?
+                """,
+                (lat, lon, start.isoformat(), end.isoformat(), *variables, len(set(variables))),
+            ).fetchall()
+        covered = {date.fromisoformat(day) for (day,) in rows}
+        return [day for day in _days(start, end) if day not in covered]
+
+    def store(self, lat: float, lon: float, payload: Dict, days: Sequence[date], variables: Sequence[str]) -> int:
+        """Insert the non-null hourly values of an Open-Meteo payload (UTC times).
+
+        Only days of ``days`` with a value for every hour of every variable are marked
+        covered. The archive publishes with a lag of a few days and returns nulls until
+        then, so recent (or otherwise incomplete) days stay missing and are fetched
+        again on the next request instead of being cached empty for good.
+        """
+        hourly = payload.get("hourly", {})
+        stamps = [
+            int(datetime.fromisoformat(t).replace(tzinfo=timezone.utc).timestamp()) for t in hourly.get("time", [])
+        ]
+        rows = [
+            (lat, lon, name, ts, value)
+            for name in variables
+            for ts, value in zip(stamps, hourly.get(name, []))
+            if value is not None
+        ]
+        hours_per_day: Dict[Tuple[str, date], int] = {}
+        for _, _, name, ts, _ in rows:
+            day = datetime.fromtimestamp(ts, tz=timezone.utc).date()
+            hours_per_day[(name, day)] = hours_per_day.get((name, day), 0) + 1
+        complete = [day for day in days if all(hours_per_day.get((name, day), 0) >= 24 for name in variables)]
+        coverage = [(lat, lon, name, day.isoformat()) for name in variables for day in complete]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO weather_hourly VALUES (?, ?, ?, ?, ?)", rows)
+                self._conn.executemany("INSERT OR IGNORE INTO weather_coverage VALUES (?, ?, ?, ?)", coverage)
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+        return len(rows)
+
+    def read(self, lat: float, lon: float, start: date, end: date, variables: Sequence[str]) -> Dict:
+        """Open-Meteo-shaped payload for ``[start, end]`` (hourly, UTC) from stored rows."""
+        first, stop = _epoch(start), _epoch(end + timedelta(days=1))
+        index = range(first, stop, HOUR_S)
+        placeholders = ",".join("?" * len(variables))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT variable, ts, value FROM weather_hourly
+                WHERE lat = ? AND lon = ? AND variable IN ({placeholders}) AND ts >= ? AND ts < ?
+                """,
+                (lat, lon, *variables, first, stop),
+            ).fetchall()
+        columns: Dict[str, List[float | None]] = {name: [None] * len(index) for name in variables}
+        for name, ts, value in rows:
+            columns[name][(ts - first) // HOUR_S] = value
+        times = [datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M") for ts in index]
+        return {"latitude": lat, "longitude": lon, "timezone": "GMT", "hourly": {"time": times, **columns}}
+
+    def read_frame(self, lat: float, lon: float, start: date, end: date, variables: Sequence[str]) -> WeatherFrame:
+        """Like ``read`` but as columnar arrays (UTC epoch hours, float32 per variable)."""
+        first, stop = _epoch(start), _epoch(end + timedelta(days=1))
+        columns: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for name in variables:
+                rows = self._conn.execute(
+                    """
+                    SELECT ts, value FROM weather_hourly
+                    WHERE lat = ? AND lon = ? AND variable = ? AND ts >= ? AND ts < ?
+                    """,
+                    (lat, lon, name, first, stop),
+                ).fetchall()
+                column = np.full((stop - first) // HOUR_S, np.nan, dtype=np.float32)
+                if rows:
+                    ts, values = np.array(rows, dtype=np.float64).T
+                    column[((ts - first) // HOUR_S).astype(np.int64)] = values
+                columns[name] = column
+        hours = np.arange(first // HOUR_S, stop // HOUR_S, dtype=np.int64)
+        return WeatherFrame(hours, columns, {"latitude": lat, "longitude": lon, "timezone": "GMT"})
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM weather_hourly").fetchone()[0]
+            locations = self._conn.execute("SELECT COUNT(*) FROM (SELECT DISTINCT lat, lon FROM weather_coverage)").fetchone()[0]
+        return {"rows": rows, "locations": locations}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
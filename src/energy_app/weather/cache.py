@@ -1,52 +1,261 @@
 from __future__ import annotations
 
 import json
+import logging
 import sqlite3
-from pathlib import Path
-from typing import Optional
+import threading
 import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple, TypeVar, Union
+
+from energy_app.weather.columnar import WeatherFrame
+
+logger = logging.getLogger(__name__)
+
+
+DAY_S = 24 * 3600
+MAX_QUERY_PARAMS = 900
+
+T = TypeVar("T")
+CacheValue = Union[dict, WeatherFrame]
+
+
+def _default_ttls() -> Dict[str, Optional[float]]:
+    # Forecasts are re-issued hourly; archive data never changes once published.
+    # Unknown place names are remembered for a day so typos do not hit the API repeatedly.
+    return {"forecast": 3600.0, "historical": None, "geocode": 30 * DAY_S, "geocode_miss": DAY_S}
+
+
+@dataclass
+class WeatherCacheConfig:
+    ttl_s: Dict[str, Optional[float]] = field(default_factory=_default_ttls)
+    default_ttl_s: Optional[float] = DAY_S
+    max_bytes: int = 256 * 1024 * 1024
+    compression_level: int = 6
+    memory_entries: int = 512  # in-process LRU tier in front of SQLite; 0 disables it
 
 
 class WeatherCache:
-    def __init__(self, path: str | Path):
+    """SQLite key/value cache for weather payloads with TTLs and a size bound.
+
+    One connection is kept open for the cache's lifetime (WAL mode, serialized by a
+    lock). ``WeatherFrame`` values are stored in their columnar binary layout and come
+    back as array views without any parsing; other values (e.g. geocoding results)
+    are zlib-compressed JSON. Each entry expires after the TTL of
+    its granularity (``None`` = never); expired entries are never served and are
+    purged lazily. When the stored bytes exceed ``max_bytes`` the oldest entries
+    (by ``created_at``) are evicted.
+
+    A small in-process LRU tier (``memory_entries``) answers repeated lookups without
+    touching SQLite; it honours the same expiry. Cached payloads are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self, path: str | Path, config: WeatherCacheConfig | None = None):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.cfg = config or WeatherCacheConfig()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._memory: "OrderedDict[str, Tuple[Optional[float], CacheValue]]" = OrderedDict()
+        self._hits = 0
+        self._memory_hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
         self._init_db()
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
 
     def _init_db(self) -> None:
-        conn = sqlite3.connect(self.path)
-        try:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS cache (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL,
-                    created_at REAL NOT NULL
-                )
-                """
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if columns and "expires_at" not in columns:
+            # Pre-TTL layout (uncompressed text, no expiry); cached data is disposable.
+            logger.info("Upgrading weather cache %s to the TTL layout; dropping old entries", self.path)
+            self._conn.execute("DROP TABLE cache")
+        elif columns and "format" not in columns:
+            # Everything written before the columnar layout is JSON.
+            self._conn.execute("ALTER TABLE cache ADD COLUMN format TEXT NOT NULL DEFAULT 'json'")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                format TEXT NOT NULL DEFAULT 'json',
+                granularity TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_created_at ON cache (created_at);
+            CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache (expires_at);
+            """
+        )
 
-    def get(self, key: str) -> Optional[dict]:
-        conn = sqlite3.connect(self.path)
-        try:
-            cur = conn.execute("SELECT value FROM cache WHERE key = ?", (key,))
-            row = cur.fetchone()
-            if not row:
+    def get(self, key: str) -> Optional[CacheValue]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] is None or entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self._hits += 1
+                    self._memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+            row = self._conn.execute("SELECT value, format, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
                 return None
-            return json.loads(row[0])
-        finally:
-            conn.close()
+            blob, fmt, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._expired += 1
+                self._misses += 1
+                self._delete(key)
+                return None
+            self._hits += 1
+        value = WeatherFrame.from_bytes(blob) if fmt == "columnar" else json.loads(zlib.decompress(blob))
+        with self._lock:
+            self._remember(key, expires_at, value)
+        return value
 
-    def set(self, key: str, value: dict) -> None:
-        conn = sqlite3.connect(self.path)
-        try:
-            conn.execute(
-                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
-                (key, json.dumps(value), time.time()),
+    def set(self, key: str, value: CacheValue, granularity: str = "default", ttl_s: float | None = None) -> None:
+        """Store ``value``; the TTL comes from ``granularity`` unless ``ttl_s`` is given."""
+        if isinstance(value, WeatherFrame):
+            fmt, blob = "columnar", value.to_bytes(self.cfg.compression_level)
+        else:
+            fmt = "json"
+            blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), self.cfg.compression_level)
+        if ttl_s is None:
+            ttl_s = self.cfg.ttl_s.get(granularity, self.cfg.default_ttl_s)
+        now = time.time()
+        expires_at = now + ttl_s if ttl_s is not None else None
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, format, granularity, size, created_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, blob, fmt, granularity, len(blob), now, expires_at),
             )
-            conn.commit()
+            self._bytes += len(blob) - (old[0] if old else 0)
+            self._remember(key, expires_at, value)
+            if self._bytes > self.cfg.max_bytes:
+                self._evict(now)
+
+    def expiry(self, keys: Sequence[str]) -> Dict[str, Tuple[float, Optional[float]]]:
+        """``(created_at, expires_at)`` of the live entries among ``keys``; missing or expired keys are left out."""
+        now = time.time()
+        found: Dict[str, Tuple[float, Optional[float]]] = {}
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(keys), MAX_QUERY_PARAMS):
+                chunk = keys[start : start + MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                for key, created_at, expires_at in self._conn.execute(
+                    f"SELECT key, created_at, expires_at FROM cache WHERE key IN ({placeholders})", chunk
+                ):
+                    if expires_at is None or expires_at > now:
+                        found[key] = (created_at, expires_at)
+        return found
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry; returns how many were removed."""
+        with self._lock:
+            return self._purge_expired(time.time())
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "entries": entries,
+                "bytes": self._bytes,
+                "max_bytes": self.cfg.max_bytes,
+                "memory_entries": len(self._memory),
+                "hits": self._hits,
+                "memory_hits": self._memory_hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _remember(self, key: str, expires_at: Optional[float], value: CacheValue) -> None:
+        if self.cfg.memory_entries <= 0:
+            return
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.cfg.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        self._memory.pop(key, None)
+        row = self._conn.execute("DELETE FROM cache WHERE key = ? RETURNING size", (key,)).fetchone()
+        if row:
+            self._bytes -= row[0]
+
+    def _purge_expired(self, now: float) -> int:
+        for key in [k for k, (expires_at, _) in self._memory.items() if expires_at is not None and expires_at <= now]:
+            del self._memory[key]
+        rows = self._conn.execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ? RETURNING size", (now,)
+        ).fetchall()
+        self._bytes -= sum(size for (size,) in rows)
+        return len(rows)
+
+    def _evict(self, now: float) -> None:
+        # Expired entries go first, then the oldest until we are back under 90% of the budget.
+        self._purge_expired(now)
+        target = int(self.cfg.max_bytes * 0.9)
+        while self._bytes > target:
+            rows = self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY created_at LIMIT 64) RETURNING key, size"
+            ).fetchall()
+            if not rows:
+                break
+            for key, _ in rows:
+                self._memory.pop(key, None)
+            self._bytes -= sum(size for _, size in rows)
+            self._evictions += len(rows)
+        logger.info("Weather cache over budget; evicted down to %d bytes", self._bytes)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls per key: one caller runs ``fn``, the others wait for it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
         finally:
-            conn.close()
+            with self._lock:
+                del self._calls[key]
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
 from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from energy_app.weather.cache import WeatherCache
+from energy_app.weather.archive import DateRange, WeatherArchive, contiguous_ranges
+from energy_app.weather.cache import SingleFlight, WeatherCache, WeatherCacheConfig
+from energy_app.weather.columnar import WeatherFrame
+from energy_app.weather.gazetteer import Gazetteer, normalize_place
+from energy_app.weather.ratelimit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 WEATHER_VARS = [
     "temperature_2m",
@@ -27,12 +36,106 @@ class OpenMeteoConfig:
     base_url: str
     geocoding_url: str
     cache_path: str
+    cache: WeatherCacheConfig | None = None
+    # Coordinates are snapped to this grid (degrees) so nearby households share cache
+    # entries; 0.05 deg (~5 km) is finer than the weather models' own resolution.
+    grid_deg: float = 0.05
+    # Longest date span requested from the archive API in one call.
+    archive_chunk_days: int = 366
+    # Upstream quota (the free tier allows 600 calls/min) and bulk-fetch parallelism.
+    rate_per_s: float = 10.0
+    burst: int = 10
+    max_concurrency: int = 8
+    # Locations per multi-location request (comma-separated coordinates). Each location
+    # is billed as one call, so a batch spends batch_size tokens and must fit in burst.
+    batch_size: int = 10
+    # Optional GeoNames dump (e.g. cities15000.txt) answering geocode lookups offline.
+    gazetteer_path: str | None = None
+    gazetteer_min_population: int = 0
+
+
+def snap(value: float, grid: float) -> float:
+    return round(round(value / grid) * grid, 4) if grid else round(value, 4)
+
+
+def _batches(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    return [items[i : i + size] for i in range(0, len(items), max(1, size))]
+
+
+def _split_payloads(payload: Dict | List[Dict], expected: int) -> List[Dict]:
+    """Per-location payloads of a multi-location response, in request order."""
+    payloads = payload if isinstance(payload, list) else [payload]
+    if len(payloads) != expected:
+        raise ValueError(f"Expected {expected} weather payloads, got {len(payloads)}")
+    return payloads
 
 
 class OpenMeteoClient:
     def __init__(self, config: OpenMeteoConfig):
+        if config.burst < config.batch_size:
+            # A batch spends one token per location and must fit in the bucket.
+            raise ValueError(f"burst ({config.burst}) must be at least batch_size ({config.batch_size})")
         self.cfg = config
-        self.cache = WeatherCache(config.cache_path)
+        self.cache = WeatherCache(config.cache_path, config.cache)
+        self.archive = WeatherArchive(config.cache_path)
+        self._inflight = SingleFlight()
+        self._bucket = TokenBucket(config.rate_per_s, config.burst)
+        self.gazetteer = (
+            Gazetteer.from_geonames(config.gazetteer_path, config.gazetteer_min_population)
+            if config.gazetteer_path
+            else None
+        )
+        # One keep-alive session for every call: no TCP/TLS handshake per request.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.max_concurrency)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
+    def _get_json(self, url: str, params: Dict, timeout: float = 15, cost: int = 1) -> Dict:
+        # Every attempt, retries included, spends ``cost`` tokens so we stay within the
+        # quota; Open-Meteo bills a multi-location request once per location.
+        self._bucket.acquire(cost)
+        resp = self._session.get(url, params=params, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    @property
+    def upstream_calls(self) -> int:
+        """Billed upstream calls so far: one per location of every attempt, as the bucket counts them."""
+        return self._bucket.acquired
+
+    def close(self) -> None:
+        self._session.close()
+        self.cache.close()
+        self.archive.close()
+
+    def _cached_get(self, key: str, granularity: str, url: str, params: Dict) -> WeatherFrame:
+        """Serve ``key`` from the cache or fetch it once, however many callers miss at the same time.
+
+        Payloads are converted to a ``WeatherFrame`` once, at fetch time, and cached in
+        that columnar form.
+        """
+        cached = self._cached_frame(key)
+        if cached is not None:
+            logger.info("Weather cache hit for %s", key)
+            return cached
+
+        def _fetch() -> WeatherFrame:
+            # Re-check: a previous leader may have filled the cache while we queued.
+            cached = self._cached_frame(key)
+            if cached is not None:
+                return cached
+            frame = WeatherFrame.from_payload(self._get_json(url, params))
+            self.cache.set(key, frame, granularity=granularity)
+            return frame
+
+        return self._inflight.do(key, _fetch)
+
+    def _cached_frame(self, key: str) -> WeatherFrame | None:
+        cached = self.cache.get(key)
+        # Entries written before the columnar layout are JSON payloads.
+        return WeatherFrame.from_payload(cached) if isinstance(cached, dict) else cached
 
     def _cache_key(self, lat: float, lon: float, start: str, end: str, variables: List[str], granularity: str) -> str:
         key = {
@@ -45,46 +148,105 @@ class OpenMeteoClient:
         }
         return urlencode(key, doseq=True)
 
-    @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
+    def forecast_key(self, lat: float, lon: float, days: int = 3, hourly: List[str] | None = None) -> str:
+        """Cache key of the forecast for an already snapped grid cell."""
+        return self._cache_key(lat, lon, f"next-{days}", f"next-{days}", hourly or WEATHER_VARS, "forecast")
+
     def geocode(self, location: str) -> Optional[Dict]:
-        params = {"name": location}
-        url = f"{self.cfg.geocoding_url}/search"
-        resp = requests.get(url, params=params, timeout=10)
+        """First match for a place name, or ``None`` if it is unknown.
+
+        Queries are normalized (case, accents, punctuation) and answered from the local
+        gazetteer (exact or prefix match) when one is configured, then from the cache;
+        only new names reach the geocoding API. Only if the API knows nothing either is
+        the gazetteer's fuzzy match tried. Unknown names and fuzzy guesses are cached
+        with the short ``geocode_miss`` TTL so they are re-checked upstream.
+        """
+        query = normalize_place(location)
+        if not query:
+            return None
+        if self.gazetteer is not None:
+            place = self.gazetteer.lookup(query)
+            if place is not None:
+                return place.as_result()
+        key = f"geocode:{query}"
+
+        def _fetch() -> Dict:
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+            results = self._geocode_remote(location.strip())
+            if results:
+                entry = {"result": results[0]}
+                self.cache.set(key, entry, granularity="geocode")
+                return entry
+            guess = self.gazetteer.fuzzy(query) if self.gazetteer is not None else None
+            entry = {"result": guess.as_result() if guess else None}
+            self.cache.set(key, entry, granularity="geocode_miss")
+            return entry
+
+        entry = self.cache.get(key) or self._inflight.do(key, _fetch)
+        return entry["result"]
+
+    # Interactive path: fail fast instead of the 5-attempt backoff used for bulk weather.
+    @retry(wait=wait_exponential(min=0.5, max=2), stop=stop_after_attempt(2))
+    def _geocode_remote(self, name: str) -> List[Dict]:
+        self._bucket.acquire()
+        resp = self._session.get(f"{self.cfg.geocoding_url}/search", params={"name": name}, timeout=5)
         resp.raise_for_status()
-        results = resp.json().get("results", [])
-        return results[0] if results else None
+        return resp.json().get("results", [])
 
-    @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
     def historical(self, lat: float, lon: float, start: str, end: str, hourly: List[str] | None = None) -> Dict:
-        variables = hourly or WEATHER_VARS
-        key = self._cache_key(lat, lon, start, end, variables, "historical")
-        cached = self.cache.get(key)
-        if cached:
-            logger.info("Weather cache hit for %s", key)
-            return cached
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "start_date": start,
-            "end_date": end,
-            "hourly": ",".join(variables),
-            "timezone": "auto",
-        }
-        url = f"{self.cfg.base_url}/archive"
-        resp = requests.get(url, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        self.cache.set(key, data)
-        return data
+        """Hourly archive weather for ``start``..``end`` (inclusive dates), with UTC times.
+
+        Served from the local archive; only days not stored yet are fetched, in
+        contiguous chunks of at most ``archive_chunk_days``.
+        """
+        variables, lat, lon, first, last = self._ensure_archive(lat, lon, start, end, hourly)
+        return self.archive.read(lat, lon, first, last, variables)
+
+    def historical_frame(self, lat: float, lon: float, start: str, end: str, hourly: List[str] | None = None) -> WeatherFrame:
+        """``historical`` as columnar arrays, read straight from the archive rows."""
+        variables, lat, lon, first, last = self._ensure_archive(lat, lon, start, end, hourly)
+        return self.archive.read_frame(lat, lon, first, last, variables)
+
+    def _ensure_archive(
+        self, lat: float, lon: float, start: str, end: str, hourly: List[str] | None
+    ) -> Tuple[List[str], float, float, date, date]:
+        variables = sorted(set(hourly or WEATHER_VARS))
+        lat, lon = snap(lat, self.cfg.grid_deg), snap(lon, self.cfg.grid_deg)
+        first, last = date.fromisoformat(start), date.fromisoformat(end)
+        # Concurrent callers for the same range share one fill. A single pass is enough:
+        # days the archive has not published yet stay missing until a later call.
+        if self.archive.missing(lat, lon, first, last, variables):
+            key = f"archive:{lat},{lon}:{first}:{last}:{','.join(variables)}"
+            self._inflight.do(key, lambda: self._fill_archive(lat, lon, first, last, variables))
+        return variables, lat, lon, first, last
+
+    def _fill_archive(self, lat: float, lon: float, first: date, last: date, variables: List[str]) -> None:
+        missing = self.archive.missing(lat, lon, first, last, variables)
+        for chunk_start, chunk_end in contiguous_ranges(missing, self.cfg.archive_chunk_days):
+            logger.info("Fetching archive weather for %s,%s %s..%s", lat, lon, chunk_start, chunk_end)
+            params = {
+                "latitude": lat,
+                "longitude": lon,
+                "start_date": chunk_start.isoformat(),
+                "end_date": chunk_end.isoformat(),
+                "hourly": ",".join(variables),
+                "timezone": "GMT",
+            }
+            payload = self._get_json(f"{self.cfg.base_url}/archive", params)
+            days = [d for d in missing if chunk_start <= d <= chunk_end]
+            self.archive.store(lat, lon, payload, days, variables)
 
-    @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
     def forecast(self, lat: float, lon: float, days: int = 3, hourly: List[str] | None = None) -> Dict:
+        """Open-Meteo-shaped forecast payload; prefer ``forecast_frame`` for analysis."""
+        return self.forecast_frame(lat, lon, days, hourly).to_payload()
+
+    def forecast_frame(self, lat: float, lon: float, days: int = 3, hourly: List[str] | None = None) -> WeatherFrame:
+        """Forecast as columnar arrays, served from the cache without any decoding."""
         variables = hourly or WEATHER_VARS
-        key = self._cache_key(lat, lon, f"next-{days}", f"next-{days}", variables, "forecast")
-        cached = self.cache.get(key)
-        if cached:
-            logger.info("Weather cache hit for %s", key)
-            return cached
+        lat, lon = snap(lat, self.cfg.grid_deg), snap(lon, self.cfg.grid_deg)
+        key = self.forecast_key(lat, lon, days, variables)
         params = {
             "latitude": lat,
             "longitude": lon,
@@ -92,9 +254,112 @@ class OpenMeteoClient:
             "hourly": ",".join(variables),
             "timezone": "auto",
         }
-        url = f"{self.cfg.base_url}/forecast"
-        resp = requests.get(url, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        self.cache.set(key, data)
-        return data
+        return self._cached_get(key, "forecast", f"{self.cfg.base_url}/forecast", params)
+
+    def forecast_many(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        days: int = 3,
+        hourly: List[str] | None = None,
+        refresh: bool = False,
+    ) -> List[WeatherFrame | None]:
+        """Forecast frames for many ``(lat, lon)`` pairs, in input order.
+
+        Locations are snapped and deduplicated by grid cell, cache hits are served
+        locally, and the misses are fetched ``batch_size`` cells per multi-location
+        request (up to ``max_concurrency`` requests at once, paced by the token
+        bucket). Each cell's payload is cached under the same key ``forecast`` uses.
+        Locations whose batch still fails after retries yield ``None`` (and are logged).
+        ``refresh=True`` skips the cache lookup and re-fetches every cell.
+        """
+        variables = hourly or WEATHER_VARS
+        cells = [(snap(lat, self.cfg.grid_deg), snap(lon, self.cfg.grid_deg)) for lat, lon in locations]
+        keys = {cell: self.forecast_key(*cell, days, variables) for cell in cells}
+        found: Dict[Tuple[float, float], WeatherFrame] = {}
+        for cell, key in keys.items():
+            cached = None if refresh else self._cached_frame(key)
+            if cached is not None:
+                found[cell] = cached
+        params = {"forecast_days": days, "hourly": ",".join(variables), "timezone": "auto"}
+
+        def _fetch(batch: Sequence[Tuple[float, float]]) -> None:
+            payloads = self._get_multi(f"{self.cfg.base_url}/forecast", batch, params)
+            for cell, payload in zip(batch, payloads):
+                frame = WeatherFrame.from_payload(payload)
+                self.cache.set(keys[cell], frame, granularity="forecast")
+                found[cell] = frame
+
+        misses = [cell for cell in keys if cell not in found]
+        self._run_batches(misses, _fetch, "Forecast")
+        return [found.get(cell) for cell in cells]
+
+    def historical_many(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        start: str,
+        end: str,
+        hourly: List[str] | None = None,
+    ) -> List[WeatherFrame | None]:
+        """Archive weather frames for many ``(lat, lon)`` pairs over one date range, in input order.
+
+        Each grid cell's missing days are split into chunks as in ``historical``; cells
+        missing the same chunk (the usual case for a nightly refresh) are fetched
+        together, ``batch_size`` per request. Locations whose gaps could not be filled
+        yield ``None``.
+        """
+        variables = sorted(set(hourly or WEATHER_VARS))
+        first, last = date.fromisoformat(start), date.fromisoformat(end)
+        cells = [(snap(lat, self.cfg.grid_deg), snap(lon, self.cfg.grid_deg)) for lat, lon in locations]
+        by_chunk: Dict[DateRange, List[Tuple[float, float]]] = {}
+        for cell in dict.fromkeys(cells):
+            missing = self.archive.missing(*cell, first, last, variables)
+            for chunk in contiguous_ranges(missing, self.cfg.archive_chunk_days):
+                by_chunk.setdefault(chunk, []).append(cell)
+        failed: set = set()
+
+        for (chunk_start, chunk_end), chunk_cells in by_chunk.items():
+            params = {
+                "start_date": chunk_start.isoformat(),
+                "end_date": chunk_end.isoformat(),
+                "hourly": ",".join(variables),
+                "timezone": "GMT",
+            }
+            days = [chunk_start + timedelta(days=offset) for offset in range((chunk_end - chunk_start).days + 1)]
+
+            def _fetch(batch: Sequence[Tuple[float, float]], params: Dict = params, days: List[date] = days) -> None:
+                payloads = self._get_multi(f"{self.cfg.base_url}/archive", batch, params)
+                for cell, payload in zip(batch, payloads):
+                    self.archive.store(*cell, payload, days, variables)
+
+            failed.update(self._run_batches(chunk_cells, _fetch, "Archive"))
+        return [None if cell in failed else self.archive.read_frame(*cell, first, last, variables) for cell in cells]
+
+    def _get_multi(self, url: str, cells: Sequence[Tuple[float, float]], params: Dict) -> List[Dict]:
+        coords = {
+            "latitude": ",".join(str(lat) for lat, _ in cells),
+            "longitude": ",".join(str(lon) for _, lon in cells),
+        }
+        return _split_payloads(self._get_json(url, {**coords, **params}, cost=len(cells)), len(cells))
+
+    def _run_batches(
+        self,
+        cells: Sequence[Tuple[float, float]],
+        fetch: Callable[[Sequence[Tuple[float, float]]], None],
+        label: str,
+    ) -> List[Tuple[float, float]]:
+        """Run ``fetch`` over ``batch_size`` slices of ``cells`` concurrently; returns the cells that failed."""
+        batches = _batches(cells, self.cfg.batch_size)
+        if not batches:
+            return []
+
+        def _one(batch: Sequence[Tuple[float, float]]) -> Sequence[Tuple[float, float]]:
+            try:
+                fetch(batch)
+                return []
+            except Exception:
+                logger.warning("%s batch of %d locations failed", label, len(batch), exc_info=True)
+                return batch
+
+        workers = min(self.cfg.max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather") as pool:
+            return [cell for failed in pool.map(_one, batches) for cell in failed]
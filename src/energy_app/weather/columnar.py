@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Blob layout: MAGIC, u32 header length, JSON header (metadata and column names only),
+# then the raw little-endian arrays: int64 hours followed by one float32 array per variable.
+MAGIC = b"WXC1"
+_HEADER = struct.Struct("<4sI")
+
+
+@dataclass
+class WeatherFrame:
+    """Hourly weather as typed columns: an int64 epoch-hour index and float32 per variable.
+
+    ``hours`` counts hours since 1970-01-01T00:00 of the payload's own clock (UTC for
+    the archive, local wall time for ``timezone=auto`` forecasts), so ``to_frame``
+    yields the same naive timestamps the JSON times described. Missing values are NaN.
+    Arrays may be read-only views of a cached blob; copy before mutating.
+    """
+
+    hours: np.ndarray
+    columns: Dict[str, np.ndarray]
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "WeatherFrame":
+        """Convert an Open-Meteo JSON payload (done once, when it is fetched)."""
+        hourly = payload.get("hourly", {})
+        hours = np.array(hourly.get("time", []), dtype="datetime64[m]").astype("datetime64[h]").astype(np.int64)
+        columns = {
+            name: np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+            for name, values in hourly.items()
+            if name != "time"
+        }
+        meta = {k: v for k, v in payload.items() if k != "hourly"}
+        return cls(hours, columns, meta)
+
+    @property
+    def latitude(self) -> float | None:
+        return self.meta.get("latitude")
+
+    @property
+    def longitude(self) -> float | None:
+        return self.meta.get("longitude")
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WeatherFrame):
+            return NotImplemented
+        return (
+            self.meta == other.meta
+            and np.array_equal(self.hours, other.hours)
+            and self.columns.keys() == other.columns.keys()
+            and all(np.array_equal(v, other.columns[k], equal_nan=True) for k, v in self.columns.items())
+        )
+
+    def timestamps(self) -> np.ndarray:
+        return self.hours.astype("datetime64[h]").astype("datetime64[ns]")
+
+    def to_frame(self) -> pd.DataFrame:
+        """``timestamp`` plus one float32 column per variable, straight from the arrays."""
+        df = pd.DataFrame(self.columns)
+        df.insert(0, "timestamp", self.timestamps())
+        return df
+
+    def to_payload(self) -> Dict:
+        """Open-Meteo-shaped dict, for callers that still expect the JSON layout."""
+        times = np.datetime_as_string(self.hours.astype("datetime64[h]"), unit="m").tolist()
+        hourly: Dict[str, List] = {"time": times}
+        for name, values in self.columns.items():
+            rounded = _round_significant(values)
+            hourly[name] = [None if np.isnan(v) else v for v in rounded.tolist()]
+        return {**self.meta, "hourly": hourly}
+
+    def to_bytes(self, compression_level: int = 6) -> bytes:
+        header = json.dumps(
+            {"meta": self.meta, "n": len(self.hours), "columns": list(self.columns), "zlib": bool(compression_level)},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        parts = [np.ascontiguousarray(self.hours, dtype="<i8").tobytes()]
+        parts += [np.ascontiguousarray(v, dtype="<f4").tobytes() for v in self.columns.values()]
+        body = b"".join(parts)
+        if compression_level:
+            body = zlib.compress(body, compression_level)
+        return _HEADER.pack(MAGIC, len(header)) + header + body
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "WeatherFrame":
+        """Rebuild from ``to_bytes`` output; the arrays are views over the (decompressed) buffer."""
+        magic, header_len = _HEADER.unpack_from(blob)
+        if magic != MAGIC:
+            raise ValueError("Not a columnar weather blob")
+        start = _HEADER.size + header_len
+        header = json.loads(blob[_HEADER.size : start])
+        n = header["n"]
+        body = blob[start:]
+        if header.get("zlib"):
+            body = zlib.decompress(body)
+        hours = np.frombuffer(body, dtype="<i8", count=n)
+        columns = {
+            name: np.frombuffer(body, dtype="<f4", count=n, offset=8 * n + 4 * n * i)
+            for i, name in enumerate(header["columns"])
+        }
+        return cls(hours, columns, header["meta"])
+
+
+def _round_significant(values: np.ndarray, digits: int = 7) -> np.ndarray:
+    # float32 keeps ~7 significant digits; round so 10.12 comes back as 10.12, not 10.119999885.
+    wide = values.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(wide)))
+    factor = 10.0 ** np.where(np.isfinite(magnitude), digits - 1 - magnitude, 0)
+    return np.round(wide * factor) / factor
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+GAZETTEER = {
+    "budapest": (47.4984, 19.0404, "Europe/Budapest"),
+    "debrecen": (47.5316, 21.6273, "Europe/Budapest"),
+    "szeged": (46.253, 20.1414, "Europe/Budapest"),
+}
+
+
+def _series(name: str, lat: float, lon: float, hours: int, start: datetime) -> List[float]:
+    phase = (lat + lon) % 24
+    values = []
+    for h in range(hours):
+        hour = (start.hour + h + phase) % 24
+        base = math.sin(2 * math.pi * hour / 24)
+        values.append(round({"temperature_2m": 10 + 8 * base, "relative_humidity_2m": 60 - 20 * base}.get(name, abs(base)), 2))
+    return values
+
+
+def hourly_payload(lat: float, lon: float, start: date, hours: int, variables: List[str]) -> Dict:
+    """Deterministic Open-Meteo-shaped payload (values depend only on position and hour)."""
+    origin = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    times = [(origin + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(hours)]
+    hourly = {"time": times}
+    for name in variables:
+        hourly[name] = _series(name, lat, lon, hours, origin)
+    return {"latitude": lat, "longitude": lon, "timezone": "GMT", "hourly": hourly}
+
+
+class FakeOpenMeteo:
+    """Local stand-in for the Open-Meteo forecast, archive and geocoding APIs.
+
+    Serves ``/v1/forecast``, ``/v1/archive`` and ``/v1/search`` on 127.0.0.1 with
+    deterministic payloads, counts requests per path and can add ``delay_s`` latency
+    to make concurrency effects observable. Like the real archive, days within
+    ``archive_lag_days`` of ``today`` come back as nulls (not published yet). Use as a context manager::
+
+        with FakeOpenMeteo() as server:
+            client = OpenMeteoClient(OpenMeteoConfig(server.base_url, server.geocoding_url, ...))
+    """
+
+    def __init__(self, delay_s: float = 0.0, today: date | None = None, archive_lag_days: int = 2):
+        self.delay_s = delay_s
+        self.archive_lag_days = archive_lag_days
+        self.today = today or datetime.now(timezone.utc).date()
+        self.requests: Counter[str] = Counter()
+        self.log: List[Dict] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-open-meteo", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    @property
+    def geocoding_url(self) -> str:
+        return self.base_url
+
+    def __enter__(self) -> "FakeOpenMeteo":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, path: str, params: Dict[str, str]) -> Dict:
+        variables = [v for v in params.get("hourly", "temperature_2m").split(",") if v]
+        if path == "/v1/search":
+            found = GAZETTEER.get(params.get("name", "").strip().lower())
+            if not found:
+                return {}
+            lat, lon, tz = found
+            return {"results": [{"name": params["name"], "latitude": lat, "longitude": lon, "timezone": tz}]}
+        if "latitude" not in params or "longitude" not in params:
+            raise ValueError("latitude and longitude are required")
+        lats = [float(v) for v in params["latitude"].split(",")]
+        lons = [float(v) for v in params["longitude"].split(",")]
+        if path == "/v1/forecast":
+            days = int(params.get("forecast_days", 7))
+            payloads = [hourly_payload(lat, lon, self.today, 24 * days, variables) for lat, lon in zip(lats, lons)]
+        elif path == "/v1/archive":
+            start = date.fromisoformat(params["start_date"])
+            hours = 24 * ((date.fromisoformat(params["end_date"]) - start).days + 1)
+            payloads = [hourly_payload(lat, lon, start, hours, variables) for lat, lon in zip(lats, lons)]
+            published = max(0, 24 * (self.today - timedelta(days=self.archive_lag_days) - start).days)
+            for payload in payloads:
+                for name in variables:
+                    values = payload["hourly"][name]
+                    values[published:] = [None] * len(values[published:])
+        else:
+            raise LookupError(path)
+        # Like the real API: a list for multi-location requests, a single object otherwise.
+        return payloads if len(payloads) > 1 else payloads[0]
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                url = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                with fake._lock:
+                    fake.requests[url.path] += 1
+                    fake.log.append({"path": url.path, **params})
+                if fake.delay_s:
+                    time.sleep(fake.delay_s)
+                try:
+                    body = json.dumps(fake.respond(url.path, params)).encode("utf-8")
+                    status = 200
+                except (LookupError, ValueError) as exc:
+                    body = json.dumps({"error": True, "reason": str(exc)}).encode("utf-8")
+                    status = 400 if isinstance(exc, ValueError) else 404
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:  # keep test output quiet
+                pass
+
+        return Handler
@@ -3,8 +3,13 @@ from __future__ import annotations
 import pandas as pd
 from typing import Dict
 
+from energy_app.weather.columnar import WeatherFrame
 
-def weather_to_frame(payload: Dict) -> pd.DataFrame:
+
+def weather_to_frame(payload: Dict | WeatherFrame) -> pd.DataFrame:
+    if isinstance(payload, WeatherFrame):
+        # Columnar frames are already typed arrays; no list/string parsing needed.
+        return payload.to_frame()
     hourly = payload.get("hourly", {})
     times = pd.to_datetime(hourly.get("time", []))
     data = {k: v for k, v in hourly.items() if k != "time"}
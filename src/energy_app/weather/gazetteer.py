@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import bisect
+import difflib
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_place(text: str) -> str:
+    """Case-, accent- and punctuation-insensitive form of a place name ("  Győr-Moson " -> "gyor moson")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", stripped).strip()
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    latitude: float
+    longitude: float
+    timezone: str
+    country_code: str = ""
+    population: int = 0
+
+    def as_result(self) -> Dict:
+        """Same shape as an Open-Meteo geocoding result."""
+        return {
+            "name": self.name,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "timezone": self.timezone,
+            "country_code": self.country_code,
+            "population": self.population,
+        }
+
+
+class Gazetteer:
+    """In-memory place-name index for offline geocoding.
+
+    Every name (and alternate name) of a place is indexed under its normalized form;
+    where several places share a name the most populous wins. ``lookup`` is an exact
+    dict hit falling back to a bounded prefix scan over the sorted names, so it stays
+    in microseconds and never guesses. ``fuzzy`` (``difflib`` over names with the same
+    first letter) is much slower and can snap a foreign or misspelled name onto a
+    similar local one, so callers should only use it after other sources missed.
+    """
+
+    def __init__(self, places: Iterable[Place] = ()):
+        self._index: Dict[str, Place] = {}
+        for place in places:
+            self._add(place.name, place)
+        self._build()
+
+    def _add(self, name: str, place: Place) -> None:
+        key = normalize_place(name)
+        if not key:
+            return
+        current = self._index.get(key)
+        if current is None or place.population > current.population:
+            self._index[key] = place
+
+    def _build(self) -> None:
+        self._keys = sorted(self._index)
+        self._by_initial: Dict[str, List[str]] = {}
+        for key in self._keys:
+            self._by_initial.setdefault(key[0], []).append(key)
+
+    @classmethod
+    def from_geonames(
+        cls,
+        path: str | Path,
+        min_population: int = 0,
+        countries: Sequence[str] | None = None,
+        alternate_names: bool = True,
+    ) -> "Gazetteer":
+        """Load a GeoNames ``cities*.txt``/``allCountries.txt`` style dump (tab-separated, 19 columns)."""
+        wanted = {c.upper() for c in countries} if countries else None
+        gazetteer = cls()
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                cols = line.rstrip("\n").split("\t")
+                if len(cols) < 18:
+                    continue
+                population = int(cols[14] or 0)
+                if population < min_population or (wanted and cols[8].upper() not in wanted):
+                    continue
+                place = Place(cols[1], float(cols[4]), float(cols[5]), cols[17], cols[8], population)
+                names = {cols[1], cols[2]}
+                if alternate_names and cols[3]:
+                    names.update(cols[3].split(","))
+                for name in names:
+                    gazetteer._add(name, place)
+                count += 1
+        gazetteer._build()
+        logger.info("Loaded %d places (%d names) from %s", count, len(gazetteer), path)
+        return gazetteer
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, query: str, min_prefix: int = 4) -> Optional[Place]:
+        """Exact normalized match, else the most populous name starting with ``query``.
+
+        Prefix matching only applies to queries of at least ``min_prefix`` characters.
+        """
+        key = normalize_place(query)
+        if not key:
+            return None
+        place = self._index.get(key)
+        if place is not None or len(key) < min_prefix:
+            return place
+        matches = self.search(key, limit=1)
+        return matches[0] if matches else None
+
+    def fuzzy(self, query: str, cutoff: float = 0.85) -> Optional[Place]:
+        """Closest similar name (``difflib`` ratio >= ``cutoff``); slow, see the class docstring."""
+        key = normalize_place(query)
+        if not key:
+            return None
+        close = difflib.get_close_matches(key, self._by_initial.get(key[0], ()), n=1, cutoff=cutoff)
+        return self._index[close[0]] if close else None
+
+    def search(self, prefix: str, limit: int = 10) -> List[Place]:
+        """Places whose normalized name starts with ``prefix``, most populous first."""
+        key = normalize_place(prefix)
+        if not key:
+            return []
+        start = bisect.bisect_left(self._keys, key)
+        found: Dict[Place, None] = {}
+        for i in range(start, len(self._keys)):
+            if not self._keys[i].startswith(key):
+                break
+            found[self._index[self._keys[i]]] = None
+        return sorted(found, key=lambda p: -p.population)[:limit]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+from energy_app.storage.profile_repo import ProfileRepository
+from energy_app.weather.client import OpenMeteoClient, snap
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefetchConfig:
+    interval_s: float = 300.0
+    # Refresh entries this close to expiry, plus up to ``jitter_s`` extra per entry so
+    # cells fetched together do not all come due in the same scan again.
+    refresh_ahead_s: float = 900.0
+    jitter_s: float = 120.0
+    # Forecast lengths to keep warm. Only the agent's 24h horizon (1 day) reads weather
+    # today; add 7 here if 168h lookups start using it.
+    forecast_days: Sequence[int] = (1,)
+    hourly: List[str] | None = None
+    page_size: int = 10_000
+
+
+@dataclass
+class PrefetchRun:
+    started_at: float
+    cells: int = 0
+    due: int = 0
+    cold: int = 0  # missing or expired when scanned: a request would have gone upstream
+    refreshed: int = 0
+    failed: int = 0
+    upstream_calls: int = 0
+    max_lag_s: float = 0.0  # age of the stalest cached forecast when scanned
+    mean_lag_s: float = 0.0
+    duration_s: float = 0.0
+
+
+class WeatherPrefetcher:
+    """Keeps forecasts for every profile location warm in the weather cache.
+
+    Each run pages through ``profiles``, dedupes locations by the client's grid cell
+    and refreshes the forecasts that are missing or about to expire through
+    ``forecast_many`` (batched, ``max_concurrency``-bounded and paced by the client's
+    token bucket), so request-path lookups are cache hits. ``start`` runs it every
+    ``interval_s`` (plus jitter) on a daemon thread; ``stats`` reports freshness lag
+    and refresh cost.
+    """
+
+    def __init__(self, client: OpenMeteoClient, repo: ProfileRepository, config: PrefetchConfig | None = None):
+        self.client = client
+        self.repo = repo
+        self.cfg = config or PrefetchConfig()
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._rng = random.Random()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last: PrefetchRun | None = None
+        self._runs = 0
+        self._totals = {"refreshed": 0, "failed": 0, "cold": 0, "upstream_calls": 0, "duration_s": 0.0}
+
+    def cells(self) -> List[Tuple[float, float]]:
+        """Distinct grid cells of every profile with a known location."""
+        grid = self.client.cfg.grid_deg
+        found: Dict[Tuple[float, float], None] = {}
+        for page in self.repo.iter_profiles(self.cfg.page_size):
+            for profile in page:
+                # Profiles saved without a geocoded location carry (0, 0).
+                if profile.lat is None or profile.lon is None or (profile.lat == 0 and profile.lon == 0):
+                    continue
+                found[(snap(profile.lat, grid), snap(profile.lon, grid))] = None
+        return list(found)
+
+    def run_once(self) -> PrefetchRun:
+        """Scan profiles and refresh whatever is due; returns the run's metrics."""
+        with self._run_lock:
+            run = PrefetchRun(started_at=time.time())
+            start = time.perf_counter()
+            calls_before = self.client.upstream_calls
+            cells = self.cells()
+            run.cells = len(cells)
+            lags: List[float] = []
+            for days in self.cfg.forecast_days:
+                keys = {cell: self.client.forecast_key(*cell, days, self.cfg.hourly) for cell in cells}
+                live = self.client.cache.expiry(list(keys.values()))
+                now = time.time()
+                due = []
+                for cell, key in keys.items():
+                    entry = live.get(key)
+                    if entry is None:
+                        run.cold += 1
+                        due.append(cell)
+                        continue
+                    created_at, expires_at = entry
+                    lags.append(now - created_at)
+                    ahead_s = self.cfg.refresh_ahead_s + self._rng.uniform(0, self.cfg.jitter_s)
+                    if expires_at is not None and expires_at - now <= ahead_s:
+                        due.append(cell)
+                run.due += len(due)
+                if due:
+                    results = self.client.forecast_many(due, days=days, hourly=self.cfg.hourly, refresh=True)
+                    failed = sum(result is None for result in results)
+                    run.failed += failed
+                    run.refreshed += len(due) - failed
+            run.max_lag_s = max(lags, default=0.0)
+            run.mean_lag_s = sum(lags) / len(lags) if lags else 0.0
+            run.upstream_calls = self.client.upstream_calls - calls_before
+            run.duration_s = time.perf_counter() - start
+        with self._lock:
+            self._last = run
+            self._runs += 1
+            for name in self._totals:
+                self._totals[name] += getattr(run, name)
+        logger.info(
+            "Weather prefetch: %d cells, %d refreshed (%d cold, %d failed) in %.2fs with %d upstream calls",
+            run.cells, run.refreshed, run.cold, run.failed, run.duration_s, run.upstream_calls,
+        )
+        return run
+
+    def start(self) -> None:
+        """Run now, then every ``interval_s`` (+ up to ``jitter_s``) on a daemon thread."""
+        if self._thread is not None:
+            return
+
+        def _loop() -> None:
+            while True:
+                try:
+                    self.run_once()
+                except Exception:  # keep refreshing; one bad run must not stop the service
+                    logger.exception("Weather prefetch failed")
+                if self._stop.wait(self.cfg.interval_s + self._rng.uniform(0, self.cfg.jitter_s)):
+                    return
+
+        self._thread = threading.Thread(target=_loop, name="weather-prefetch", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self._runs,
+                "last_run": asdict(self._last) if self._last else None,
+                **{f"total_{name}": value for name, value in self._totals.items()},
+            }
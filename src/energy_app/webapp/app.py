@@ -1,41 +1,77 @@
 from __future__ import annotations
 
 import logging
-from pathlib import Path
 
-import gradio as gr
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 from energy_app.config import load_config
+from energy_app.data.history import HistoryStore
 from energy_app.logging_utils import configure_logging
 from energy_app.storage.db import Database
-from energy_app.storage.profile_repo import Profile, ProfileRepository
+from energy_app.storage.profile_cache import CachedProfileRepository
+from energy_app.storage.profile_repo import Profile
 from energy_app.weather.client import OpenMeteoClient, OpenMeteoConfig
+from energy_app.weather.prefetch import PrefetchConfig, WeatherPrefetcher
 from energy_app.agent.agent import generate_recommendations
 from energy_app.agent.tools import ToolContext
-from energy_app.webapp.ui import build_interface
-from energy_app.models.baseline import BaselineForecaster
+from energy_app.webapp.scheduler import BatchScheduler, SchedulerConfig
+from energy_app.models.registry import registry_from_config
 
 logger = logging.getLogger(__name__)
 
 
+# UI dropdown label -> registry name
+MODEL_CHOICES = {"Baseline": "baseline", "PatchTST": "patchtst", "Granite TTM": "granite"}
+
+
 def create_app():
+    # gradio and matplotlib are imported here rather than at module level so importing
+    # this module (and the CLI entry point) stays cheap; see scripts/bench_imports.py.
+    import gradio as gr
+
+    from energy_app.webapp.ui import build_interface
+
     configure_logging()
     cfg = load_config()
     db = Database(cfg.get("db_url", "sqlite:///data/app.db"))
-    repo = ProfileRepository(db)
+    # one cached repository for the UI and the agent tools, so they share invalidations
+    repo = CachedProfileRepository(db)
     weather_client = OpenMeteoClient(
         OpenMeteoConfig(
             base_url=cfg["open_meteo"]["base_url"],
             geocoding_url=cfg["open_meteo"]["geocoding_url"],
             cache_path=cfg["weather_cache"],
+            gazetteer_path=cfg["open_meteo"].get("gazetteer_path"),
+            gazetteer_min_population=int(cfg["open_meteo"].get("gazetteer_min_population", 0)),
         )
     )
     tool_ctx = ToolContext(profile_repo=repo, weather_client=weather_client)
-
-    baseline_path = cfg["models"]["baseline_path"]
-    baseline_model = BaselineForecaster.load(baseline_path) if Path(baseline_path).exists() else BaselineForecaster()
+    # Keep every saved location's forecast warm so tool lookups never wait on Open-Meteo.
+    prefetch_cfg = dict(cfg.get("weather_prefetch", {}))
+    prefetcher = WeatherPrefetcher(
+        weather_client,
+        repo,
+        PrefetchConfig(**{k: v for k, v in prefetch_cfg.items() if k != "enabled"}),
+    )
+    if prefetch_cfg.get("enabled", True):
+        prefetcher.start()
+
+    registry = registry_from_config(cfg["models"])
+    # Warm the default model now and poll for new artifacts; others load on first use.
+    registry.preload(["baseline"])
+    registry.start_watcher(float(cfg["models"].get("refresh_interval_s", 30)))
+    # One scheduler per model; each batch resolves the registry's current version, so a
+    # hot-swapped artifact is picked up without restarting the schedulers.
+    schedulers = {
+        name: BatchScheduler(
+            lambda contexts, horizon, name=name: registry.get(name).model.predict_batch(contexts, horizon),
+            SchedulerConfig(default_timeout_s=60.0 if name != "baseline" else 10.0),
+            name=name,
+        )
+        for name in registry.names()
+    }
+    history_store = HistoryStore(cfg["data_path"])
 
     def run_save_profile(user_id: str, location: str, area: float, occupants: int, heating: str):
         # geocode for lat/lon
@@ -51,19 +87,27 @@ def create_app():
             occupants=int(occupants or 0),
             heating_type=heating or None,
         )
-        repo.upsert_user(user_id)
-        repo.upsert_profile(profile)
+        with db.transaction():
+            repo.upsert_user(user_id)
+            repo.upsert_profile(profile)
         return f"Profile saved for {user_id} ({location})"
 
     def run_forecast(user_id: str, horizon: int, model_name: str):
+        import matplotlib.pyplot as plt
+
         # Use baseline history from sample data
-        data_path = cfg.get("data_path")
-        if not Path(data_path).exists():
+        history = history_store.tail(200)
+        if history.empty:
             raise gr.Error("No data file found. Generate demo data first.")
-        df = pd.read_csv(data_path)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        history = df.tail(200)
-        preds = baseline_model.predict(history, horizon)
+        name = MODEL_CHOICES.get(model_name, "baseline")
+        # The baseline builds features from the frame; the neural models take raw values.
+        context = history if name == "baseline" else history["consumption"].to_numpy(dtype=np.float32)
+        try:
+            preds = schedulers[name].predict(context, horizon)
+        except TimeoutError:
+            raise gr.Error("Forecast timed out, please retry.")
+        except FileNotFoundError as exc:
+            raise gr.Error(f"{model_name} is not available: {exc}")
         fig, ax = plt.subplots(figsize=(8, 3))
         ax.plot(history["timestamp"].tail(50), history["consumption"].tail(50), label="History")
         future_index = pd.date_range(history["timestamp"].iloc[-1], periods=horizon + 1, freq="H")[1:]
@@ -74,16 +118,35 @@ def create_app():
         return fig
 
     def run_recommendations(user_id: str):
-        data_path = cfg.get("data_path")
-        df = pd.read_csv(data_path)
-        recs = generate_recommendations(tool_ctx, user_id, df["consumption"].tail(168))
+        history = history_store.tail(168)
+        recs = generate_recommendations(tool_ctx, user_id, history["consumption"])
         return recs.__dict__
 
     demo = build_interface(run_save_profile, run_forecast, run_recommendations)
 
-    @demo.app.get(\"/health\")  # type: ignore[attr-defined]
+    @demo.app.get("/health")  # type: ignore[attr-defined]
     def _healthcheck():  # pragma: no cover - simple liveness
-        return {\"status\": \"ok\"}
+        return {"status": "ok"}
+
+    @demo.app.get("/metrics/forecast")  # type: ignore[attr-defined]
+    def _forecast_metrics():  # pragma: no cover - exposes scheduler stats
+        return {name: scheduler.stats() for name, scheduler in schedulers.items()}
+
+    @demo.app.get("/metrics/profiles")  # type: ignore[attr-defined]
+    def _profile_metrics():  # pragma: no cover - exposes profile cache stats
+        return repo.stats()
+
+    @demo.app.get("/metrics/weather")  # type: ignore[attr-defined]
+    def _weather_metrics():  # pragma: no cover - exposes weather cache stats
+        return weather_client.cache.stats()
+
+    @demo.app.get("/metrics/weather/prefetch")  # type: ignore[attr-defined]
+    def _prefetch_metrics():  # pragma: no cover - exposes prefetcher freshness/cost
+        return prefetcher.stats()
+
+    @demo.app.get("/metrics/models")  # type: ignore[attr-defined]
+    def _model_metrics():  # pragma: no cover - exposes registry stats
+        return registry.stats()
 
     return demo
 
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+PredictBatchFn = Callable[[Sequence[Any], int], np.ndarray]
+
+
+@dataclass
+class SchedulerConfig:
+    max_batch_size: int = 64
+    max_wait_ms: float = 5.0
+    default_timeout_s: float = 10.0
+    latency_samples: int = 2048
+
+
+@dataclass
+class _PendingRequest:
+    context: Any
+    horizon: int
+    deadline: float
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class BatchScheduler:
+    """Collects concurrent forecast requests and dispatches them as one batched model call.
+
+    Requests are gathered until ``max_batch_size`` is reached or ``max_wait_ms`` has
+    passed since the first one arrived, grouped by horizon and sent to ``predict_batch``.
+    Requests whose deadline has passed before dispatch fail with ``TimeoutError``.
+    """
+
+    def __init__(self, predict_batch: PredictBatchFn, config: SchedulerConfig | None = None, name: str = "forecast"):
+        self.predict_batch = predict_batch
+        self.cfg = config or SchedulerConfig()
+        self.name = name
+        self._queue: "queue.Queue[_PendingRequest | None]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes: Counter[int] = Counter()
+        self._latencies: deque[float] = deque(maxlen=self.cfg.latency_samples)
+        self._expired = 0
+        self._failed = 0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name=f"{name}-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, context: Any, horizon: int, timeout: float | None = None) -> Future:
+        if self._closed:
+            raise RuntimeError("Scheduler is closed")
+        timeout = self.cfg.default_timeout_s if timeout is None else timeout
+        request = _PendingRequest(context=context, horizon=horizon, deadline=time.perf_counter() + timeout)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, context: Any, horizon: int, timeout: float | None = None) -> np.ndarray:
+        timeout = self.cfg.default_timeout_s if timeout is None else timeout
+        future = self.submit(context, horizon, timeout)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    async def predict_async(self, context: Any, horizon: int, timeout: float | None = None) -> np.ndarray:
+        timeout = self.cfg.default_timeout_s if timeout is None else timeout
+        future = self.submit(context, horizon, timeout)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000.0
+            histogram = dict(sorted(self._batch_sizes.items()))
+            expired, failed = self._expired, self._failed
+        return {
+            "queue_depth": self._queue.qsize(),
+            "batches": sum(histogram.values()),
+            "batch_size_histogram": histogram,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "latency_p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            "expired": expired,
+            "failed": failed,
+        }
+
+    def close(self, timeout: float | None = None) -> None:
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def _collect(self, first: _PendingRequest) -> tuple[List[_PendingRequest], bool]:
+        batch = [first]
+        stop = False
+        flush_at = time.perf_counter() + self.cfg.max_wait_ms / 1000.0
+        while len(batch) < self.cfg.max_batch_size:
+            remaining = flush_at - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            by_horizon: Dict[int, List[_PendingRequest]] = {}
+            now = time.perf_counter()
+            for request in batch:
+                if not request.future.set_running_or_notify_cancel():
+                    continue  # caller gave up while queued
+                if request.deadline <= now:
+                    request.future.set_exception(TimeoutError("Forecast request expired before dispatch"))
+                    with self._lock:
+                        self._expired += 1
+                    continue
+                by_horizon.setdefault(request.horizon, []).append(request)
+            for horizon, requests in by_horizon.items():
+                self._dispatch(horizon, requests)
+            if stop:
+                return
+
+    def _dispatch(self, horizon: int, requests: List[_PendingRequest]) -> None:
+        try:
+            preds = self.predict_batch([r.context for r in requests], horizon)
+        except Exception as exc:
+            logger.exception("Batched %s call failed for %d requests", self.name, len(requests))
+            for request in requests:
+                request.future.set_exception(exc)
+            with self._lock:
+                self._failed += len(requests)
+            return
+        done = time.perf_counter()
+        for request, pred in zip(requests, preds):
+            request.future.set_result(pred)
+        with self._lock:
+            self._batch_sizes[len(requests)] += 1
+            self._latencies.extend(done - r.enqueued_at for r in requests)
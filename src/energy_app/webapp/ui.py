@@ -43,7 +43,8 @@ def build_interface(run_save_profile, run_forecast, run_recommendations):
             return result
 
         save_btn.click(_save_profile, inputs=[location, area, occupants, heating], outputs=save_status)
-        forecast_btn.click(_run_forecast, inputs=[horizon, model_choice], outputs=forecast_plot)
+        # unlimited concurrency so simultaneous clicks can share one batched model call
+        forecast_btn.click(_run_forecast, inputs=[horizon, model_choice], outputs=forecast_plot, concurrency_limit=None)
         rec_btn.click(_run_recs, outputs=rec_output)
 
     return demo
@@ -1,6 +1,19 @@
+import pickle
+
+import numpy as np
 import pandas as pd
+from energy_app.data.features import (
+    FeatureSpec,
+    IncrementalFeatureBuilder,
+    add_lag_features,
+    add_rolling_features,
+    add_time_features,
+    build_baseline_matrix,
+    feature_columns,
+)
 from energy_app.data.preprocess import fill_and_resample
-from energy_app.data.windows import sliding_window
+from energy_app.data.window_store import WindowDataset, split_window_dataset, write_window_dataset
+from energy_app.data.windows import WindowConfig, sliding_window, strided_windows
 
 
 def test_resample_and_windowing():
@@ -12,3 +25,76 @@ def test_resample_and_windowing():
     assert X.shape[0] == len(resampled) - 3 - 2 + 1
     assert X.shape[1] == 3
     assert y.shape[1] == 2
+
+
+def test_strided_windows_are_views_and_match_loop():
+    values = np.arange(20, dtype=np.float64)
+    X, y = strided_windows(values, window=4, horizon=2, step=3)
+    assert X.dtype == np.float32
+    assert not X.flags.writeable
+    starts = range(0, len(values) - 4 - 2 + 1, 3)
+    np.testing.assert_array_equal(X, [values[i : i + 4] for i in starts])
+    np.testing.assert_array_equal(y, [values[i + 4 : i + 6] for i in starts])
+
+    multi = np.stack([values, values * 10], axis=1).astype(np.float32)
+    X_mc, y_mc = strided_windows(multi, window=4, horizon=2)
+    assert X_mc.shape == (15, 4, 2)
+    assert y_mc.shape == (15, 2, 2)
+    assert np.shares_memory(X_mc, multi)
+    np.testing.assert_array_equal(y_mc[3], multi[7:9])
+
+
+def test_window_dataset_roundtrip(tmp_path):
+    df = pd.DataFrame({"consumption": np.arange(30, dtype=float)})
+    write_window_dataset(df, tmp_path / "windows", WindowConfig(window=5, horizon=2, step=2))
+    ds = WindowDataset.open(tmp_path / "windows")
+    assert len(ds) == (30 - 5 - 2) // 2 + 1
+    x, y = ds[3]
+    np.testing.assert_array_equal(x, np.arange(6, 11))
+    np.testing.assert_array_equal(y, [11, 12])
+    X, Y = ds.arrays()
+    assert X.shape == (len(ds), 5)
+    np.testing.assert_array_equal(X[3], x)
+    assert pickle.loads(pickle.dumps(ds))._series is None
+
+
+def test_split_window_dataset_respects_time_order(tmp_path):
+    df = pd.DataFrame({"consumption": np.arange(100, dtype=float)})
+    write_window_dataset(df, tmp_path / "windows", WindowConfig(window=10, horizon=5))
+    train, val, test = split_window_dataset(WindowDataset.open(tmp_path / "windows"))
+    # rows [0, 70) train, [70, 85) val, [85, 100) test
+    assert train[len(train) - 1][1][-1] == 69
+    assert val[0][1][0] == 70 and val[len(val) - 1][1][-1] == 84
+    assert test[0][1][0] == 85
+    assert train.arrays()[0].shape == (len(train), 10)
+
+
+def test_incremental_features_match_batch_path():
+    timestamps = pd.date_range("2024-01-01", periods=600, freq="1h", tz="UTC")
+    values = np.random.default_rng(1).gamma(2.0, 0.5, size=len(timestamps))
+    df = pd.DataFrame({"timestamp": timestamps, "consumption": values})
+    batch = build_baseline_matrix(df)
+
+    builder = IncrementalFeatureBuilder.from_history(df.iloc[:400])
+    streamed = builder.extend(df.iloc[400:])
+    expected = batch[batch["timestamp"] >= timestamps[400]].reset_index(drop=True)
+    assert list(streamed.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(streamed, expected, rtol=1e-6)
+
+    from_scratch = IncrementalFeatureBuilder().extend(df)
+    pd.testing.assert_frame_equal(from_scratch, batch, rtol=1e-6)
+
+
+def test_fused_feature_matrix_matches_pandas_pipeline():
+    timestamps = pd.date_range("2024-01-01", periods=500, freq="1h", tz="Europe/Budapest")
+    df = pd.DataFrame({"timestamp": timestamps, "consumption": np.random.default_rng(2).random(500) + 100})
+    legacy = add_rolling_features(add_lag_features(add_time_features(df))).dropna().reset_index(drop=True)
+    fused = build_baseline_matrix(df)
+    assert list(fused.columns) == list(legacy.columns)
+    assert fused[feature_columns(fused)].dtypes.eq(np.float32).all()
+    pd.testing.assert_frame_equal(fused, legacy, check_dtype=False, rtol=1e-6)
+
+    spec = FeatureSpec(lags=(1, 2), windows=(3,), time_features=False, dtype="float64")
+    custom = build_baseline_matrix(df, spec)
+    assert feature_columns(custom) == ["lag_1", "lag_2", "roll_mean_3", "roll_std_3"]
+    assert len(custom) == len(df) - 2
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from energy_app.data.history import HistoryStore
+
+
+def _write(path, start, periods, mode="w"):
+    ts = pd.date_range(start, periods=periods, freq="1h", tz="UTC")
+    df = pd.DataFrame({"timestamp": ts, "consumption": range(periods)})
+    df.to_csv(path, mode=mode, header=mode == "w", index=False)
+
+
+def test_history_store_tail_range_and_append(tmp_path):
+    path = tmp_path / "history.csv"
+    _write(path, "2024-01-01", 48)
+    store = HistoryStore(path)
+    assert len(store) == 48
+    tail = store.tail(5)
+    assert tail["consumption"].tolist() == [43, 44, 45, 46, 47]
+    assert str(tail["timestamp"].dt.tz) == "UTC"
+
+    window = store.range("2024-01-01 10:00", "2024-01-01 13:00")
+    assert window["consumption"].tolist() == [10, 11, 12]
+
+    _write(path, "2024-01-03", 2, mode="a")
+    assert store.tail(2)["timestamp"].iloc[0] == pd.Timestamp("2024-01-03", tz="UTC")
+    assert len(store) == 50
+    # frames handed out earlier are unaffected by the refresh
+    assert tail["consumption"].tolist() == [43, 44, 45, 46, 47]
+
+
+def test_history_store_reloads_a_longer_rewritten_file(tmp_path):
+    path = tmp_path / "history.csv"
+    _write(path, "2024-01-01", 48)
+    store = HistoryStore(path)
+    assert store.tail(1)["consumption"].tolist() == [47]
+
+    # Regenerated data: different rows, and more of them than before.
+    ts = pd.date_range("2023-06-01", periods=200, freq="1h", tz="UTC")
+    pd.DataFrame({"timestamp": ts, "consumption": [i * 10 for i in range(200)]}).to_csv(path, index=False)
+    assert len(store.tail(500)) == 200
+    assert store.tail(1)["consumption"].tolist() == [1990]
+    assert store.tail(200)["timestamp"].iloc[0] == pd.Timestamp("2023-06-01", tz="UTC")
+
+    _write(path, "2023-07-01", 3, mode="a")
+    assert len(store.tail(500)) == 203
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+HEAVY = {"torch", "transformers", "gradio", "matplotlib", "lightgbm", "sklearn"}
+# Seconds for a cold import of the web app; override on slow CI machines.
+BUDGET_S = float(os.getenv("ENERGY_APP_IMPORT_BUDGET_S", "1.0"))
+
+
+def _cold_import(*modules):
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {list(modules)!r}: __import__(name)\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start, 'modules': sorted({m.split('.')[0] for m in sys.modules})}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    return json.loads(out.stdout)
+
+
+def test_webapp_and_models_import_without_heavy_backends():
+    result = _cold_import(
+        "energy_app.webapp.app",
+        "energy_app.models.registry",
+        "energy_app.models.baseline",
+        "energy_app.models.granite_ttm",
+        "energy_app.eval.reporting",
+    )
+    assert HEAVY.isdisjoint(result["modules"])
+    assert result["seconds"] < BUDGET_S
+
+
+def test_data_pipeline_never_imports_torch():
+    result = _cold_import(
+        "energy_app.data.loader",
+        "energy_app.data.preprocess",
+        "energy_app.data.features",
+        "energy_app.data.windows",
+        "energy_app.data.window_store",
+    )
+    assert HEAVY.isdisjoint(result["modules"])
@@ -0,0 +1,31 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from energy_app.data.ingest import UCI_MEMBER, ingest_chunks, iter_uci_chunks
+
+
+def _write_uci_zip(path, minutes):
+    ts = pd.date_range("2006-12-16 17:24", periods=minutes, freq="1min")
+    values = np.round(np.random.default_rng(0).random(minutes) * 4, 3).astype(str)
+    values[5] = "?"
+    lines = ["Date;Time;Global_active_power;Global_reactive_power"]
+    lines += [f"{t:%d/%m/%Y};{t:%H:%M:%S};{v};0.1" for t, v in zip(ts, values)]
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(UCI_MEMBER, "\n".join(lines) + "\n")
+
+
+def test_streaming_hourly_aggregation_matches_full_groupby(tmp_path):
+    zip_path = tmp_path / "uci.zip"
+    _write_uci_zip(zip_path, minutes=300)
+    written = []
+    stats = ingest_chunks(iter_uci_chunks(zip_path, chunksize=37), written.append, freq="1h")
+
+    result = pd.concat(written, ignore_index=True)
+    full = pd.concat(iter_uci_chunks(zip_path), ignore_index=True)
+    expected = full.groupby(full["timestamp"].dt.floor("1h"))["consumption"].mean()
+    assert stats.rows_in == 299  # one unparseable reading dropped
+    assert stats.rows_out == len(expected) == 6
+    assert result["timestamp"].is_unique
+    np.testing.assert_allclose(result["consumption"], expected.to_numpy())
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from energy_app.data.features import build_baseline_matrix, feature_columns
+from energy_app.models.base import pad_contexts
+from energy_app.models.baseline import BaselineForecaster
+
+
+def test_pad_contexts_left_aligns_and_masks():
+    values, mask = pad_contexts([np.array([1.0, 2.0, 3.0]), np.array([4.0])], length=2)
+    np.testing.assert_array_equal(values, [[2.0, 3.0], [0.0, 4.0]])
+    np.testing.assert_array_equal(mask, [[True, True], [False, True]])
+    edge, _ = pad_contexts([np.array([5.0]), np.array([1.0, 2.0])], fill="edge")
+    np.testing.assert_array_equal(edge, [[5.0, 5.0], [1.0, 2.0]])
+
+
+def _series(periods):
+    timestamps = pd.date_range("2024-01-01", periods=periods, freq="1h", tz="UTC")
+    hours = np.arange(periods)
+    values = 1.0 + 0.5 * np.sin(2 * np.pi * hours / 24) + np.random.default_rng(0).normal(0, 0.05, periods)
+    return pd.DataFrame({"timestamp": timestamps, "consumption": values})
+
+
+def test_baseline_recursive_forecast_rolls_features_forward():
+    df = _series(24 * 40)
+    model = BaselineForecaster()
+    model.fit(*model.build_training_matrix(build_baseline_matrix(df)))
+
+    history = df.iloc[:-24]
+    preds = model.predict(history, 168)
+    assert preds.shape == (168,)
+    # first step equals a one-step prediction on the batch features of the next hour
+    next_row = pd.DataFrame({"timestamp": [df["timestamp"].iloc[-24]], "consumption": [np.nan]})
+    feats = build_baseline_matrix(pd.concat([history, next_row.fillna(0.0)], ignore_index=True))
+    expected = model.model.predict(feats[feature_columns(feats)].tail(1))
+    np.testing.assert_allclose(preds[0], expected[0], rtol=1e-5)
+    # the seasonal shape carries through the horizon
+    assert np.corrcoef(preds[:24], df["consumption"].iloc[-24:])[0, 1] > 0.9
+
+    contexts = [history, df.iloc[:-48], df.iloc[:-72]]
+    batch = model.predict_batch(contexts, horizon=24, max_batch_size=2)
+    for ctx, row in zip(contexts, batch):
+        np.testing.assert_allclose(model.predict(ctx, 24), row)
+
+    # Short and ragged contexts (fewer rows than the 168h lag) are edge-padded.
+    short = [history.tail(100), history.tail(5), history.tail(1), history]
+    preds = model.predict_batch(short, horizon=24)
+    assert preds.shape == (4, 24) and np.isfinite(preds).all()
+    np.testing.assert_allclose(preds[0], model.predict(history.tail(100), 24))
+
+
+def test_baseline_rejects_legacy_artifacts(tmp_path):
+    import joblib
+    import pytest
+
+    model = BaselineForecaster()
+    model.fit(*model.build_training_matrix(build_baseline_matrix(_series(24 * 10))))
+    model.save(str(tmp_path / "current.pkl"))
+    assert BaselineForecaster.load(str(tmp_path / "current.pkl")).spec == model.spec
+
+    joblib.dump(model.model, tmp_path / "legacy.pkl")
+    with pytest.raises(ValueError, match="retrain"):
+        BaselineForecaster.load(str(tmp_path / "legacy.pkl"))
+    joblib.dump({"model": model.model, "spec": model.spec, "format": 1}, tmp_path / "old.pkl")
+    with pytest.raises(ValueError, match="retrain"):
+        BaselineForecaster.load(str(tmp_path / "old.pkl"))
+
+
+def test_train_all_trains_per_series_and_skips_unchanged(tmp_path):
+    from energy_app.models.training import load_manifest, train_all
+    from energy_app.storage.series_store import ConsumptionStore
+
+    store = ConsumptionStore(tmp_path / "store")
+    store.write(_series(24 * 14), meter_id="a")
+    store.write(_series(24 * 10), meter_id="b")
+    store.write(_series(12), meter_id="short")
+    out = tmp_path / "models"
+
+    summary = train_all(store.root, out, workers=2, max_tasks_per_child=None)
+    assert sorted(summary.trained) == ["a", "b"]
+    assert list(summary.failed) == ["short"]
+    assert set(load_manifest(out)) == {"a", "b"}
+    model = BaselineForecaster.load(str(out / "a.pkl"))
+    assert model.predict(_series(24 * 8), 24).shape == (24,)
+
+    store.write(_series(24 * 15).tail(24), meter_id="b")
+    again = train_all(store.root, out, workers=2, max_tasks_per_child=None)
+    assert again.skipped == ["a"] and again.trained == ["b"]
+
+
+def test_registry_loads_lazily_caches_and_hot_swaps(tmp_path):
+    import os
+
+    from energy_app.models.registry import ModelRegistry, ModelSpec
+
+    path = tmp_path / "baseline.pkl"
+    BaselineForecaster().save(str(path))
+    loads = []
+
+    def load(p):
+        loads.append(p)
+        return BaselineForecaster.load(p)
+
+    registry = ModelRegistry([ModelSpec("baseline", load, str(path)), ModelSpec("other", load, str(path))], max_bytes=10**9)
+    assert loads == []
+    first = registry.get("baseline")
+    assert registry.get("baseline") is first and len(loads) == 1
+
+    BaselineForecaster().save(str(path))
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+    assert registry.get("baseline") is first  # old version keeps serving until the reload lands
+    for future in registry.refresh():
+        future.result()
+    swapped = registry.get("baseline")
+    assert swapped is not first and swapped.version != first.version
+    assert [e["version"] for e in registry.stats()["loaded"]] == [swapped.version]
+
+    registry.max_bytes = swapped.nbytes
+    registry.get("other")
+    assert registry.stats()["current"].keys() == {"other"}
+    registry.close()
+
+
+def test_registry_counts_granite_pipeline_parameters(monkeypatch, tmp_path):
+    import sys
+    import types
+
+    from energy_app.models.granite_ttm import GraniteTTMForecaster
+    from energy_app.models.registry import estimate_nbytes
+
+    class _Param:
+        def __init__(self, n):
+            self.n = n
+
+        def numel(self):
+            return self.n
+
+        def element_size(self):
+            return 4
+
+    pipeline = types.SimpleNamespace(model=types.SimpleNamespace(parameters=lambda: [_Param(1000), _Param(24)]))
+    fake = types.ModuleType("transformers")
+    fake.pipeline = lambda task, model: pipeline
+    monkeypatch.setitem(sys.modules, "transformers", fake)
+    model = GraniteTTMForecaster.load("")
+    assert model._pipeline is pipeline
+    assert estimate_nbytes(model, "") == 4096
+
+    (tmp_path / "weights.bin").write_bytes(b"x" * 300)
+    (tmp_path / "config.json").write_bytes(b"{}")
+    assert estimate_nbytes(types.SimpleNamespace(), str(tmp_path)) == 302
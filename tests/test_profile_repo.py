@@ -13,3 +13,108 @@ def test_profile_crud(tmp_path):
     assert fetched is not None
     assert fetched.location_text == "Budapest"
     assert fetched.occupants == 2
+
+
+def test_database_uses_wal_and_rolls_back_failed_transactions(tmp_path):
+    db = Database(f"sqlite:///{tmp_path / 'app.db'}")
+    repo = ProfileRepository(db)
+    with db.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    try:
+        with db.transaction():
+            repo.upsert_user("u1")
+            repo.upsert_profile(Profile("u1", "Budapest", 47.5, 19.1, 70, 2))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert repo.get_profile("u1") is None
+
+
+def test_database_pool_handles_concurrent_readers_and_writers(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from energy_app.storage.db import DatabaseConfig
+
+    db = Database(f"sqlite:///{tmp_path / 'app.db'}", DatabaseConfig(pool_size=4))
+    repo = ProfileRepository(db)
+
+    def write(i):
+        with db.transaction():
+            repo.upsert_user(f"u{i}")
+            repo.upsert_profile(Profile(f"u{i}", "Szeged", 46.3, 20.1, 50 + i, 1))
+
+    def read(i):
+        return repo.get_profile(f"u{i % 10}")
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda i: write(i) if i % 2 else read(i), range(400)))
+    assert repo.get_profile("u399").area_m2 == 449
+    assert db._created <= 4
+    db.close()
+
+
+def test_bulk_upsert_get_and_export_roundtrip(tmp_path):
+    from energy_app.storage.profile_repo import export_profiles, import_profiles
+
+    repo = ProfileRepository(Database(f"sqlite:///{tmp_path / 'app.db'}"))
+    profiles = (Profile(f"u{i:04d}", "Debrecen", 47.5, 21.6, 40 + i, i % 4, None if i % 2 else "gas") for i in range(2500))
+    assert repo.upsert_profiles_many(profiles, batch_size=1000) == 2500
+    assert repo.upsert_profiles_many([Profile("u0001", "Pécs", 46.1, 18.2, 99, 3)]) == 1
+
+    found = repo.get_profiles([f"u{i:04d}" for i in range(0, 2500, 2)] + ["missing"])
+    assert len(found) == 1250 and "missing" not in found
+    assert found["u0000"].heating_type == "gas"
+    assert repo.get_profile("u0001").location_text == "Pécs"
+
+    for suffix in ("csv", "parquet"):
+        path = tmp_path / f"profiles.{suffix}"
+        assert export_profiles(repo, path, batch_size=700) == 2500
+        copy = ProfileRepository(Database(f"sqlite:///{tmp_path / f'copy-{suffix}.db'}"))
+        assert import_profiles(copy, path, batch_size=700) == 2500
+        assert copy.get_profiles(["u0001", "u0002"]) == repo.get_profiles(["u0001", "u0002"])
+
+
+def test_cached_repository_reads_through_and_invalidates_on_upsert(tmp_path):
+    from energy_app.storage.profile_cache import CachedProfileRepository
+
+    repo = CachedProfileRepository(Database(f"sqlite:///{tmp_path / 'app.db'}"), max_entries=2)
+    repo.upsert_user("u1")
+    repo.upsert_profile(Profile("u1", "Budapest", 47.5, 19.1, 70, 2))
+
+    assert repo.get_profile("u1").occupants == 2
+    assert repo.get_profile("u1").occupants == 2
+    assert repo.get_profile("nobody") is None and repo.get_profile("nobody") is None
+    assert repo.stats()["hits"] == 2 and repo.stats()["misses"] == 2
+
+    repo.upsert_profile(Profile("u1", "Budapest", 47.5, 19.1, 70, 5))
+    assert repo.get_profile("u1").occupants == 5
+    repo.upsert_profiles_many([Profile("u1", "Győr", 47.7, 17.6, 60, 1)])
+    assert repo.get_profiles(["u1", "nobody"])["u1"].location_text == "Győr"
+
+    repo.get_profiles(["a", "b", "c"])
+    assert repo.stats()["size"] == 2 and repo.stats()["evictions"] > 0
+
+    repo.ttl_s = 0
+    repo.invalidate()
+    repo.get_profile("u1")
+    before = repo.stats()["misses"]
+    repo.get_profile("u1")
+    assert repo.stats()["misses"] == before + 1
+
+
+def test_cached_repository_returns_copies(tmp_path):
+    from energy_app.agent.tools import ToolContext, tool_get_user_profile
+    from energy_app.storage.profile_cache import CachedProfileRepository
+
+    repo = CachedProfileRepository(Database(f"sqlite:///{tmp_path / 'app.db'}"))
+    repo.upsert_user("u1")
+    repo.upsert_profile(Profile("u1", "Budapest", 47.5, 19.1, 70, 2))
+
+    repo.get_profile("u1").occupants = 9
+    repo.get_profile("u1").occupants = 9
+    repo.get_profiles(["u1"])["u1"].location_text = "Pécs"
+    assert repo.get_profile("u1") == Profile("u1", "Budapest", 47.5, 19.1, 70, 2)
+    assert repo.stats()["hits"] >= 2
+
+    tool_get_user_profile(ToolContext(repo, None), "u1")["occupants"] = 7
+    assert repo.get_profile("u1").occupants == 2
@@ -0,0 +1,53 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from energy_app.webapp.scheduler import BatchScheduler, SchedulerConfig
+
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    def predict_batch(contexts, horizon):
+        calls.append(len(contexts))
+        return np.array([np.full(horizon, c) for c in contexts])
+
+    scheduler = BatchScheduler(predict_batch, SchedulerConfig(max_batch_size=8, max_wait_ms=200))
+    results = {}
+
+    def _call(i):
+        results[i] = scheduler.predict(float(i), horizon=3)
+
+    threads = [threading.Thread(target=_call, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    scheduler.close()
+
+    assert calls == [8]
+    for i in range(8):
+        np.testing.assert_array_equal(results[i], [i, i, i])
+    stats = scheduler.stats()
+    assert stats["batch_size_histogram"] == {8: 1}
+    assert stats["latency_p99_ms"] is not None
+
+
+def test_expired_requests_are_not_dispatched():
+    gate = threading.Event()
+
+    def slow_predict(contexts, horizon):
+        gate.wait()
+        return np.zeros((len(contexts), horizon))
+
+    scheduler = BatchScheduler(slow_predict, SchedulerConfig(max_batch_size=1, max_wait_ms=0))
+    blocking = scheduler.submit("a", 2)
+    time.sleep(0.05)  # the worker is now busy with the first request
+    with pytest.raises(TimeoutError):
+        scheduler.predict("b", 2, timeout=0.05)
+    gate.set()
+    blocking.result(timeout=1)
+    scheduler.close()
+    assert scheduler.stats()["batch_size_histogram"] == {1: 1}
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from energy_app.data.history import HistoryStore
+from energy_app.data.loader import load_consumption
+from energy_app.storage.series_store import ConsumptionStore
+
+
+def _frame(start, periods):
+    ts = pd.date_range(start, periods=periods, freq="1h", tz="UTC")
+    return pd.DataFrame({"timestamp": ts, "consumption": range(periods)})
+
+
+def test_store_partitions_by_meter_and_month(tmp_path):
+    store = ConsumptionStore(tmp_path / "store")
+    store.write(_frame("2024-01-31 20:00", 8), meter_id="m1")
+    store.write(_frame("2024-01-31 20:00", 3), meter_id="m2")
+    assert store.meters() == ["m1", "m2"]
+    assert (tmp_path / "store" / "meter=m1" / "month=2024-02").is_dir()
+
+    df = store.read("m1", start="2024-02-01", columns=["consumption"])
+    assert df["consumption"].tolist() == [4, 5, 6, 7]
+    assert list(df.columns) == ["consumption"]
+    assert len(store.read(["m1", "m2"], end="2024-01-31 22:00")) == 4
+
+
+def test_csv_import_feeds_loader_and_history(tmp_path):
+    csv_path = tmp_path / "history.csv"
+    _frame("2024-01-01", 48).to_csv(csv_path, index=False)
+    store = ConsumptionStore(tmp_path / "store")
+    assert store.import_csv(csv_path, chunksize=10) == 48
+
+    df = load_consumption(tmp_path / "store", start="2024-01-02")
+    assert len(df) == 24 and str(df["timestamp"].dt.tz) == "UTC"
+
+    history = HistoryStore(tmp_path / "store")
+    assert history.tail(2)["consumption"].tolist() == [46, 47]
+    store.write(_frame("2024-01-03", 1).assign(consumption=99.0))
+    assert history.tail(1)["consumption"].tolist() == [99.0]
@@ -7,3 +7,93 @@ def test_cache_key_stable(tmp_path):
     key1 = client._cache_key(47.5, 19.1, "2024-01-01", "2024-01-02", ["temperature_2m"], "historical")
     key2 = client._cache_key(47.5, 19.1, "2024-01-01", "2024-01-02", ["temperature_2m"], "historical")
     assert key1 == key2
+
+
+def test_weather_cache_expires_forecasts_but_keeps_archive(tmp_path):
+    from energy_app.weather.cache import WeatherCache, WeatherCacheConfig
+
+    cache = WeatherCache(tmp_path / "cache.sqlite", WeatherCacheConfig(ttl_s={"forecast": 0.0, "historical": None}))
+    payload = {"hourly": {"time": ["2024-01-01T00:00"], "temperature_2m": [1.5]}}
+    cache.set("f", payload, granularity="forecast")
+    cache.set("h", payload, granularity="historical")
+    assert cache.get("f") is None
+    assert cache.get("h") == payload
+    stats = cache.stats()
+    assert stats["expired"] == 1 and stats["hits"] == 1 and stats["entries"] == 1
+    cache.close()
+
+    reopened = WeatherCache(tmp_path / "cache.sqlite")
+    assert reopened.get("h") == payload
+    assert reopened.stats()["bytes"] > 0
+
+
+def test_weather_cache_evicts_oldest_over_budget(tmp_path):
+    import os
+
+    from energy_app.weather.cache import WeatherCache, WeatherCacheConfig
+
+    cache = WeatherCache(tmp_path / "cache.sqlite", WeatherCacheConfig(max_bytes=4096))
+    for i in range(20):
+        cache.set(f"k{i}", {"blob": os.urandom(300).hex()}, granularity="historical")
+    stats = cache.stats()
+    assert stats["bytes"] <= 4096 and stats["evictions"] > 0
+    assert cache.get("k0") is None and cache.get("k19") is not None
+
+
+def test_weather_cache_upgrades_legacy_table(tmp_path):
+    import sqlite3
+
+    from energy_app.weather.cache import WeatherCache
+
+    path = tmp_path / "cache.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)")
+        conn.execute("INSERT INTO cache VALUES ('k', '{}', 0)")
+    cache = WeatherCache(path)
+    assert cache.get("k") is None
+    cache.set("k", {"a": 1})
+    assert cache.get("k") == {"a": 1}
+
+
+def test_weather_frame_roundtrips_through_cache_without_json(tmp_path):
+    from datetime import date
+
+    import numpy as np
+
+    from energy_app.weather.cache import WeatherCache, WeatherCacheConfig
+    from energy_app.weather.columnar import WeatherFrame
+    from energy_app.weather.fake_server import hourly_payload
+
+    payload = hourly_payload(47.5, 19.05, date(2024, 1, 1), 48, ["temperature_2m", "relative_humidity_2m"])
+    payload["hourly"]["temperature_2m"][3] = None
+    frame = WeatherFrame.from_payload(payload)
+    assert frame.hours.dtype == np.int64 and frame.columns["temperature_2m"].dtype == np.float32
+    assert frame.to_payload() == payload
+    assert WeatherFrame.from_bytes(frame.to_bytes(0)) == WeatherFrame.from_bytes(frame.to_bytes()) == frame
+
+    cache = WeatherCache(tmp_path / "cache.sqlite", WeatherCacheConfig(memory_entries=0))
+    cache.set("f", frame, granularity="forecast")
+    cache.set("g", {"result": None}, granularity="geocode_miss")
+    cached = cache.get("f")
+    assert cached == frame and cache.get("g") == {"result": None}
+    df = cached.to_frame()
+    assert list(df.columns) == ["timestamp", "temperature_2m", "relative_humidity_2m"]
+    assert str(df["timestamp"].iloc[1]) == "2024-01-01 01:00:00"
+    assert np.isnan(df["temperature_2m"].iloc[3])
+
+
+def test_weather_cache_keeps_json_entries_when_adding_columnar_format(tmp_path):
+    import sqlite3
+    import zlib
+
+    from energy_app.weather.cache import WeatherCache
+
+    path = tmp_path / "cache.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, granularity TEXT NOT NULL,"
+            " size INTEGER NOT NULL, created_at REAL NOT NULL, expires_at REAL)"
+        )
+        blob = zlib.compress(b'{"a":1}')
+        conn.execute("INSERT INTO cache VALUES ('k', ?, 'geocode', ?, 0, NULL)", (blob, len(blob)))
+    assert WeatherCache(path).get("k") == {"a": 1}
@@ -0,0 +1,244 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from energy_app.weather.client import OpenMeteoClient, OpenMeteoConfig, snap
+from energy_app.weather.fake_server import FakeOpenMeteo
+
+
+def _client(server, tmp_path, **kwargs):
+    return OpenMeteoClient(
+        OpenMeteoConfig(
+            base_url=server.base_url,
+            geocoding_url=server.geocoding_url,
+            cache_path=str(tmp_path / "cache.sqlite"),
+            **kwargs,
+        )
+    )
+
+
+def test_snap_groups_nearby_coordinates():
+    assert snap(47.4984, 0.05) == snap(47.51, 0.05) == 47.5
+    assert snap(47.4984, 0) == 47.4984
+
+
+def test_concurrent_misses_for_nearby_households_share_one_fetch(tmp_path):
+    with FakeOpenMeteo(delay_s=0.2) as server:
+        client = _client(server, tmp_path)
+        coords = [(47.4984 + i * 0.001, 19.0404 - i * 0.001) for i in range(16)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            payloads = list(pool.map(lambda c: client.forecast(*c, days=2), coords))
+        assert server.requests["/v1/forecast"] == 1
+        assert all(p == payloads[0] for p in payloads)
+        assert len(payloads[0]["hourly"]["time"]) == 48
+
+        client.forecast(47.5, 19.05, days=2)
+        assert server.requests["/v1/forecast"] == 1
+        assert client.cache.stats()["memory_hits"] >= 1
+
+        client.forecast(46.253, 20.1414, days=2)
+        assert server.requests["/v1/forecast"] == 2
+
+
+def test_geocode_against_fake_server(tmp_path):
+    with FakeOpenMeteo() as server:
+        client = _client(server, tmp_path)
+        assert client.geocode("Budapest")["latitude"] == 47.4984
+        assert client.geocode("Atlantis") is None
+
+
+def test_geocode_caches_normalized_hits_and_misses(tmp_path):
+    with FakeOpenMeteo() as server:
+        client = _client(server, tmp_path)
+        for query in ("Budapest", "  BUDAPEST ", "budapest."):
+            assert client.geocode(query)["longitude"] == 19.0404
+        for _ in range(3):
+            assert client.geocode("Atlantis") is None
+        assert client.geocode("   ") is None
+        assert server.requests["/v1/search"] == 2
+        client.close()
+
+        reopened = _client(server, tmp_path)
+        assert reopened.geocode("budapest")["latitude"] == 47.4984
+        assert server.requests["/v1/search"] == 2
+
+
+def test_gazetteer_from_geonames_answers_offline(tmp_path):
+    from energy_app.weather.gazetteer import Gazetteer
+
+    rows = [
+        ("3054643", "Budapest", "Budapest", "Budapeste,Buda-Pest", "47.49835", "19.04045", "HU", "1741041", "Europe/Budapest"),
+        ("721239", "Győr", "Gyor", "Raab", "47.68333", "17.63512", "HU", "129301", "Europe/Budapest"),
+        ("3050434", "Gyula", "Gyula", "", "46.65", "21.28333", "HU", "32000", "Europe/Budapest"),
+        ("4180439", "Budapest", "Budapest", "", "33.6", "-84.5", "US", "100", "America/New_York"),
+    ]
+    dump = tmp_path / "cities.txt"
+    dump.write_text(
+        "".join(
+            "\t".join([gid, name, ascii_, alt, lat, lon, "P", "PPL", cc, "", "", "", "", "", pop, "", "100", tz, "2024-01-01"]) + "\n"
+            for gid, name, ascii_, alt, lat, lon, cc, pop, tz in rows
+        ),
+        encoding="utf-8",
+    )
+    gazetteer = Gazetteer.from_geonames(dump)
+    assert gazetteer.lookup("budapest").country_code == "HU"
+    assert gazetteer.lookup("GYOR").name == gazetteer.lookup("Raab").name == "Győr"
+    assert gazetteer.lookup("buda").country_code == "HU"
+    assert gazetteer.lookup("gyu") is None  # prefixes shorter than min_prefix never match
+    assert gazetteer.lookup("gyul").name == "Gyula"
+    assert gazetteer.lookup("Budapset") is None
+    assert gazetteer.fuzzy("Budapset").name == "Budapest"
+    assert gazetteer.lookup("Atlantis") is None and gazetteer.fuzzy("Atlantis") is None
+    assert [p.name for p in gazetteer.search("gy")] == ["Győr", "Gyula"]
+    assert len(Gazetteer.from_geonames(dump, min_population=50000)) == 5
+
+    with FakeOpenMeteo() as server:
+        client = _client(server, tmp_path, gazetteer_path=str(dump))
+        assert client.geocode("Győr")["timezone"] == "Europe/Budapest"
+        assert server.requests["/v1/search"] == 0
+        # Fuzzy guesses only after the API missed too, and only with the short miss TTL.
+        assert client.geocode("Budapset")["name"] == "Budapest"
+        assert server.requests["/v1/search"] == 1
+        assert client.geocode("Budapset")["name"] == "Budapest"
+        assert server.requests["/v1/search"] == 1
+
+
+def test_historical_fetches_only_missing_days_in_chunks(tmp_path):
+    from datetime import date
+
+    from energy_app.weather.fake_server import hourly_payload
+
+    with FakeOpenMeteo() as server:
+        client = _client(server, tmp_path, archive_chunk_days=10)
+        vars_ = ["temperature_2m"]
+        first = client.historical(47.5, 19.05, "2024-01-01", "2024-01-15", vars_)
+        assert len(first["hourly"]["time"]) == 15 * 24
+        assert server.requests["/v1/archive"] == 2  # 10 + 5 days
+
+        month = client.historical(47.5, 19.05, "2024-01-01", "2024-01-31", vars_)
+        fetched = [(r["start_date"], r["end_date"]) for r in server.log if r["path"] == "/v1/archive"]
+        assert fetched[2:] == [("2024-01-16", "2024-01-25"), ("2024-01-26", "2024-01-31")]
+        expected = hourly_payload(47.5, 19.05, date(2024, 1, 1), 31 * 24, vars_)["hourly"]
+        assert month["hourly"] == expected
+        assert client.historical_frame(47.5, 19.05, "2024-01-01", "2024-01-31", vars_).to_payload()["hourly"] == expected
+
+        shifted = client.historical(47.5, 19.05, "2024-01-10", "2024-01-20", vars_)
+        assert server.requests["/v1/archive"] == 4
+        assert shifted["hourly"]["time"][0] == "2024-01-10T00:00"
+        assert shifted["hourly"]["temperature_2m"] == expected["temperature_2m"][9 * 24 : 20 * 24]
+
+
+def test_forecast_many_batches_misses_and_keeps_order(tmp_path):
+    with FakeOpenMeteo(delay_s=0.05) as server:
+        client = _client(server, tmp_path, max_concurrency=4, batch_size=3, rate_per_s=1000, burst=1000)
+        client.forecast(40.0, 19.0, days=1)
+        locations = [(40.0 + i, 19.0) for i in range(8)] + [(40.001, 19.001)]
+        payloads = client.forecast_many(locations, days=1)
+        assert [p.latitude for p in payloads] == [40.0 + i for i in range(8)] + [40.0]
+        # One single fetch, then 7 uncached cells in batches of 3.
+        assert server.requests["/v1/forecast"] == 1 + 3
+        assert client.forecast_frame(43.0, 19.0, days=1) == payloads[3]
+        assert server.requests["/v1/forecast"] == 4
+        client.close()
+
+
+def test_historical_many_groups_locations_by_missing_range(tmp_path):
+    from datetime import date
+
+    from energy_app.weather.fake_server import hourly_payload
+
+    with FakeOpenMeteo() as server:
+        client = _client(server, tmp_path)
+        vars_ = ["temperature_2m"]
+        client.historical(47.5, 19.05, "2024-01-01", "2024-01-05", vars_)
+        locations = [(47.5, 19.05)] + [(46.0 + i * 0.5, 20.0) for i in range(5)]
+        payloads = client.historical_many(locations, "2024-01-01", "2024-01-10", vars_)
+        archive = [r for r in server.log if r["path"] == "/v1/archive"]
+        # Five new cells share one request; the known cell only needs its last five days.
+        assert len(archive) == 3
+        assert [(r["latitude"].count(",") + 1, r["start_date"]) for r in archive[1:]] == [(1, "2024-01-06"), (5, "2024-01-01")]
+        expected = hourly_payload(46.5, 20.0, date(2024, 1, 1), 10 * 24, vars_)["hourly"]
+        assert payloads[2].to_payload()["hourly"] == expected
+        assert all(len(p) == 240 for p in payloads)
+        client.historical_many(locations, "2024-01-01", "2024-01-10", vars_)
+        assert server.requests["/v1/archive"] == 3
+
+
+def test_token_bucket_paces_callers():
+    import time
+
+    from energy_app.weather.ratelimit import TokenBucket
+
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    assert 0.08 <= time.perf_counter() - start < 1.0
+
+
+def test_prefetcher_warms_profile_cells_and_refreshes_ahead_of_expiry(tmp_path):
+    from energy_app.storage.db import Database
+    from energy_app.storage.profile_repo import Profile, ProfileRepository
+    from energy_app.weather.prefetch import PrefetchConfig, WeatherPrefetcher
+
+    repo = ProfileRepository(Database(f"sqlite:///{tmp_path / 'app.db'}"))
+    repo.upsert_profiles_many(
+        [Profile(f"u{i}", "x", 46.0 + (i % 4), 19.0 + 0.0005 * i, 70, 2) for i in range(40)]
+        + [Profile("nowhere", "", 0.0, 0.0, 50, 1)]
+    )
+    with FakeOpenMeteo() as server:
+        client = _client(server, tmp_path, batch_size=3)
+        prefetcher = WeatherPrefetcher(client, repo, PrefetchConfig(refresh_ahead_s=60, jitter_s=0))
+        run = prefetcher.run_once()
+        assert (run.cells, run.cold, run.refreshed, run.upstream_calls) == (4, 4, 4, 4)
+
+        client.forecast(46.0, 19.0, days=1)
+        assert server.requests["/v1/forecast"] == 2
+        assert prefetcher.run_once().due == 0
+
+        # Entries within refresh_ahead_s of expiry are refreshed before a request misses.
+        client.cache.cfg.ttl_s["forecast"] = 30.0
+        client.forecast_many([(46.0, 19.0)], days=1, refresh=True)
+        run = prefetcher.run_once()
+        assert (run.due, run.cold, run.refreshed) == (1, 0, 1)
+        assert prefetcher.stats()["runs"] == 3
+        assert prefetcher.stats()["total_upstream_calls"] == 5
+
+        prefetcher.start()
+        prefetcher.close(timeout=5)
+        client.close()
+
+
+def test_historical_refetches_days_the_archive_has_not_published(tmp_path):
+    from datetime import date, timedelta
+
+    with FakeOpenMeteo(today=date(2024, 1, 20), archive_lag_days=2) as server:
+        client = _client(server, tmp_path)
+        vars_ = ["temperature_2m"]
+        first = client.historical(47.5, 19.05, "2024-01-15", "2024-01-19", vars_)
+        assert first["hourly"]["temperature_2m"][-1] is None
+        assert client.archive.missing(47.5, 19.05, date(2024, 1, 15), date(2024, 1, 19), vars_) == [
+            date(2024, 1, 18),
+            date(2024, 1, 19),
+        ]
+
+        server.today += timedelta(days=2)
+        again = client.historical(47.5, 19.05, "2024-01-15", "2024-01-19", vars_)
+        fetched = [(r["start_date"], r["end_date"]) for r in server.log if r["path"] == "/v1/archive"]
+        assert fetched == [("2024-01-15", "2024-01-19"), ("2024-01-18", "2024-01-19")]
+        assert None not in again["hourly"]["temperature_2m"]
+
+
+def test_batches_spend_one_token_per_location(tmp_path):
+    import pytest
+
+    from energy_app.weather.ratelimit import TokenBucket
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=10, capacity=5).acquire(6)
+    with FakeOpenMeteo() as server:
+        with pytest.raises(ValueError):
+            _client(server, tmp_path, burst=10, batch_size=50)
+        client = _client(server, tmp_path, batch_size=4, burst=4, rate_per_s=1000)
+        client.forecast_many([(40.0 + i, 19.0) for i in range(10)], days=1)
+        assert server.requests["/v1/forecast"] == 3
+        assert client.upstream_calls == 10
+        client.close()